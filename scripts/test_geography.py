@@ -31,5 +31,5 @@ for uni in sample_unis:
 
 # Gerçek fonksiyonu test et
 print("\nGERÇEK FONKSİYON TESTİ:")
-df_geo = add_geography(df.head(3))
+df_geo = add_geography(df.head(3).copy())
 print(df_geo[['İl', 'Bölge', 'Üniversite Adı']].to_string())
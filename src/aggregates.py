@@ -0,0 +1,153 @@
+from __future__ import annotations
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Hashable, Mapping, Sequence
+
+# Çıktı metriği -> (kaynak sütun, yerleşik toplama fonksiyonu)
+BASE_METRICS = {
+    "Toplam_Kontenjan": ("Kontenjan", "sum"),
+    "Toplam_Yerlesen": ("Yerleşen", "sum"),
+    "Program_Sayisi": ("Program Kodu", "count"),
+    "Uni_Sayisi": ("Üniversite Adı", "nunique"),
+    "Sehir_Sayisi": ("İl", "nunique"),
+    "Bolge_Sayisi": ("Bölge", "nunique"),
+    "Sehir": ("İl", "first"),
+    "Bolge": ("Bölge", "first"),
+}
+# Toplamlardan vektörel türetilen oranlar
+DERIVED_METRICS = ("Doluluk_Orani", "Bos_Kontenjan", "Bos_Yuzde")
+
+DEFAULT_METRICS = ("Toplam_Kontenjan", "Toplam_Yerlesen", "Program_Sayisi", "Doluluk_Orani", "Bos_Kontenjan")
+
+# Frame attrs key carrying the dataset version (set by src.dataset; survives filtering)
+VERSION_ATTR = "dataset_version"
+
+_MEMO_SIZE = 256
+_memo: OrderedDict = OrderedDict()
+_memo_lock = threading.Lock()
+
+def add_ratio_metrics(out) -> None:
+    """Add ``DERIVED_METRICS`` in place from the Toplam_Kontenjan / Toplam_Yerlesen sums.
+
+    ``out`` is a DataFrame or a dict of column arrays.
+    """
+    kont = np.asarray(out["Toplam_Kontenjan"], dtype="float64")
+    yerl = np.asarray(out["Toplam_Yerlesen"], dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["Doluluk_Orani"] = np.where(kont > 0, yerl / kont * 100, np.nan)
+        out["Bos_Kontenjan"] = out["Toplam_Kontenjan"] - out["Toplam_Yerlesen"]
+        out["Bos_Yuzde"] = np.where(kont > 0, (kont - yerl) / kont * 100, np.nan)
+
+def _compute(df: pd.DataFrame, by: list[str], metrics: tuple[str, ...]) -> pd.DataFrame:
+    unknown = [m for m in metrics if m not in BASE_METRICS and m not in DERIVED_METRICS]
+    if unknown:
+        raise ValueError(f"Bilinmeyen metrik: {unknown}")
+    needed = [m for m in metrics if m in BASE_METRICS]
+    if any(m in DERIVED_METRICS for m in metrics):
+        needed += [m for m in ("Toplam_Kontenjan", "Toplam_Yerlesen") if m not in needed]
+    out = df.groupby(by, observed=True).agg(**{m: BASE_METRICS[m] for m in needed})
+    for col in ("Toplam_Kontenjan", "Toplam_Yerlesen"):
+        if col in out.columns:
+            # Eksikler atlanarak toplanır; sonuç düz int64
+            out[col] = out[col].astype("int64")
+
+    if any(m in DERIVED_METRICS for m in metrics):
+        add_ratio_metrics(out)
+    return out[list(metrics)].reset_index()
+
+def _evaluate(df: pd.DataFrame, by: list[str], metrics: tuple[str, ...], star) -> pd.DataFrame:
+    if star is not None and star.supports(by, metrics):
+        rows = star.fact_rows(df)
+        if rows is not None:
+            return star.rollup(by, metrics, rows=rows)
+    return _compute(df, by, metrics)
+
+def rollup(
+    df: pd.DataFrame,
+    by: str | Sequence[str],
+    metrics: Sequence[str] = DEFAULT_METRICS,
+    key: Hashable | None = None,
+    cube=None,
+    where: Mapping[str, Sequence[str]] | None = None,
+    star=None,
+) -> pd.DataFrame:
+    """Group ``df`` by ``by`` and compute standard metrics in one grouped reduction.
+
+    Metrics are names from ``BASE_METRICS`` (built-in sum/count/nunique/first on typed
+    columns) and ``DERIVED_METRICS`` (ratios computed from the group sums). Output has
+    the ``by`` columns followed by the metrics in the requested order.
+
+    ``key`` identifies the filter state that produced ``df``; when given and ``df``
+    carries a dataset version, the result is memoized per
+    (dataset version, key, by, metrics). Callers may modify the returned frame.
+
+    When a :class:`src.cube.Cube` is given together with ``where`` (the filter state
+    of ``df`` expressed as dimension selections) and the cube supports the request,
+    the result is computed from the cube cells instead of scanning ``df``. Otherwise,
+    when a :class:`src.star.StarSchema` is given and ``df`` is a row subset of the frame
+    it was built from, the groups are formed from its integer surrogate keys.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    metrics = tuple(metrics)
+    if cube is not None and where is not None and cube.supports(by, metrics):
+        return cube.rollup(by, metrics, where=where)
+    version = df.attrs.get(VERSION_ATTR)
+    if key is None or version is None:
+        return _evaluate(df, by, metrics, star)
+
+    memo_key = (version, key, tuple(by), metrics)
+    with _memo_lock:
+        cached = _memo.get(memo_key)
+        if cached is not None:
+            _memo.move_to_end(memo_key)
+    if cached is None:
+        cached = _evaluate(df, by, metrics, star)
+        with _memo_lock:
+            _memo[memo_key] = cached
+            while len(_memo) > _MEMO_SIZE:
+                _memo.popitem(last=False)
+    # Sığ kopya: paylaşılan sonuç copy-on-write ile korunur
+    return cached.copy(deep=False)
+
+DEPARTMENT_METRICS = (
+    "Toplam_Kontenjan", "Toplam_Yerlesen", "Program_Sayisi", "Uni_Sayisi", "Sehir_Sayisi",
+    "Doluluk_Orani", "Bos_Kontenjan", "Bos_Yuzde",
+)
+
+def department_summary(df: pd.DataFrame, by: str = "Program_Ailesi") -> pd.DataFrame:
+    """One row per department (``by`` value) with ``DEPARTMENT_METRICS`` and two profile columns.
+
+    Ana_Uni_Turu is the most frequent ``Üniversite Türü`` among the department's
+    programs (ties go to the first category), from one count over (department, type)
+    code pairs. Bolge_Maskesi is a uint64 bitmask of the regions the department is
+    offered in (bit i = i-th ``Bölge`` category). Only native reductions on typed
+    columns and category codes are used.
+    """
+    out = _compute(df, [by], DEPARTMENT_METRICS)
+    group = df.groupby(by, observed=True, sort=True).ngroup().to_numpy()
+    n_groups = len(out)
+
+    types = df["Üniversite Türü"]
+    type_codes = types.cat.codes.to_numpy().astype("int64")
+    n_types = len(types.cat.categories)
+    has_type = (group >= 0) & (type_codes >= 0)
+    counts = np.bincount(group[has_type] * n_types + type_codes[has_type], minlength=n_groups * n_types)
+    counts = counts.reshape(n_groups, n_types)
+    mode = np.where(counts.any(axis=1), counts.argmax(axis=1), -1)
+    out["Ana_Uni_Turu"] = pd.Categorical.from_codes(mode, categories=types.cat.categories)
+
+    regions = df["Bölge"]
+    if len(regions.cat.categories) > 64:
+        raise ValueError("Bölge maskesi en fazla 64 bölge destekler")
+    region_codes = regions.cat.codes.to_numpy()
+    has_region = (group >= 0) & (region_codes >= 0)
+    mask = np.zeros(n_groups, dtype="uint64")
+    np.bitwise_or.at(mask, group[has_region], np.left_shift(np.uint64(1), region_codes[has_region].astype("uint64")))
+    out["Bolge_Maskesi"] = mask
+    return out
+
+def clear_memo() -> None:
+    with _memo_lock:
+        _memo.clear()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from typing import Mapping, Sequence
+
+# Kenar çubuğu çoklu seçim filtrelerinin indekslendiği kategorik sütunlar
+INDEX_COLUMNS = ("Üniversite Türü", "Puan Türü", "Bölge", "İl")
+
+class BitmapIndex:
+    """Packed row bitmaps (one bit per row) for every category value of ``INDEX_COLUMNS``.
+
+    A selection maps columns to allowed values: OR within a column, AND across
+    columns. Columns missing from the selection are unconstrained.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str] = INDEX_COLUMNS):
+        self.n_rows = len(df)
+        self.columns = [c for c in columns if c in df.columns]
+        self._categories = {c: df[c].cat.categories for c in self.columns}
+        self._codes = {c: df[c].cat.codes.to_numpy() for c in self.columns}
+        self._bitmaps: dict[str, np.ndarray] = {}
+        for col in self.columns:
+            codes = self._codes[col]
+            # (kategori, satır) boolean matrisi, satır ekseninde 8 satır/bayt paketlenir
+            onehot = codes[None, :] == np.arange(len(self._categories[col]))[:, None]
+            self._bitmaps[col] = np.packbits(onehot, axis=1)
+        self._all = np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    def _column_bitmap(self, column: str, values: Sequence[str]) -> np.ndarray:
+        wanted = self._categories[column].get_indexer(list(values))
+        wanted = wanted[wanted >= 0]
+        if len(wanted) == 0:
+            return np.zeros_like(self._all)
+        return np.bitwise_or.reduce(self._bitmaps[column][wanted], axis=0)
+
+    def bitmap(self, selections: Mapping[str, Sequence[str]]) -> np.ndarray:
+        """Packed bitmap of the rows matching ``selections``."""
+        result = self._all.copy()
+        for col, values in selections.items():
+            result &= self._column_bitmap(col, values)
+        return result
+
+    def mask(self, selections: Mapping[str, Sequence[str]]) -> np.ndarray:
+        """Boolean row mask of the rows matching ``selections``."""
+        return np.unpackbits(self.bitmap(selections), count=self.n_rows).astype(bool)
+
+    def present_values(self, column: str, selections: Mapping[str, Sequence[str]] | None = None) -> list[str]:
+        """Sorted values of ``column`` that occur in at least one row matching ``selections``."""
+        selected = self.bitmap(selections or {})
+        present = (self._bitmaps[column] & selected).any(axis=1)
+        return sorted(self._categories[column][present].tolist())
+
+    def facet_counts(
+        self, selections: Mapping[str, Sequence[str]], base: np.ndarray | None = None
+    ) -> dict[str, pd.Series]:
+        """Per column, the number of rows each value would match under ``selections``.
+
+        Each column's counts ignore that column's own selection (drill-down counts);
+        ``base`` is an optional boolean row mask (e.g. numeric filters) applied to all.
+        """
+        column_bits = {col: self._column_bitmap(col, values) for col, values in selections.items()}
+        base_bits = self._all if base is None else np.packbits(base)
+        counts = {}
+        for col in self.columns:
+            bits = base_bits.copy()
+            for other, other_bits in column_bits.items():
+                if other != col:
+                    bits &= other_bits
+            rows = np.unpackbits(bits, count=self.n_rows).astype(bool)
+            codes = self._codes[col][rows]
+            categories = self._categories[col]
+            counts[col] = pd.Series(np.bincount(codes[codes >= 0], minlength=len(categories)), index=categories)
+        return counts
@@ -0,0 +1,70 @@
+from __future__ import annotations
+import re
+import numpy as np
+import pandas as pd
+from typing import Sequence
+from .text import casefold_tr
+
+DEFAULT_CATEGORY = "Diğer"
+
+# Sıralı kural tabloları (kategori -> anahtar kelimeler): ilk eşleşen kural kazanır
+PROGRAM_CATEGORY_RULES = (
+    ("Fen Bilimleri", ("Matematik", "Fizik", "Kimya", "Biyoloji")),
+    ("Sosyal Bilimler", ("Psikoloji", "Sosyoloji", "Felsefe", "Tarih", "Coğrafya")),
+    ("Hukuk", ("Hukuk",)),
+    ("İşletme-İktisat", ("İşletme", "İktisat", "Maliye", "Ekonomi")),
+    ("Eğitim", ("Öğretmenliği", "Eğitimi")),
+    ("Sağlık", ("Tıp", "Diş Hekimliği", "Veteriner", "Eczacılık")),
+    ("Mühendislik", ("Mühendisliği", "Mühendislik")),
+)
+
+FACULTY_TYPE_RULES = (
+    ("Hukuk", ("Hukuk",)),
+    ("MYO", ("Meslek Yüksekokulu",)),
+    ("Fen-Edebiyat", ("Fen", "Fen-Edebiyat")),
+    ("Eğitim", ("Eğitim",)),
+    ("İktisadi", ("İktisadi", "İktisat", "İşletme")),
+    ("Tıp", ("Tıp",)),
+    ("Mühendislik", ("Mühendislik",)),
+)
+
+class KeywordClassifier:
+    """Label text by an ordered (label, keywords) rule table; the first matching rule wins.
+
+    Matching is a Turkish case-insensitive substring test. All rules are compiled
+    into one regex: an ordered alternation of lookaheads anchored at the start, so
+    the alternative that matches is the highest-priority rule.
+    """
+
+    def __init__(self, rules: Sequence[tuple[str, Sequence[str]]], default: str = DEFAULT_CATEGORY):
+        self.labels = [label for label, _ in rules]
+        self.default = default
+        alternatives = [
+            f"(?=.*?(?:{'|'.join(re.escape(casefold_tr(k)) for k in keywords)}))(?P<r{i}>)"
+            for i, (_, keywords) in enumerate(rules)
+        ]
+        self._pattern = re.compile("(?:" + "|".join(alternatives) + ")", re.DOTALL)
+
+    def _rule_index(self, text: str) -> int:
+        match = self._pattern.match(casefold_tr(text))
+        return int(match.lastgroup[1:]) if match else len(self.labels)
+
+    def classify(self, values: pd.Series) -> pd.Categorical:
+        """Label each value; the regex runs once per unique value. Missing values get ``default``."""
+        codes, uniques = pd.factorize(values)
+        rule_of_unique = np.array([self._rule_index(str(v)) for v in uniques] + [len(self.labels)], dtype="int64")
+        # factorize eksik değerlere -1 verir; son eleman varsayılan etikettir
+        rule_codes = rule_of_unique[codes]
+        categories = self.labels + [self.default]
+        return pd.Categorical.from_codes(rule_codes, categories=categories)
+
+PROGRAM_CATEGORIES = KeywordClassifier(PROGRAM_CATEGORY_RULES)
+FACULTY_TYPES = KeywordClassifier(FACULTY_TYPE_RULES)
+
+def add_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """Add Program_Kategorisi (from Program Adı) and Fakulte_Turu (from Fakülte/Yüksekokul Adı) to ``df`` in place."""
+    if "Program Adı" in df.columns:
+        df["Program_Kategorisi"] = PROGRAM_CATEGORIES.classify(df["Program Adı"])
+    if "Fakülte/Yüksekokul Adı" in df.columns:
+        df["Fakulte_Turu"] = FACULTY_TYPES.classify(df["Fakülte/Yüksekokul Adı"])
+    return df
@@ -0,0 +1,45 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+# Bu sayının üzerindeki noktalar WebGL (scattergl) ile çizilir
+WEBGL_THRESHOLD = 1000
+# Dağılım grafiklerine gönderilecek en fazla nokta
+MAX_SCATTER_POINTS = 5000
+
+def histogram_bins(
+    values: pd.Series | np.ndarray,
+    bins: int = 20,
+    range: tuple[float, float] | None = None,
+    name: str | None = None,
+) -> pd.DataFrame:
+    """Histogram of ``values`` computed server-side (missing values are ignored).
+
+    One row per bin: Alt_Sinir / Ust_Sinir (edges), Orta (center) and Sayi (count);
+    a Seri column holding ``name`` is added when given, so several series can be
+    concatenated into one long frame. Only these rows are sent to the browser.
+    """
+    arr = np.asarray(values, dtype="float64")
+    arr = arr[~np.isnan(arr)]
+    if range is None and arr.size == 0:
+        range = (0.0, 1.0)
+    counts, edges = np.histogram(arr, bins=bins, range=range)
+    out = pd.DataFrame({
+        "Alt_Sinir": edges[:-1],
+        "Ust_Sinir": edges[1:],
+        "Orta": (edges[:-1] + edges[1:]) / 2,
+        "Sayi": counts,
+    })
+    if name is not None:
+        out.insert(0, "Seri", name)
+    return out
+
+def scatter_render_mode(n_points: int) -> str:
+    """Plotly Express ``render_mode`` for a scatter of ``n_points`` points."""
+    return "webgl" if n_points > WEBGL_THRESHOLD else "svg"
+
+def decimate(df: pd.DataFrame, max_points: int = MAX_SCATTER_POINTS) -> pd.DataFrame:
+    """At most ``max_points`` evenly strided rows of ``df`` (deterministic)."""
+    if len(df) <= max_points:
+        return df
+    return df.iloc[np.linspace(0, len(df) - 1, max_points).astype("int64")]
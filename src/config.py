@@ -9,4 +9,15 @@ RAW_DATA_FILE = DATA_DIR / "yks_tablo.csv"
 # Fallback (original location) if not yet moved
 LEGACY_RAW_DATA_FILE = BASE_DIR / "yks_tablo.csv"
 
+# Kodlama tespiti için okunacak bayt örneği ve yükleme meta verisi dosyası
+ENCODING_SAMPLE_BYTES = 64 * 1024
+LOAD_META_SUFFIX = ".load.json"
+
+# İşlenmiş veri önbelleği: CSV'nin yanına yazılır (ör. yks_tablo.processed.parquet)
+PROCESSED_CACHE_SUFFIX = ".processed.parquet"
+# Önbellek biçimi değişirse artırın; eski dosyalar otomatik geçersiz olur
+PROCESSED_CACHE_FORMAT = 2
+# Üniversite -> (İl, Bölge) çözümleme tablosu; CSV değişse de bilinen üniversiteler yeniden çözülmez
+GEOGRAPHY_CACHE_SUFFIX = ".geography.json"
+
 # Add future configurable constants here
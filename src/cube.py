@@ -0,0 +1,126 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from typing import Mapping, Sequence
+from .aggregates import DERIVED_METRICS, add_ratio_metrics
+
+# Küp boyutları (veride bulunanlar kullanılır) ve doluluğu hesaplanabilir satır bayrağı
+CUBE_DIMENSIONS = ("Üniversite Türü", "Bölge", "İl", "Puan Türü", "Program_Kategorisi", "Burs_Orani")
+VALID_FLAG = "Doluluk_Gecerli"
+
+# rollup() metrik adı -> küpte nasıl cevaplandığı
+_SUM_METRICS = {"Toplam_Kontenjan": "Kontenjan", "Toplam_Yerlesen": "Yerleşen", "Program_Sayisi": "Program_Sayisi"}
+_DIM_COUNT_METRICS = {"Sehir_Sayisi": "İl", "Bolge_Sayisi": "Bölge"}
+_FIRST_METRICS = {"Sehir": "İl", "Bolge": "Bölge"}
+
+def _popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Number of set bits per row of a (rows, words) uint64 array."""
+    if words.shape[1] == 0:
+        return np.zeros(len(words), dtype="int64")
+    bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=1)
+    return bits.sum(axis=1, dtype="int64")
+
+class Cube:
+    """Additive measures of the processed frame at the finest dimension grain.
+
+    Each cell holds Kontenjan / Yerleşen sums, the program count and a university
+    bitset (one bit per ``Üniversite Adı`` category), so any coarser rollup or slice is
+    answered from the cells, distinct university counts included.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.dimensions = [d for d in CUBE_DIMENSIONS if d in df.columns]
+        keys = df[self.dimensions].assign(**{VALID_FLAG: df["Doluluk_Orani"].notna().to_numpy()})
+        grouped = keys.groupby(list(keys.columns), observed=True, dropna=False, sort=True)
+        cell_ids = grouped.ngroup().to_numpy()
+
+        measures = pd.DataFrame({
+            "Kontenjan": df["Kontenjan"].to_numpy(dtype="float64", na_value=np.nan),
+            "Yerleşen": df["Yerleşen"].to_numpy(dtype="float64", na_value=np.nan),
+        })
+        sums = measures.groupby(cell_ids).sum()
+        self.cells = grouped.size().reset_index(name="Program_Sayisi")
+        self.cells["Kontenjan"] = sums["Kontenjan"].to_numpy().astype("int64")
+        self.cells["Yerleşen"] = sums["Yerleşen"].to_numpy().astype("int64")
+
+        # Hücre başına üniversite bit kümesi (uint64 kelimeler)
+        uni_codes = df["Üniversite Adı"].cat.codes.to_numpy()
+        n_unis = len(df["Üniversite Adı"].cat.categories)
+        self.uni_bits = np.zeros((len(self.cells), (n_unis + 63) // 64), dtype=np.uint64)
+        has_uni = uni_codes >= 0
+        np.bitwise_or.at(
+            self.uni_bits,
+            (cell_ids[has_uni], uni_codes[has_uni] // 64),
+            np.left_shift(np.uint64(1), (uni_codes[has_uni] % 64).astype(np.uint64)),
+        )
+
+        # Sorgular yalnızca düz numpy dizileri üzerinde çalışır
+        self._codes = {d: self.cells[d].cat.codes.to_numpy() for d in self.dimensions}
+        self._dtypes = {d: self.cells[d].dtype for d in self.dimensions}
+        self._sums = {metric: self.cells[col].to_numpy() for metric, col in _SUM_METRICS.items()}
+        self._valid = self.cells[VALID_FLAG].to_numpy()
+
+    def supports(self, by: Sequence[str], metrics: Sequence[str]) -> bool:
+        known = set(_SUM_METRICS) | {"Uni_Sayisi"} | set(DERIVED_METRICS)
+        for metric in metrics:
+            source = _DIM_COUNT_METRICS.get(metric) or _FIRST_METRICS.get(metric)
+            if metric not in known and source not in self.dimensions:
+                return False
+        return all(col in self.dimensions for col in by)
+
+    def _cell_mask(self, where: Mapping[str, Sequence[str]], valid_only: bool) -> np.ndarray:
+        mask = self._valid.copy() if valid_only else np.ones(len(self.cells), dtype=bool)
+        for col, values in where.items():
+            wanted = self._dtypes[col].categories.get_indexer(list(values))
+            mask &= np.isin(self._codes[col], wanted[wanted >= 0])
+        return mask
+
+    def rollup(
+        self,
+        by: str | Sequence[str],
+        metrics: Sequence[str],
+        where: Mapping[str, Sequence[str]] | None = None,
+        valid_only: bool = True,
+    ) -> pd.DataFrame:
+        """Same output as :func:`src.aggregates.rollup`, computed from the cube cells.
+
+        ``where`` maps dimensions to allowed values (OR within, AND across);
+        ``valid_only`` keeps only programs with a defined occupancy ratio.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        if not self.supports(by, metrics):
+            raise ValueError(f"Küp bu özeti desteklemiyor: by={by}, metrics={list(metrics)}")
+        mask = self._cell_mask(where or {}, valid_only)
+        # Grup anahtarı: boyut kodlarının karma tabanlı birleşimi (eksik kodlu hücreler atlanır)
+        for col in by:
+            mask &= self._codes[col] >= 0
+        sizes = [len(self._dtypes[col].categories) for col in by]
+        if by:
+            flat = np.ravel_multi_index([self._codes[col][mask] for col in by], sizes)
+        else:
+            flat = np.zeros(int(mask.sum()), dtype="int64")
+        keys, first_cell, group = np.unique(flat, return_index=True, return_inverse=True)
+        group = group.ravel()
+        n_groups = len(keys)
+
+        columns: dict[str, object] = {}
+        for col, codes in zip(by, np.unravel_index(keys, sizes)):
+            columns[col] = pd.Categorical.from_codes(codes, dtype=self._dtypes[col])
+        for metric, values in self._sums.items():
+            columns[metric] = np.bincount(group, weights=values[mask], minlength=n_groups).astype("int64")
+        if "Uni_Sayisi" in metrics:
+            merged = np.zeros((n_groups, self.uni_bits.shape[1]), dtype=np.uint64)
+            np.bitwise_or.at(merged, group, self.uni_bits[mask])
+            columns["Uni_Sayisi"] = _popcount_rows(merged)
+        for metric, col in _DIM_COUNT_METRICS.items():
+            if metric in metrics:
+                codes = self._codes[col][mask]
+                n_values = len(self._dtypes[col].categories)
+                pairs = np.unique(group[codes >= 0] * n_values + codes[codes >= 0])
+                columns[metric] = np.bincount(pairs // n_values, minlength=n_groups)
+        for metric, col in _FIRST_METRICS.items():
+            if metric in metrics:
+                columns[metric] = pd.Categorical.from_codes(self._codes[col][mask][first_cell], dtype=self._dtypes[col])
+
+        add_ratio_metrics(columns)
+        return pd.DataFrame({col: columns[col] for col in by + list(metrics)})
@@ -1,42 +1,129 @@
 from __future__ import annotations
+import codecs
+import hashlib
+import json
+import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
+from typing import Mapping
 from rich import print
 from rich.table import Table
 from . import config
-from .preprocess import preprocess
+from .preprocess import GEOGRAPHY_COLUMNS, build_quota_long, preprocess
+from .schema import MISSING_MARKERS, YKS_SCHEMA
 
-def load_yks_table(csv_path: Path | None = None, low_memory: bool = False) -> pd.DataFrame:
+# İşlenmiş çıktıyı etkileyen kaynak dosyalar; önbellek sürüm damgasına girer
+_PREPROCESS_SOURCES = (
+    Path(__file__).with_name("preprocess.py"),
+    Path(__file__).with_name("schema.py"),
+    Path(__file__).with_name("categories.py"),
+    Path(__file__).with_name("program_names.py"),
+    Path(__file__).with_name("text.py"),
+)
+_CACHE_META_KEY = b"unimonkey.cache_key"
+
+def _resolve_csv_path(csv_path: Path | None = None) -> Path:
+    path = Path(csv_path) if csv_path else config.RAW_DATA_FILE
+    if not path.exists():
+        # Try legacy location
+        if config.LEGACY_RAW_DATA_FILE.exists():
+            path = config.LEGACY_RAW_DATA_FILE
+        else:
+            raise FileNotFoundError(f"CSV bulunamadı: {path}")
+    return path
+
+def _probe_encoding(sample: bytes, final: bool) -> str:
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    # cp1254 (Türkçe Windows) tanımsız baytlarda hata verir; latin-1 her zaman çözer
+    for enc in ("utf-8", "cp1254"):
+        try:
+            codecs.getincrementaldecoder(enc)().decode(sample, final=final)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+def detect_encoding(path: Path, sample_size: int = config.ENCODING_SAMPLE_BYTES) -> str:
+    """Guess the file encoding from a bounded byte sample (BOM check + strict decode probe)."""
+    with open(path, "rb") as fh:
+        sample = fh.read(sample_size)
+    return _probe_encoding(sample, final=len(sample) < sample_size)
+
+def _load_meta_path(path: Path) -> Path:
+    return path.with_name(path.stem + config.LOAD_META_SUFFIX)
+
+def _read_load_meta(path: Path) -> dict:
+    """Return the stored load metadata if it still describes the file on disk."""
+    try:
+        meta = json.loads(_load_meta_path(path).read_text(encoding="utf-8"))
+        stat = path.stat()
+    except (OSError, ValueError):
+        return {}
+    if meta.get("size") != stat.st_size or meta.get("mtime_ns") != stat.st_mtime_ns:
+        return {}
+    return meta
+
+def _write_load_meta(path: Path, **values) -> None:
+    stat = path.stat()
+    meta = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, **values}
+    try:
+        _load_meta_path(path).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    except OSError:
+        pass
+
+def _read_csv(path: Path, enc: str, low_memory: bool, schema: Mapping[str, object] | None) -> pd.DataFrame:
+    if schema is None:
+        return pd.read_csv(path, encoding=enc, low_memory=low_memory)
+    header = pd.read_csv(path, encoding=enc, header=None, nrows=1).iloc[0].tolist()
+    if len(header) != len(schema):
+        raise ValueError(
+            f"CSV başlığı şemayla uyuşmuyor: {len(header)} sütun var, {len(schema)} bekleniyordu ({path})"
+        )
+    return pd.read_csv(
+        path,
+        encoding=enc,
+        header=0,
+        names=list(schema),
+        dtype=dict(schema),
+        na_values=MISSING_MARKERS,
+        low_memory=low_memory,
+    )
+
+def load_yks_table(
+    csv_path: Path | None = None,
+    low_memory: bool = False,
+    schema: Mapping[str, object] | None = YKS_SCHEMA,
+) -> pd.DataFrame:
     """Load the YKS placement CSV into a pandas DataFrame.
 
     Parameters
     ----------
     csv_path: optional override path to the CSV file. If None, uses config.RAW_DATA_FILE.
     low_memory: pass to pandas.read_csv to control dtype inference.
+    schema: output column name -> dtype, in file order (see ``src.schema.YKS_SCHEMA``).
+        The repeated quota blocks get distinct names and ``"--"`` is read as missing.
+        Pass None to read the file untyped with the original (mangled) header.
 
     Returns
     -------
     DataFrame with the raw YKS placement data.
     """
-    path = Path(csv_path) if csv_path else config.RAW_DATA_FILE
-    if not path.exists():
-        # Try legacy location
-        if config.LEGACY_RAW_DATA_FILE.exists():
-            path = config.LEGACY_RAW_DATA_FILE
-        else:
-            raise FileNotFoundError(f"CSV bulunamadı: {path}")
+    path = _resolve_csv_path(csv_path)
 
-    # Try UTF-8 first, then fallback to latin-1 if needed
-    encodings_to_try = ["utf-8-sig", "utf-8", "latin-1", "cp1254"]
-    last_err = None
-    for enc in encodings_to_try:
-        try:
-            df = pd.read_csv(path, encoding=enc, low_memory=low_memory)
-            break
-        except UnicodeDecodeError as e:
-            last_err = e
-    else:
-        raise last_err  # type: ignore
+    # Kodlama önceki yüklemeden biliniyorsa tespit adımı atlanır
+    meta = _read_load_meta(path)
+    enc = meta.get("encoding") or detect_encoding(path)
+    try:
+        df = _read_csv(path, enc, low_memory, schema)
+    except UnicodeDecodeError:
+        # Örnek yanıltıcıydı (hatalı bayt örneğin dışında): tüm dosyayla yeniden tespit
+        enc = _probe_encoding(path.read_bytes(), final=True)
+        df = _read_csv(path, enc, low_memory, schema)
+    if meta.get("encoding") != enc:
+        _write_load_meta(path, encoding=enc)
 
     return df
 
@@ -50,10 +137,112 @@ def preview_dataframe(df: pd.DataFrame, max_rows: int = 10) -> None:
         table.add_row(*[str(v) for v in row.tolist()])
     print(table)
 
-def load_processed(csv_path: Path | None = None) -> pd.DataFrame:
-    """Load and run preprocessing (program no, geography)."""
-    raw = load_yks_table(csv_path=csv_path)
-    return preprocess(raw)
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def preprocess_version() -> str:
+    """Version stamp of the preprocessing code (hash of its source files)."""
+    digest = hashlib.sha256(str(config.PROCESSED_CACHE_FORMAT).encode())
+    for source in _PREPROCESS_SOURCES:
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+def cache_key(csv_path: Path | None = None) -> str:
+    """Cache key of the processed dataset: CSV content hash + preprocess version."""
+    path = _resolve_csv_path(csv_path)
+    return f"{_file_digest(path)[:32]}-{preprocess_version()}"
+
+def processed_cache_path(csv_path: Path | None = None) -> Path:
+    path = _resolve_csv_path(csv_path)
+    return path.with_name(path.stem + config.PROCESSED_CACHE_SUFFIX)
+
+def _read_cache(cache_path: Path, key: str) -> pd.DataFrame | None:
+    if not cache_path.exists():
+        return None
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+        if metadata.get(_CACHE_META_KEY) != key.encode():
+            return None
+        return pq.read_table(cache_path).to_pandas()
+    except (OSError, pa.ArrowException):
+        # Bozuk / yarım kalmış dosya: yeniden üretilecek
+        return None
+
+def _write_cache(cache_path: Path, key: str, df: pd.DataFrame) -> None:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_CACHE_META_KEY] = key.encode()
+    table = table.replace_schema_metadata(metadata)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Salt okunur dağıtımlarda önbellek olmadan devam et
+        tmp_path.unlink(missing_ok=True)
+
+def _geography_cache_path(path: Path) -> Path:
+    return path.with_name(path.stem + config.GEOGRAPHY_CACHE_SUFFIX)
+
+def _read_geography(path: Path) -> pd.DataFrame | None:
+    """Previously resolved university -> (İl, Bölge) table, if written by the same preprocess version."""
+    try:
+        stored = json.loads(_geography_cache_path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if stored.get("version") != preprocess_version():
+        return None
+    table = pd.DataFrame.from_dict(
+        stored.get("universities", {}), orient="index", columns=list(GEOGRAPHY_COLUMNS), dtype=object
+    )
+    table.index.name = "Üniversite Adı"
+    return table
+
+def _write_geography(path: Path, df: pd.DataFrame) -> None:
+    pairs = df[["Üniversite Adı", *GEOGRAPHY_COLUMNS]].drop_duplicates("Üniversite Adı").dropna(subset=["Üniversite Adı"])
+    universities = {
+        name: [None if pd.isna(v) else v for v in values]
+        for name, *values in pairs.astype(object).itertuples(index=False)
+    }
+    stored = {"version": preprocess_version(), "universities": universities}
+    try:
+        _geography_cache_path(path).write_text(json.dumps(stored, ensure_ascii=False), encoding="utf-8")
+    except OSError:
+        pass
+
+def load_processed(csv_path: Path | None = None, use_cache: bool = True, key: str | None = None) -> pd.DataFrame:
+    """Load and run preprocessing (program no, geography).
+
+    The processed frame is persisted as Parquet next to the CSV and reused while
+    both the CSV content and the preprocessing code are unchanged. ``key`` is the
+    caller's already computed :func:`cache_key`, so the CSV is hashed only once.
+    """
+    if not use_cache:
+        return preprocess(load_yks_table(csv_path=csv_path))
+
+    if key is None:
+        key = cache_key(csv_path)
+    cache_path = processed_cache_path(csv_path)
+    cached = _read_cache(cache_path, key)
+    if cached is not None:
+        return cached
+
+    # Bilinen üniversitelerin coğrafyası yeniden çıkarılmaz; yalnızca yeni adlar çözülür
+    path = _resolve_csv_path(csv_path)
+    geography = _read_geography(path)
+    df = preprocess(load_yks_table(csv_path=csv_path), geography=geography)
+    if geography is None or not df["Üniversite Adı"].isin(geography.index).all():
+        _write_geography(path, df)
+    _write_cache(cache_path, key, df)
+    return df
+
+def load_quota_long(csv_path: Path | None = None) -> pd.DataFrame:
+    """Long-format quota table (program × quota type) of the processed dataset."""
+    return build_quota_long(load_processed(csv_path=csv_path))
 
 if __name__ == "__main__":
     df_raw = load_yks_table()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+import threading
+import pandas as pd
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable
+from .aggregates import VERSION_ATTR
+from .bitmap_index import BitmapIndex
+from .cube import Cube
+from .data_loader import cache_key, load_processed
+from .pagination import SortOrders
+from .preprocess import build_quota_long
+from .star import StarSchema
+
+def _copy_on_write() -> bool:
+    """Whether pandas copy-on-write is active (always on from pandas 3)."""
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+@dataclass(frozen=True)
+class Dataset:
+    """Processed dataset shared by every page/session of the process.
+
+    ``frame`` must not be mutated; use :meth:`view` (or :func:`get_frame`) to get a
+    frame that can be modified freely. ``version`` is the processed-cache key.
+    """
+    frame: pd.DataFrame
+    version: str
+    _derived: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _derived_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def view(self) -> pd.DataFrame:
+        # Copy-on-write açıkken sığ kopya yeterlidir (veri paylaşılır, değişiklik ortak çerçeveye
+        # yansımaz); kapalıyken (pandas 2.x varsayılanı) derin kopya verilir
+        return self.frame.copy(deep=not _copy_on_write())
+
+    def derived(self, name: str, build: Callable[[pd.DataFrame], Any]) -> Any:
+        """``build(frame)``, computed once per dataset and stored under ``name``.
+
+        For page-level derived tables; the result is shared and must not be mutated.
+        """
+        with self._derived_lock:
+            if name not in self._derived:
+                self._derived[name] = build(self.frame)
+            return self._derived[name]
+
+    @cached_property
+    def quota_long(self) -> pd.DataFrame:
+        """Long-format quota table (program × quota type), built once per dataset."""
+        return build_quota_long(self.frame)
+
+    @cached_property
+    def bitmap_index(self) -> BitmapIndex:
+        """Row bitmaps of the sidebar filter columns, built once per dataset."""
+        return BitmapIndex(self.frame)
+
+    @cached_property
+    def sort_orders(self) -> SortOrders:
+        """Per-column row orders for sorted, paginated tables."""
+        return SortOrders(self.frame)
+
+    @cached_property
+    def cube(self) -> Cube:
+        """Pre-aggregated cube over the main dimensions, built once per dataset."""
+        return Cube(self.frame)
+
+    @cached_property
+    def star(self) -> StarSchema:
+        """Dimension tables and the narrow fact table, built once per dataset."""
+        return StarSchema(self.frame)
+
+_lock = threading.Lock()
+_dataset: Dataset | None = None
+
+def get_dataset(csv_path: Path | None = None) -> Dataset:
+    """Return the process-wide dataset, loading it on first use (thread-safe)."""
+    global _dataset
+    if _dataset is None:
+        with _lock:
+            if _dataset is None:
+                version = cache_key(csv_path)
+                frame = load_processed(csv_path=csv_path, key=version)
+                # Sürüm, filtrelenmiş görünümlere de taşınır (önbellekli özetler bu anahtarı kullanır)
+                frame.attrs[VERSION_ATTR] = version
+                _dataset = Dataset(frame=frame, version=version)
+    return _dataset
+
+def get_frame() -> pd.DataFrame:
+    """Modifiable view of the shared processed frame."""
+    return get_dataset().view()
+
+def reset_dataset() -> None:
+    """Drop the shared dataset; the next :func:`get_dataset` call reloads it."""
+    global _dataset
+    with _lock:
+        _dataset = None
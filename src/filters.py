@@ -0,0 +1,110 @@
+from __future__ import annotations
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+from .aggregates import VERSION_ATTR
+from .bitmap_index import BitmapIndex
+from .text import casefold_tr
+
+_MEMO_SIZE = 64
+_memo: OrderedDict = OrderedDict()
+_memo_lock = threading.Lock()
+
+def category_mask(series: pd.Series, values: Iterable[str]) -> np.ndarray:
+    """Boolean mask of rows whose category is one of ``values``.
+
+    Values are resolved to integer codes once; the row scan compares codes only.
+    """
+    wanted = series.cat.categories.get_indexer(list(values))
+    return np.isin(series.cat.codes.to_numpy(), wanted[wanted >= 0])
+
+def matching_categories(series: pd.Series, text: str) -> list[str]:
+    """Category labels of ``series`` that contain ``text`` (Turkish case-insensitive)."""
+    needle = casefold_tr(text)
+    return [cat for cat in series.cat.categories if needle in casefold_tr(str(cat))]
+
+def category_contains_mask(series: pd.Series, text: str) -> np.ndarray:
+    """Boolean mask of rows whose category label contains ``text`` (Turkish case-insensitive).
+
+    The substring test runs on the (few) category labels, not on every row.
+    """
+    return category_mask(series, matching_categories(series, text))
+
+@dataclass(frozen=True)
+class FilterSpec:
+    """Declarative filter state of the main data table.
+
+    ``categories`` holds (column, allowed values) pairs: OR within a column, AND
+    across columns. ``score_range`` bounds En Küçük Puan (programs without a score
+    are kept); ``quota_range`` bounds Kontenjan. ``None`` ranges are unconstrained.
+    Build it with :meth:`from_selections` so equal states compare (and hash) equal.
+    """
+    categories: tuple[tuple[str, tuple[str, ...]], ...] = ()
+    score_range: tuple[float, float] | None = None
+    quota_range: tuple[int, int] | None = None
+
+    @classmethod
+    def from_selections(
+        cls,
+        selections: Mapping[str, Iterable[str]] | None = None,
+        score_range: tuple[float, float] | None = None,
+        quota_range: tuple[int, int] | None = None,
+    ) -> FilterSpec:
+        """Normalized spec; empty selections are dropped."""
+        categories = tuple(sorted(
+            (col, tuple(sorted(set(values)))) for col, values in (selections or {}).items() if values
+        ))
+        return cls(
+            categories=categories,
+            score_range=None if score_range is None else (float(score_range[0]), float(score_range[1])),
+            quota_range=None if quota_range is None else (int(quota_range[0]), int(quota_range[1])),
+        )
+
+def compile_mask(spec: FilterSpec, df: pd.DataFrame, index: BitmapIndex | None = None) -> np.ndarray:
+    """Evaluate ``spec`` over ``df`` as one boolean row mask.
+
+    Categorical selections on columns covered by ``index`` (built over ``df``) are
+    answered from its bitmaps; the rest compare category codes. An index built over
+    a frame of another length is ignored.
+    """
+    if index is not None and index.n_rows != len(df):
+        index = None
+    indexed = {col: values for col, values in spec.categories if index is not None and col in index.columns}
+    mask = index.mask(indexed) if indexed else np.ones(len(df), dtype=bool)
+    for col, values in spec.categories:
+        if col not in indexed:
+            mask &= category_mask(df[col], values)
+    if spec.quota_range is not None:
+        kont = df["Kontenjan"].to_numpy(dtype="float64", na_value=np.nan)
+        mask &= (kont >= spec.quota_range[0]) & (kont <= spec.quota_range[1])
+    if spec.score_range is not None:
+        puan = df["En Küçük Puan"].to_numpy()
+        mask &= np.isnan(puan) | ((puan >= spec.score_range[0]) & (puan <= spec.score_range[1]))
+    return mask
+
+def row_indices(spec: FilterSpec, df: pd.DataFrame, index: BitmapIndex | None = None) -> np.ndarray:
+    """Positions of the rows of ``df`` matching ``spec`` (read-only array).
+
+    Memoized per (dataset version, row count, spec) when ``df`` carries a dataset
+    version and ``index`` was built over it. Filtered subsets inherit the version
+    but not the index, so they are always evaluated directly.
+    """
+    version = df.attrs.get(VERSION_ATTR)
+    if version is None or index is None or index.n_rows != len(df):
+        return np.flatnonzero(compile_mask(spec, df, index))
+    memo_key = (version, len(df), spec)
+    with _memo_lock:
+        cached = _memo.get(memo_key)
+        if cached is not None:
+            _memo.move_to_end(memo_key)
+            return cached
+    cached = np.flatnonzero(compile_mask(spec, df, index))
+    cached.flags.writeable = False
+    with _memo_lock:
+        _memo[memo_key] = cached
+        while len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+    return cached
@@ -0,0 +1,51 @@
+from __future__ import annotations
+import math
+import threading
+import numpy as np
+import pandas as pd
+
+class SortOrders:
+    """Stable row order of the frame by each column, computed once per column on demand.
+
+    Missing values sort last. A sorted view of any row subset is derived from the
+    column order without sorting again.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._orders: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def order(self, column: str) -> tuple[np.ndarray, np.ndarray]:
+        """Row positions sorted by ``column`` and the per-row missing-value flags."""
+        with self._lock:
+            cached = self._orders.get(column)
+        if cached is None:
+            values = self._df[column].reset_index(drop=True)
+            order = values.sort_values(kind="stable", na_position="last").index.to_numpy()
+            cached = (order, values.isna().to_numpy())
+            with self._lock:
+                self._orders[column] = cached
+        return cached
+
+    def sorted_rows(self, rows: np.ndarray, column: str | None = None, descending: bool = False) -> np.ndarray:
+        """``rows`` (row positions) ordered by ``column``; missing values stay last."""
+        if column is None:
+            return np.sort(rows)
+        order, missing = self.order(column)
+        member = np.zeros(len(order), dtype=bool)
+        member[rows] = True
+        ordered = order[member[order]]
+        if descending:
+            n_valid = len(ordered) - int(missing[ordered].sum())
+            ordered = np.concatenate([ordered[:n_valid][::-1], ordered[n_valid:]])
+        return ordered
+
+def page_count(n_rows: int, page_size: int) -> int:
+    return max(1, math.ceil(n_rows / page_size))
+
+def page_bounds(n_rows: int, page: int, page_size: int) -> tuple[int, int]:
+    """[start, stop) of the 1-based ``page`` (clamped to the last page)."""
+    page = min(max(page, 1), page_count(n_rows, page_size))
+    start = (page - 1) * page_size
+    return start, min(start + page_size, n_rows)
@@ -1,6 +1,15 @@
 from __future__ import annotations
+import logging
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass
 from typing import Optional
+from .categories import add_categories
+from .program_names import add_program_family, add_scholarship
+from .schema import QUOTA_BLOCKS, QUOTA_MEASURES, block_column
+from .text import casefold_tr
+
+logger = logging.getLogger(__name__)
 
 # 81 il listesi (tam Türkçe karakterlerle) - TÜM BÜYÜK HARF
 TURKISH_CITIES = [
@@ -73,47 +82,41 @@ import re
 def _normalize(s: str) -> str:
     return re.sub(r"\s+"," ", s.strip())
 
+# Önceden hesaplanmış arama tabloları (casefold_tr anahtarlı, O(1) eşleşme)
+# İl adı: TURKISH_CITIES yazımı CITY_TO_REGION yazımına göre önceliklidir
+_CITY_LOOKUP = {casefold_tr(city): city for city in CITY_TO_REGION}
+_CITY_LOOKUP.update({casefold_tr(city): city for city in TURKISH_CITIES})
+_REGION_LOOKUP = {casefold_tr(city): region for city, region in CITY_TO_REGION.items()}
+# Özel anahtarlar alt dize olarak aranır; mevcut eşleşmeleri korumak için str.lower() ile karşılaştırılır
+_SPECIAL_UNI_KEYS = [(key.lower(), city) for key, city in SPECIAL_UNI_CITY.items()]
+
 def infer_city(university_name: str) -> Optional[str]:
     if not isinstance(university_name, str) or not university_name.strip():
         return None
     uni_clean = _normalize(university_name)
-    
+    uni_lower = uni_clean.lower()
+
     # Özel eşleşme önce (özel durumlar için)
-    for key, city in SPECIAL_UNI_CITY.items():
-        if key.lower() in uni_clean.lower():
+    for key, city in _SPECIAL_UNI_KEYS:
+        if key in uni_lower:
             return city
-    
+
     # KURAL: Sonunda parantez varsa parantez içindekini al, yoksa ilk kelimeyi al
-    # 1. Sonunda parantez kontrol et (örn: "Altınbaş Üniversitesi (İSTANBUL)")
+    # (örn: "Altınbaş Üniversitesi (İSTANBUL)")
     paren_match = re.search(r'\(([^)]+)\)\s*$', uni_clean)
     if paren_match:
         potential_city = paren_match.group(1).strip()
-        # Parantez içindeki şehir ismini Türkiye il listesiyle kontrol et (büyük/küçük harf duyarsız)
-        for turkish_city in TURKISH_CITIES:
-            if turkish_city.lower() == potential_city.lower():
-                return turkish_city  # Türkçe liste formatında döndür (büyük harf)
-        # Türkiye'de değilse CITY_TO_REGION'da var mı kontrol et (KKTC, yurtdışı)
-        for region_city in CITY_TO_REGION.keys():
-            if region_city.lower() == potential_city.lower():
-                return region_city
-        # Hiçbirinde yoksa büyük harfe çevirip döndür  
-        return potential_city.upper()
-    
-    # 2. Parantez yoksa ilk kelimeyi al
-    first_word = uni_clean.split()[0] if uni_clean.split() else ""
-    if first_word:
-        # İlk kelimeyi Türkiye il listesiyle kontrol et (büyük/küçük harf duyarsız)
-        for turkish_city in TURKISH_CITIES:
-            if turkish_city.lower() == first_word.lower():
-                return turkish_city  # Türkçe liste formatında döndür (büyük harf)
-        # Türkiye'de değilse CITY_TO_REGION'da var mı kontrol et
-        for region_city in CITY_TO_REGION.keys():
-            if region_city.lower() == first_word.lower():
-                return region_city
-        # Eşleşme yoksa büyük harfe çevirip döndür
-        return first_word.upper()
-    
-    return None
+    else:
+        potential_city = uni_clean.split()[0] if uni_clean.split() else ""
+    if not potential_city:
+        return None
+    # Türkiye il listesi, sonra KKTC / yurtdışı konumlar; hiçbiri değilse büyük harfe çevir
+    return _CITY_LOOKUP.get(casefold_tr(potential_city), potential_city.upper())
+
+def infer_region(city: Optional[str]) -> Optional[str]:
+    if not city:
+        return None
+    return CITY_TO_REGION.get(city) or _REGION_LOOKUP.get(casefold_tr(city))
 
 import unicodedata
 
@@ -133,66 +136,153 @@ def normalize_turkish(text: str) -> str:
         result = result.replace(tr_char, en_char)
     return result
 
-def add_geography(df: pd.DataFrame) -> pd.DataFrame:
+GEOGRAPHY_COLUMNS = ("İl", "Bölge")
+
+def university_geography(names, known: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Resolve (İl, Bölge) once per distinct university name.
+
+    ``known`` is a previously resolved table (index: university name); only names
+    missing from it are inferred.
+    """
+    names = pd.Index(pd.unique(pd.Series(list(names), dtype=object).dropna()))
+    if known is not None:
+        known = known.reindex(columns=list(GEOGRAPHY_COLUMNS))
+        resolved = known[known.index.isin(names)]
+        names = names.difference(resolved.index, sort=False)
+    cities = [infer_city(name) for name in names]
+    table = pd.DataFrame(
+        {"İl": cities, "Bölge": [infer_region(city) for city in cities]},
+        index=names,
+        dtype=object,
+    )
+    if known is not None and len(resolved):
+        table = pd.concat([resolved.astype(object), table])
+    table.index.name = "Üniversite Adı"
+    return table
+
+def add_geography(df: pd.DataFrame, geography: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """İl ve Bölge sütunlarını ``df``'ye yerinde ekle; çıkarım satır başına değil, üniversite başına bir kez yapılır."""
     if 'Üniversite Adı' not in df.columns:
         return df
-    cities = df['Üniversite Adı'].map(infer_city)
-    
-    # TÜM ŞEHİR İSİMLERİNİ BÜYÜK HARFE ÇEVİR
-    cities = cities.map(lambda x: x.upper() if x else x)
-    
-    # İl bulunduktan sonra coğrafi bölgeyi eşleştir - basit lowercase ile
-    def find_region(city_raw):
-        if not city_raw:
-            return None
-        # Önce direkt eşleştir
-        if city_raw in CITY_TO_REGION:
-            return CITY_TO_REGION[city_raw]
-        # Basit lowercase eşleştir (İ->i dönüşümü manuel)
-        city_search = city_raw.replace('İ', 'i').replace('I', 'ı').lower()
-        for city_key, region in CITY_TO_REGION.items():
-            city_key_search = city_key.replace('İ', 'i').replace('I', 'ı').lower()
-            if city_key_search == city_search:
-                return region
-        return None
-    
-    regions = cities.map(find_region)
-    out = df.copy()
-    out.insert(0, 'İl', cities)
-    out.insert(1, 'Bölge', regions)
-    return out
+    uni = df['Üniversite Adı']
+    if isinstance(uni.dtype, pd.CategoricalDtype):
+        codes, names = uni.cat.codes.to_numpy(), uni.cat.categories
+    else:
+        codes, names = pd.factorize(uni)
+    table = university_geography(names, known=geography).reindex(names)
+    for pos, col in enumerate(GEOGRAPHY_COLUMNS):
+        # Üniversite başına kategori kodu, sonra satırlara kodlarla yayılır (kod -1 -> eksik)
+        per_uni = pd.Categorical(table[col].to_numpy(dtype=object))
+        uni_codes = np.append(per_uni.codes, -1)
+        df.insert(pos, col, pd.Categorical.from_codes(uni_codes[codes], categories=per_uni.categories))
+    return df
 
 def add_program_no(df: pd.DataFrame) -> pd.DataFrame:
-    if 'Program No' in df.columns:
-        return df
-    out = df.copy()
-    out.insert(0, 'Program No', range(1, len(out)+1))
-    return out
+    if 'Program No' not in df.columns:
+        df.insert(0, 'Program No', range(1, len(df)+1))
+    return df
 
-def fix_quota_consistency(df: pd.DataFrame) -> pd.DataFrame:
-    """Yerleşen > Kontenjan olan satırları düzelt: Yerleşen sayısını Kontenjan ile sınırla."""
-    out = df.copy()
-    
-    # Tüm Kontenjan ve Yerleşen sütunlarını bul (tekrar eden bloklar olabilir)
-    kontenjan_cols = [col for col in out.columns if 'Kontenjan' in col]
-    yerleşen_cols = [col for col in out.columns if 'Yerleşen' in col]
-    
-    for kont_col, yerl_col in zip(kontenjan_cols, yerleşen_cols):
-        # Sayısal dönüştür
-        kont_num = pd.to_numeric(out[kont_col], errors='coerce')
-        yerl_num = pd.to_numeric(out[yerl_col], errors='coerce')
-        
-        # Yerleşen > Kontenjan olan durumları bul
-        problem_mask = (yerl_num > kont_num) & kont_num.notna() & yerl_num.notna()
-        
-        if problem_mask.sum() > 0:
-            print(f"DÜZELTİLDİ: {problem_mask.sum()} satırda {yerl_col} > {kont_col} sorunu vardı")
-            # Yerleşen sayısını kontenjan ile sınırla
-            out.loc[problem_mask, yerl_col] = out.loc[problem_mask, kont_col]
-    
-    return out
+@dataclass(frozen=True)
+class QuotaCorrection:
+    """Bir kontenjan bloğunda Yerleşen'i Kontenjan ile sınırlanan programlar."""
+    count: int
+    program_codes: tuple[int, ...]
+
+def fix_quota_consistency(df: pd.DataFrame) -> dict[str, QuotaCorrection]:
+    """Yerleşen > Kontenjan olan satırları düzelt: Yerleşen sayısını Kontenjan ile sınırla.
+
+    Beş kontenjan bloğu tek (satır, blok) dizisi olarak tek ``np.minimum`` geçişiyle
+    kırpılır; yalnızca düzeltme olan Yerleşen sütunları yerinde değiştirilir.
+    Düzeltme raporu döner: yalnızca düzeltme yapılan bloklar -> QuotaCorrection.
+    """
+    blocks = [b for b in QUOTA_BLOCKS if {block_column("Kontenjan", b), block_column("Yerleşen", b)} <= set(df.columns)]
+    if not blocks:
+        return {}
+    kont = df[[block_column("Kontenjan", b) for b in blocks]]
+    yerl = df[[block_column("Yerleşen", b) for b in blocks]]
+    # Eksik kontenjan kırpma yapmaz; eksik yerleşen maskede kalır
+    kont_values = kont.to_numpy(dtype="int32", na_value=np.iinfo(np.int32).max)
+    yerl_mask = yerl.isna().to_numpy()
+    yerl_values = yerl.to_numpy(dtype="int32", na_value=0)
+    clipped = np.minimum(yerl_values, kont_values)
+    changed = clipped != yerl_values
+
+    codes = df["Program Kodu"].to_numpy()
+    report: dict[str, QuotaCorrection] = {}
+    for j, block in enumerate(blocks):
+        rows = changed[:, j]
+        if rows.any():
+            program_codes = tuple(codes[rows].tolist())
+            report[block] = QuotaCorrection(len(program_codes), program_codes)
+            df[block_column("Yerleşen", block)] = pd.arrays.IntegerArray(
+                np.ascontiguousarray(clipped[:, j]), np.ascontiguousarray(yerl_mask[:, j])
+            )
+    return report
+
+def build_quota_long(df: pd.DataFrame) -> pd.DataFrame:
+    """Kontenjan bloklarını uzun formatlı tabloya çevir: program × kontenjan türü.
+
+    Her blok için tek satır (Program Kodu, Kontenjan Türü, Kontenjan, Yerleşen,
+    En Küçük Puan, En Büyük Puan); kontenjanı olmayan bloklar atlanır. Geniş tablo
+    tek seferde (satır, blok) dizisine açılır, sütun sütun döngü yoktur.
+    """
+    n_blocks = len(QUOTA_BLOCKS)
+    columns = {
+        "Program Kodu": np.repeat(df["Program Kodu"].to_numpy(), n_blocks),
+        "Kontenjan Türü": pd.Categorical.from_codes(
+            np.tile(np.arange(n_blocks, dtype=np.int8), len(df)), categories=QUOTA_BLOCKS, ordered=True
+        ),
+    }
+    for measure, dtype in QUOTA_MEASURES.items():
+        block = df[[block_column(measure, b) for b in QUOTA_BLOCKS]]
+        if dtype == "Int32":
+            mask = block.isna().to_numpy().ravel()
+            data = block.to_numpy(dtype="int32", na_value=0).ravel()
+            columns[measure] = pd.arrays.IntegerArray(data, mask)
+        else:
+            columns[measure] = block.to_numpy(dtype=dtype, na_value=np.nan).ravel()
+    long_df = pd.DataFrame(columns)
+    return long_df[long_df["Kontenjan"].notna().to_numpy()].reset_index(drop=True)
+
+def add_occupancy_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Her kontenjan bloğu için Doluluk_Orani (%) ve Bos_Kontenjan sütunlarını ``df``'ye yerinde ekle.
+
+    Doluluk, kontenjan eksik ya da sıfır olduğunda NaN olur; alt bloklar
+    ``Doluluk_Orani (Okul Birincisi)`` gibi adlandırılır.
+    """
+    for block in QUOTA_BLOCKS:
+        kont_col, yerl_col = block_column("Kontenjan", block), block_column("Yerleşen", block)
+        if not {kont_col, yerl_col} <= set(df.columns):
+            continue
+        kont = df[kont_col].to_numpy(dtype="float64", na_value=np.nan)
+        yerl = df[yerl_col].to_numpy(dtype="float64", na_value=np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            df[block_column("Doluluk_Orani", block)] = np.where(kont > 0, yerl / kont * 100, np.nan)
+        df[block_column("Bos_Kontenjan", block)] = df[kont_col] - df[yerl_col]
+    return df
+
+# Düşük kardinaliteli metin boyutları: kategorik (tamsayı kodlu) tutulur
+CATEGORICAL_COLUMNS = (
+    "Üniversite Türü", "Puan Türü", "İl", "Bölge", "Üniversite Adı", "Fakülte/Yüksekokul Adı", "Program Adı",
+)
+
+def to_categoricals(df: pd.DataFrame, columns=CATEGORICAL_COLUMNS) -> pd.DataFrame:
+    """Metin boyutlarını sıralı, kararlı kategori listeli pandas kategoriklerine (yerinde) çevir."""
+    for col in columns:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            categories = sorted(df[col].dropna().unique().tolist())
+            df[col] = pd.Categorical(df[col], categories=categories)
+    return df
 
-def preprocess(df: pd.DataFrame) -> pd.DataFrame:
-    out = add_geography(df)
-    out = fix_quota_consistency(out)
+def preprocess(df: pd.DataFrame, geography: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    # Tek çalışma kopyası (sığ): adımlar sütunları yerinde ekler/değiştirir, girdi çerçeve değişmez
+    out = df.copy(deep=False)
+    to_categoricals(out)
+    add_geography(out, geography=geography)
+    for block, correction in fix_quota_consistency(out).items():
+        logger.info("Yerleşen > Kontenjan düzeltildi (%s): %d program", block, correction.count)
+    add_occupancy_metrics(out)
+    add_categories(out)
+    add_scholarship(out)
+    add_program_family(out)
     return out
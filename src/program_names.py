@@ -0,0 +1,138 @@
+from __future__ import annotations
+import functools
+import re
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from .text import casefold_tr
+
+# Burs oranı kademeleri (sıralı): işaret taşımayan programlar "Ücretli" sayılır,
+# yalnızca "(Burslu)" yazan programlar tam burslu (%100) kabul edilir
+SCHOLARSHIP_TIERS = ("Ücretli", "%25", "%50", "%75", "%100")
+FULL_SCHOLARSHIP = SCHOLARSHIP_TIERS[-1]
+
+# Tek geçişte yüzde ("%50", "50%") ve "burslu" işaretini ayrı ayrı yakalar; yazılan oran,
+# işaretten önce ya da sonra gelsin, düz "burslu" işaretine üstün gelir ("(Burslu %50)" -> %50)
+_SCHOLARSHIP_PATTERN = (
+    r"(?i)^(?:(?=.*?(?:%\s*(?P<oran>25|50|75|100)\b|\b(?P<oran_son>25|50|75|100)\s*%)))?"
+    r"(?:(?=.*?(?P<burslu>burslu)))?"
+)
+# Burs/ücret bilgisi taşıyan parantezli ek: "(Burslu)", "(Ücretli)", "(%50 İndirimli)"
+_SCHOLARSHIP_SUFFIX = r"(?i)\s*\([^()]*(?:burslu|ücretli|indirimli|%\s*\d+|\d+\s*%)[^()]*\)"
+
+def _broadcast(codes: np.ndarray, labels: pd.Series, categories=None, ordered: bool = False) -> pd.Categorical:
+    """Categorical of ``labels[codes]`` (one label per unique value); code -1 stays missing."""
+    if categories is None:
+        categories = sorted(labels.dropna().unique())
+    label_codes = pd.Categorical(labels, categories=categories).codes
+    return pd.Categorical.from_codes(
+        np.where(codes >= 0, label_codes[codes], -1), categories=categories, ordered=ordered
+    )
+
+def scholarship_tier(names: pd.Series) -> pd.Series:
+    """``SCHOLARSHIP_TIERS`` label of each program name."""
+    found = names.str.extract(_SCHOLARSHIP_PATTERN)
+    rate = found["oran"].fillna(found["oran_son"])
+    fallback = np.where(found["burslu"].notna(), FULL_SCHOLARSHIP, SCHOLARSHIP_TIERS[0])
+    return ("%" + rate).where(rate.notna(), fallback)
+
+def base_program_name(names: pd.Series) -> pd.Series:
+    """Program name without its scholarship / tuition suffix."""
+    return names.str.replace(_SCHOLARSHIP_SUFFIX, "", regex=True).str.strip()
+
+def add_scholarship(df: pd.DataFrame) -> pd.DataFrame:
+    """Add Burs_Orani (ordered categorical) and Temel_Program (name without the scholarship suffix) to ``df`` in place.
+
+    Both are parsed once per unique ``Program Adı``; missing names stay missing.
+    """
+    if "Program Adı" not in df.columns:
+        return df
+    codes, uniques = pd.factorize(df["Program Adı"])
+    names = pd.Series(uniques, dtype="str")
+    df["Burs_Orani"] = _broadcast(codes, scholarship_tier(names), SCHOLARSHIP_TIERS, ordered=True)
+    df["Temel_Program"] = _broadcast(codes, base_program_name(names))
+    return df
+
+# Program adı varyant ekleri: ilk parantezden sonraki her parça bir varyant özelliği olarak sınıflandırılır
+DEFAULT_LANGUAGE = "Türkçe"
+DELIVERY_MODES = ("Örgün", "İkinci Öğretim", "Uzaktan Öğretim", "Açıköğretim")
+DEFAULT_QUOTA_GROUP = "Genel"
+
+_TOKEN = re.compile(r"[^()]+")
+_LANGUAGE = re.compile(r"[^\W\d_]+[cç][ae](?:-[^\W\d_]+[cç][ae])*")
+_SCHOLARSHIP = re.compile(r"burslu|ücretli|indirimli|%\s*\d+|\d+\s*%", re.IGNORECASE)
+_DELIVERY = (
+    ("Açıköğretim", re.compile(r"açık\s*öğretim", re.IGNORECASE)),
+    ("Uzaktan Öğretim", re.compile(r"uzaktan", re.IGNORECASE)),
+    ("İkinci Öğretim", re.compile(r"ikinci öğretim|\bgece\b|\bİÖ\b", re.IGNORECASE)),
+)
+_QUOTA_GROUP = re.compile(r"kktc|m\.t\.o\.k|bakanlığı adına|^(?:kız|erkek)$", re.IGNORECASE)
+_PARTNER = re.compile(r"uolp|suny|uncw", re.IGNORECASE)
+_CAMPUS = re.compile(r"[^\W\d_]+")
+
+@dataclass(frozen=True)
+class ProgramName:
+    """A program name split into its discipline and variant attributes."""
+
+    family: str
+    language: str = DEFAULT_LANGUAGE
+    delivery: str = DELIVERY_MODES[0]
+    quota_group: str = DEFAULT_QUOTA_GROUP
+    campus: str | None = None
+    partner: bool = False
+
+@functools.lru_cache(maxsize=None)
+def parse_program_name(name: str) -> ProgramName:
+    """Split ``name`` into the discipline (family) name and its variant attributes.
+
+    The text before the first parenthesis is the discipline. Each parenthesized
+    part after it is matched against the variant rules (language, scholarship,
+    delivery mode, quota group, joint program, single-word campus name); parts
+    matching none are specializations and stay in the family name.
+    """
+    stem, _, tail = name.partition("(")
+    family = [" ".join(stem.split())]
+    attrs: dict[str, object] = {}
+    quota_groups: list[str] = []
+    for token in (t.strip() for t in _TOKEN.findall(tail)):
+        if not token or _SCHOLARSHIP.search(token):
+            continue
+        if (delivery := next((mode for mode, pattern in _DELIVERY if pattern.search(token)), None)):
+            attrs["delivery"] = delivery
+        elif _PARTNER.search(token):
+            attrs["partner"] = True
+        elif _QUOTA_GROUP.search(token):
+            quota_groups.append(token)
+        elif _LANGUAGE.fullmatch(token):
+            attrs["language"] = token
+        elif _CAMPUS.fullmatch(token):
+            attrs["campus"] = token
+        else:
+            family.append(f"({token})")
+    if quota_groups:
+        attrs["quota_group"] = " / ".join(quota_groups)
+    return ProgramName(" ".join(family), **attrs)
+
+def add_program_family(df: pd.DataFrame) -> pd.DataFrame:
+    """Add Program_Ailesi and the variant columns parsed from ``Program Adı`` to ``df`` in place.
+
+    Program_Ailesi is the discipline name shared by all variants of a program;
+    spellings differing only in case or spacing map to one family. Variant columns:
+    Ogretim_Dili, Ogretim_Turu, Kontenjan_Grubu, Yerleske (categoricals) and
+    Ortak_Program (bool). Names are parsed once per unique value.
+    """
+    if "Program Adı" not in df.columns:
+        return df
+    codes, uniques = pd.factorize(df["Program Adı"])
+    parsed = pd.DataFrame([parse_program_name(str(name)) for name in uniques],
+                          columns=["family", "language", "delivery", "quota_group", "campus", "partner"])
+    # Aile anahtarı: büyük/küçük harf ve boşluk farkları yok sayılır; görünen ad ilk (sıralı) yazımdır
+    family_key = parsed["family"].map(casefold_tr)
+    parsed["family"] = parsed.groupby(family_key)["family"].transform("min")
+    df["Program_Ailesi"] = _broadcast(codes, parsed["family"])
+    df["Ogretim_Dili"] = _broadcast(codes, parsed["language"])
+    df["Ogretim_Turu"] = _broadcast(codes, parsed["delivery"], DELIVERY_MODES)
+    df["Kontenjan_Grubu"] = _broadcast(codes, parsed["quota_group"])
+    df["Yerleske"] = _broadcast(codes, parsed["campus"])
+    df["Ortak_Program"] = np.where(codes >= 0, parsed["partner"].to_numpy(dtype=bool)[codes], False)
+    return df
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+# CSV'de eksik değeri gösteren işaretler
+MISSING_MARKERS = ["--"]
+
+# Tanımlayıcı sütunlar (dosyadaki sırasıyla)
+ID_COLUMNS = {
+    "Program Kodu": "int64",
+    "Üniversite Türü": str,
+    "Üniversite Adı": str,
+    "Fakülte/Yüksekokul Adı": str,
+    "Program Adı": str,
+    "Puan Türü": str,
+}
+
+# Başlıkta beş kez tekrar eden ölçü bloğu
+QUOTA_MEASURES = {
+    "Kontenjan": "Int32",
+    "Yerleşen": "Int32",
+    "En Küçük Puan": "float32",
+    "En Büyük Puan": "float32",
+}
+
+# Blok sırası YÖK tablolarındaki sırayı izler: genel kontenjan + dört ek kontenjan türü
+QUOTA_BLOCKS = ("Genel", "Okul Birincisi", "Şehit-Gazi Yakını", "Depremzede", "Kadın 34+")
+GENERAL_BLOCK = QUOTA_BLOCKS[0]
+
+def block_column(measure: str, block: str = GENERAL_BLOCK) -> str:
+    """Column name of a measure in a quota block.
+
+    The general block keeps the original header names (``Kontenjan``, ``Yerleşen``...)
+    so existing code keeps working; sub-quota blocks become e.g. ``Kontenjan (Depremzede)``.
+    """
+    return measure if block == GENERAL_BLOCK else f"{measure} ({block})"
+
+def block_columns(measure: str) -> list[str]:
+    """Column names of a measure across all quota blocks, in block order."""
+    return [block_column(measure, block) for block in QUOTA_BLOCKS]
+
+def _build_schema() -> dict[str, object]:
+    schema: dict[str, object] = dict(ID_COLUMNS)
+    for block in QUOTA_BLOCKS:
+        for measure, dtype in QUOTA_MEASURES.items():
+            schema[block_column(measure, block)] = dtype
+    return schema
+
+# Çıktı sütun adı -> dtype (CSV sütun sırasıyla)
+YKS_SCHEMA = _build_schema()
+
+# CSV başlığında beklenen (tekrarlı) ham sütun adları
+RAW_HEADER = list(ID_COLUMNS) + list(QUOTA_MEASURES) * len(QUOTA_BLOCKS)
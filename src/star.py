@@ -0,0 +1,152 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from typing import Sequence
+from .aggregates import BASE_METRICS, DERIVED_METRICS, VERSION_ATTR, add_ratio_metrics
+
+# Boyut tabloları: ad -> (doğal anahtar, öznitelikler); veride bulunan öznitelikler kullanılır
+DIMENSIONS = {
+    "universite": ("Üniversite Adı", ("Üniversite Türü", "İl", "Bölge")),
+    "fakulte": ("Fakülte/Yüksekokul Adı", ("Fakulte_Turu",)),
+    "aile": ("Program_Ailesi", ()),
+}
+FACT_KEY = "Program Kodu"
+# Olgu tablosunda tutulan ölçüler (rollup toplamlarının kaynağı)
+FACT_MEASURES = ("Kontenjan", "Yerleşen")
+
+def key_column(dimension: str) -> str:
+    """Surrogate key column of ``dimension`` in the fact table."""
+    return f"{dimension}_key"
+
+class StarSchema:
+    """The processed frame split into dimension tables and a narrow fact table.
+
+    Each dimension has one row per natural key (university, faculty, program family)
+    and a dense int32 surrogate key equal to its row position. The fact table is
+    indexed by ``Program Kodu`` and holds only the surrogate keys and ``FACT_MEASURES``.
+    Rollups group integer codes (``np.bincount``); dimension attributes are attached
+    to the grouped rows only, never to the facts. Attributes are taken from the first
+    row of each natural key, so they must be determined by it (as in the source data).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.dimensions: dict[str, pd.DataFrame] = {}
+        keys: dict[str, np.ndarray] = {}
+        for name, (natural_key, attributes) in DIMENSIONS.items():
+            if natural_key not in df.columns:
+                continue
+            columns = [natural_key] + [a for a in attributes if a in df.columns]
+            codes, uniques = pd.factorize(df[natural_key], sort=True)
+            present, first_row = np.unique(codes, return_index=True)
+            # Eksik doğal anahtarlı satırlar (kod -1) boyutta yer almaz
+            table = df[columns].iloc[first_row[present >= 0]].reset_index(drop=True)
+            table.index = pd.RangeIndex(len(table), name=key_column(name))
+            self.dimensions[name] = table
+            keys[key_column(name)] = codes.astype("int32")
+
+        measures = {m: df[m].to_numpy() for m in FACT_MEASURES if m in df.columns}
+        self.facts = pd.DataFrame({**keys, **measures})
+        self.facts.index = pd.Index(df[FACT_KEY].to_numpy(), name=FACT_KEY)
+        self._weights = {m: self.facts[m].to_numpy(dtype="float64", na_value=0.0) for m in measures}
+        self._has_fact_key = self.facts.index.notna()
+        self._column_dimension = {col: name for name, table in self.dimensions.items() for col in table.columns}
+        self._fact_codes: dict[str, tuple[np.ndarray, pd.Index]] = {}
+        # Satır konumları yalnızca aynı sürümün, konumsal indeksli çerçevesinin alt kümeleri için geçerlidir
+        positional = df.index.equals(pd.RangeIndex(len(df)))
+        self.version = df.attrs.get(VERSION_ATTR) if positional else None
+
+    def attribute_codes(self, dimension: str, attribute: str) -> tuple[np.ndarray, pd.Index]:
+        """Per-fact codes of a dimension column and the column's (sorted) values."""
+        table = self.dimensions[dimension]
+        codes, values = pd.factorize(table[attribute], sort=True)
+        fact_keys = self.facts[key_column(dimension)].to_numpy()
+        return np.where(fact_keys >= 0, codes[fact_keys], -1), pd.Index(values, name=attribute)
+
+    def column_codes(self, column: str) -> tuple[np.ndarray, pd.Index]:
+        """:meth:`attribute_codes` of the dimension holding ``column`` (memoized)."""
+        if column not in self._fact_codes:
+            self._fact_codes[column] = self.attribute_codes(self._column_dimension[column], column)
+        return self._fact_codes[column]
+
+    def fact_rows(self, df: pd.DataFrame) -> np.ndarray | None:
+        """Fact row positions of ``df``, or None unless it is a row subset of the schema's frame."""
+        if self.version is None or df.attrs.get(VERSION_ATTR) != self.version or FACT_KEY not in df.columns:
+            return None
+        rows = df.index.to_numpy()
+        if rows.dtype.kind not in "iu" or (len(rows) and (rows.min() < 0 or rows.max() >= len(self.facts))):
+            return None
+        if not np.array_equal(self.facts.index.to_numpy()[rows], df[FACT_KEY].to_numpy()):
+            return None
+        return rows
+
+    def supports(self, by: Sequence[str], metrics: Sequence[str]) -> bool:
+        for metric in metrics:
+            if metric in DERIVED_METRICS:
+                continue
+            if metric not in BASE_METRICS:
+                return False
+            source, func = BASE_METRICS[metric]
+            if func == "sum" and source not in self._weights:
+                return False
+            if func == "count" and source != FACT_KEY:
+                return False
+            if func in ("nunique", "first") and source not in self._column_dimension:
+                return False
+        return all(col in self._column_dimension for col in by)
+
+    def rollup(self, by: str | Sequence[str], metrics: Sequence[str], rows: np.ndarray | None = None) -> pd.DataFrame:
+        """Same output as :func:`src.aggregates.rollup`, computed from the surrogate keys.
+
+        ``rows`` (fact row positions, see :meth:`fact_rows`) restricts the rollup to a
+        subset; missing measure values count as zero.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        if not self.supports(by, metrics):
+            raise ValueError(f"Yıldız şema bu özeti desteklemiyor: by={by}, metrics={list(metrics)}")
+        positions = np.arange(len(self.facts)) if rows is None else np.asarray(rows)
+        by_codes = [self.column_codes(col)[0][positions] for col in by]
+        by_values = [self.column_codes(col)[1] for col in by]
+        # Grup anahtarı: kodların karma tabanlı birleşimi (eksik kodlu satırlar atlanır)
+        valid = np.ones(len(positions), dtype=bool)
+        for codes in by_codes:
+            valid &= codes >= 0
+        positions = positions[valid]
+        sizes = [max(len(values), 1) for values in by_values]
+        if by:
+            flat = np.ravel_multi_index([codes[valid] for codes in by_codes], sizes)
+        else:
+            flat = np.zeros(len(positions), dtype="int64")
+        keys, group = np.unique(flat, return_inverse=True)
+        group = group.ravel()
+        n_groups = len(keys)
+
+        columns: dict[str, object] = {}
+        for col, values, codes in zip(by, by_values, np.unravel_index(keys, sizes)):
+            columns[col] = pd.Series(values.take(codes), name=col)
+        needed = [m for m in metrics if m in BASE_METRICS]
+        if any(m in DERIVED_METRICS for m in metrics):
+            needed += [m for m in ("Toplam_Kontenjan", "Toplam_Yerlesen") if m not in needed]
+        for metric in needed:
+            source, func = BASE_METRICS[metric]
+            if func == "sum":
+                weights = self._weights[source][positions]
+                columns[metric] = np.bincount(group, weights=weights, minlength=n_groups).astype("int64")
+            elif func == "count":
+                columns[metric] = np.bincount(group[self._has_fact_key[positions]], minlength=n_groups)
+            else:
+                codes, values = self.column_codes(source)
+                codes = codes[positions]
+                known = codes >= 0
+                if func == "nunique":
+                    pairs = np.unique(group[known].astype("int64") * len(values) + codes[known])
+                    columns[metric] = np.bincount(pairs // len(values), minlength=n_groups)
+                else:
+                    # İlk eksik olmayan değer (satır sırasıyla)
+                    first_codes = np.full(n_groups, -1)
+                    groups_seen, first = np.unique(group[known], return_index=True)
+                    first_codes[groups_seen] = codes[known][first]
+                    columns[metric] = pd.Series(values.take(first_codes, allow_fill=True, fill_value=np.nan), name=metric)
+
+        if any(m in DERIVED_METRICS for m in metrics):
+            add_ratio_metrics(columns)
+        return pd.DataFrame({col: columns[col] for col in by + list(metrics)})
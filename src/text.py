@@ -0,0 +1,5 @@
+from __future__ import annotations
+
+def casefold_tr(text: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevir (İ -> i, I -> ı); eşleştirme anahtarı olarak kullanılır."""
+    return text.replace("İ", "i").replace("I", "ı").lower()
@@ -0,0 +1,115 @@
+import pandas as pd
+
+from src.categories import FACULTY_TYPES, PROGRAM_CATEGORIES
+from src.program_names import add_scholarship
+
+PROGRAMS = [
+    "Bilgisayar Mühendisliği",
+    "Endüstri Mühendisliği (İngilizce)",
+    "Tıp",
+    "Diş Hekimliği (Burslu)",
+    "Veteriner",
+    "Eczacılık (%50 İndirimli)",
+    "Hukuk",
+    "İşletme",
+    "Ekonomi ve Finans (İngilizce) (%25 İndirimli)",
+    "Maliye (İÖ)",
+    "Matematik Öğretmenliği",
+    "Fen Bilgisi Öğretmenliği",
+    "Tarih Öğretmenliği",
+    "Okul Öncesi Eğitimi",
+    "Psikoloji (Ücretli)",
+    "Coğrafya",
+    "Fizik",
+    "Kimya Mühendisliği",
+    "Matematik Mühendisliği",
+    "Biyomedikal Mühendisliği (%75 İndirimli)",
+    "İşletme Mühendisliği",
+    "Hukuk ve Ekonomi",
+    "Sağlık Yönetimi",
+    "Grafik Tasarımı (Burslu %50)",
+    "Mimarlık (BURSLU)",
+    "Mütercim-Tercümanlık (%100 Burslu)",
+    None,
+]
+
+FACULTIES = [
+    "Mühendislik Fakültesi",
+    "Mühendislik ve Doğa Bilimleri Fakültesi",
+    "Mühendislik ve Fen Bilimleri Fakültesi",
+    "Tıp Fakültesi",
+    "İktisadi ve İdari Bilimler Fakültesi",
+    "İşletme Fakültesi",
+    "Eğitim Fakültesi",
+    "Fen Fakültesi",
+    "Fen-Edebiyat Fakültesi",
+    "Sağlık Hizmetleri Meslek Yüksekokulu",
+    "Adalet Meslek Yüksekokulu",
+    "Hukuk Fakültesi",
+    "Diş Hekimliği Fakültesi",
+    "Spor Bilimleri Fakültesi",
+    None,
+]
+
+
+def _baseline_program_category(names):
+    # Önceki Fakülte/Bölüm sayfası: sıralı str.contains atamaları, sonraki eşleşme öncekini ezer
+    df = pd.DataFrame({"Program Adı": names})
+    df["Program_Kategorisi"] = "Diğer"
+    df.loc[df["Program Adı"].str.contains("Mühendisliği|Mühendislik", case=False, na=False), "Program_Kategorisi"] = "Mühendislik"
+    df.loc[df["Program Adı"].str.contains("Tıp|Diş Hekimliği|Veteriner|Eczacılık", case=False, na=False), "Program_Kategorisi"] = "Sağlık"
+    df.loc[df["Program Adı"].str.contains("Öğretmenliği|Eğitimi", case=False, na=False), "Program_Kategorisi"] = "Eğitim"
+    df.loc[df["Program Adı"].str.contains("İşletme|İktisat|Maliye|Ekonomi", case=False, na=False), "Program_Kategorisi"] = "İşletme-İktisat"
+    df.loc[df["Program Adı"].str.contains("Hukuk", case=False, na=False), "Program_Kategorisi"] = "Hukuk"
+    df.loc[df["Program Adı"].str.contains("Psikoloji|Sosyoloji|Felsefe|Tarih|Coğrafya", case=False, na=False), "Program_Kategorisi"] = "Sosyal Bilimler"
+    df.loc[df["Program Adı"].str.contains("Matematik|Fizik|Kimya|Biyoloji", case=False, na=False), "Program_Kategorisi"] = "Fen Bilimleri"
+    return df["Program_Kategorisi"].tolist()
+
+
+def _baseline_faculty_type(names):
+    df = pd.DataFrame({"Fakülte/Yüksekokul Adı": names})
+    df["Fakulte_Turu"] = "Diğer"
+    ad = df["Fakülte/Yüksekokul Adı"]
+    df.loc[ad.str.contains("Mühendislik", case=False, na=False), "Fakulte_Turu"] = "Mühendislik"
+    df.loc[ad.str.contains("Tıp", case=False, na=False), "Fakulte_Turu"] = "Tıp"
+    df.loc[ad.str.contains("İktisadi|İktisat|İşletme", case=False, na=False), "Fakulte_Turu"] = "İktisadi"
+    df.loc[ad.str.contains("Eğitim", case=False, na=False), "Fakulte_Turu"] = "Eğitim"
+    df.loc[ad.str.contains("Fen|Fen-Edebiyat", case=False, na=False), "Fakulte_Turu"] = "Fen-Edebiyat"
+    df.loc[ad.str.contains("Meslek Yüksekokulu", case=False, na=False), "Fakulte_Turu"] = "MYO"
+    df.loc[ad.str.contains("Hukuk", case=False, na=False), "Fakulte_Turu"] = "Hukuk"
+    return df["Fakulte_Turu"].tolist()
+
+
+def _baseline_scholarship(names):
+    # Önceki Vakıf sayfası: Burslu/Ücretli ayrımı, ardından sıralı oran atamaları
+    df = pd.DataFrame({"Program Adı": names})
+    burslu = df["Program Adı"].str.contains("Burslu|BURSLU|%50|%25|%75|%100", case=False, na=False)
+    df["Burs"] = "Ücretli"
+    df.loc[burslu, "Burs"] = "Diğer Burslu"
+    for oran in ("100", "75", "50", "25"):
+        df.loc[burslu & df["Program Adı"].str.contains(f"%{oran}|{oran}%", case=False, na=False), "Burs"] = f"%{oran}"
+    return df["Burs"].tolist()
+
+
+def test_program_categories_match_baseline_rules():
+    names = pd.Series(PROGRAMS, dtype="object")
+
+    assert PROGRAM_CATEGORIES.classify(names).tolist() == _baseline_program_category(names)
+
+
+def test_faculty_types_match_baseline_rules():
+    names = pd.Series(FACULTIES, dtype="object")
+
+    assert FACULTY_TYPES.classify(names).tolist() == _baseline_faculty_type(names)
+
+
+def test_scholarship_tiers_match_baseline_split():
+    names = [name for name in PROGRAMS if name is not None]
+    df = add_scholarship(pd.DataFrame({"Program Adı": names}))
+
+    # "Diğer Burslu" (oran yazmayan burslu programlar) artık %100 kademesindedir
+    expected = ["%100" if burs == "Diğer Burslu" else burs for burs in _baseline_scholarship(names)]
+    assert df["Burs_Orani"].astype(str).tolist() == expected
+    assert df["Temel_Program"].astype(str).tolist()[:6] == [
+        "Bilgisayar Mühendisliği", "Endüstri Mühendisliği (İngilizce)", "Tıp", "Diş Hekimliği", "Veteriner", "Eczacılık",
+    ]
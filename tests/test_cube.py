@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from src.aggregates import VERSION_ATTR, _compute, clear_memo, rollup
+from src.cube import Cube
+
+METRICS = (
+    "Toplam_Kontenjan", "Toplam_Yerlesen", "Program_Sayisi", "Uni_Sayisi", "Sehir_Sayisi", "Bolge_Sayisi",
+    "Doluluk_Orani", "Bos_Kontenjan", "Bos_Yuzde",
+)
+
+
+def _frame():
+    # 70 üniversite: bit kümesi birden fazla uint64 kelimeye yayılır; her üniversitenin birkaç programı var
+    n = 140
+    uni = np.arange(n) % 70
+    iller = np.array(["ANKARA", "İZMİR", "HAKKARİ"])[uni % 3]
+    bolgeler = np.array(["İç Anadolu", "Ege", "Doğu Anadolu"])[uni % 3]
+    kontenjan = pd.array((np.arange(n) % 7) * 10, dtype="Int32")
+    kontenjan[5] = None
+    yerlesen = pd.array((np.arange(n) % 5) * 10, dtype="Int32")
+    yerlesen[8] = None
+    doluluk = np.where(np.arange(n) % 11 == 0, np.nan, 50.0)
+    frame = pd.DataFrame({
+        "Program Kodu": np.arange(n) + 1000,
+        "Üniversite Adı": pd.Categorical([f"ÜNİ {u:02d}" for u in uni]),
+        "Üniversite Türü": pd.Categorical(np.where(uni % 2 == 0, "DEVLET", "VAKIF")),
+        "İl": pd.Categorical(iller),
+        "Bölge": pd.Categorical(bolgeler),
+        "Puan Türü": pd.Categorical(np.array(["SAY", "EA", "SÖZ", "DİL"])[np.arange(n) % 4]),
+        "Kontenjan": kontenjan,
+        "Yerleşen": yerlesen,
+        "Doluluk_Orani": doluluk,
+    })
+    frame.attrs[VERSION_ATTR] = "test"
+    return frame
+
+
+def _filtered(frame, where):
+    mask = frame["Doluluk_Orani"].notna()
+    for col, values in where.items():
+        mask &= frame[col].isin(values)
+    return frame[mask]
+
+
+def test_cube_rollup_matches_groupby():
+    frame = _frame()
+    cube = Cube(frame)
+    wheres = (
+        {},
+        {"Üniversite Türü": ["DEVLET"]},
+        # Ege yalnızca İZMİR'de: diğer şehir/puan türü grupları boş kalır ve çıktıda yer almaz
+        {"Bölge": ["Ege"], "Puan Türü": ["SAY", "DİL"]},
+    )
+    for where in wheres:
+        expected_rows = _filtered(frame, where)
+        for by in (["Bölge"], ["İl"], ["Üniversite Türü", "Puan Türü"]):
+            pd.testing.assert_frame_equal(
+                cube.rollup(by, METRICS, where=where), _compute(expected_rows, by, METRICS),
+            )
+
+
+def test_cube_counts_distinct_universities_across_cells():
+    frame = _frame()
+    cube = Cube(frame)
+
+    out = cube.rollup("Üniversite Türü", ("Uni_Sayisi", "Program_Sayisi"), where={}, valid_only=False)
+
+    # Her üniversitenin programları farklı Puan Türü hücrelerinde: hücre sayıları toplanırsa fazla sayılırdı
+    assert out["Uni_Sayisi"].tolist() == [35, 35]
+    assert out["Program_Sayisi"].tolist() == [70, 70]
+    assert cube.uni_bits.shape[1] == 2
+
+
+def test_cube_rollup_with_no_matching_cells_is_empty():
+    frame = _frame()
+    out = Cube(frame).rollup("İl", METRICS, where={"İl": ["ANKARA"], "Bölge": ["Ege"]})
+
+    assert out.empty
+    assert list(out.columns) == ["İl", *METRICS]
+
+
+def test_rollup_memo_is_keyed_by_version_and_filter_key():
+    clear_memo()
+    frame = _frame()
+    first = rollup(frame, "İl", key=("test",))
+    changed = frame.assign(Kontenjan=frame["Kontenjan"] * 2)
+    changed.attrs[VERSION_ATTR] = "test"
+
+    # Aynı sürüm ve anahtar: önbellekteki sonuç döner
+    pd.testing.assert_frame_equal(rollup(changed, "İl", key=("test",)), first)
+    # Farklı anahtar ya da sürüm yeniden hesaplar
+    assert rollup(changed, "İl", key=("other",))["Toplam_Kontenjan"].sum() == 2 * first["Toplam_Kontenjan"].sum()
+    changed.attrs[VERSION_ATTR] = "test-2"
+    assert rollup(changed, "İl", key=("test",))["Toplam_Kontenjan"].sum() == 2 * first["Toplam_Kontenjan"].sum()
+    clear_memo()
@@ -0,0 +1,94 @@
+import pandas as pd
+
+from src import config
+from src import data_loader
+from src.data_loader import _read_cache, _write_cache, cache_key, detect_encoding, load_processed, load_yks_table
+
+
+def _csv(tmp_path, text="Üniversite Adı,Kontenjan\nA ÜNİ,10\n"):
+    path = tmp_path / "veri.csv"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _sources(tmp_path, monkeypatch):
+    source = tmp_path / "preprocess.py"
+    source.write_text("SURUM = 1\n", encoding="utf-8")
+    monkeypatch.setattr(data_loader, "_PREPROCESS_SOURCES", (source,))
+    return source
+
+
+def test_cache_key_changes_with_csv_and_preprocess_sources(tmp_path, monkeypatch):
+    path = _csv(tmp_path)
+    source = _sources(tmp_path, monkeypatch)
+    key = cache_key(path)
+
+    assert cache_key(path) == key
+    path.write_text("Üniversite Adı,Kontenjan\nA ÜNİ,20\n", encoding="utf-8")
+    csv_changed = cache_key(path)
+    assert csv_changed != key
+    source.write_text("SURUM = 2\n", encoding="utf-8")
+    assert cache_key(path) != csv_changed
+    monkeypatch.setattr(config, "PROCESSED_CACHE_FORMAT", config.PROCESSED_CACHE_FORMAT + 1)
+    assert cache_key(path).split("-")[1] != csv_changed.split("-")[1]
+
+
+def test_read_cache_rejects_other_keys_and_broken_files(tmp_path):
+    cache_path = tmp_path / "veri.processed.parquet"
+    df = pd.DataFrame({"Üniversite Adı": pd.Categorical(["A ÜNİ"]), "Kontenjan": pd.array([10], dtype="Int32")})
+
+    assert _read_cache(cache_path, "k1") is None
+    _write_cache(cache_path, "k1", df)
+    pd.testing.assert_frame_equal(_read_cache(cache_path, "k1"), df)
+    assert _read_cache(cache_path, "k2") is None
+    cache_path.write_bytes(b"yarim kalmis dosya")
+    assert _read_cache(cache_path, "k1") is None
+
+
+def test_load_processed_rebuilds_when_csv_or_preprocess_changes(tmp_path, monkeypatch):
+    path = _csv(tmp_path)
+    source = _sources(tmp_path, monkeypatch)
+    calls = []
+
+    def fake_preprocess(raw, geography=None):
+        calls.append(len(raw))
+        return raw.assign(**{"İl": "ANKARA", "Bölge": "İç Anadolu"})
+
+    monkeypatch.setattr(data_loader, "preprocess", fake_preprocess)
+    monkeypatch.setattr(data_loader, "load_yks_table", lambda csv_path=None: load_yks_table(csv_path=csv_path, schema=None))
+    monkeypatch.setattr(data_loader, "GEOGRAPHY_COLUMNS", ("İl", "Bölge"))
+
+    first = load_processed(csv_path=path)
+    pd.testing.assert_frame_equal(load_processed(csv_path=path), first)
+    assert len(calls) == 1
+    path.write_text("Üniversite Adı,Kontenjan\nA ÜNİ,10\nB ÜNİ,5\n", encoding="utf-8")
+    assert len(load_processed(csv_path=path)) == 2
+    assert len(calls) == 2
+    source.write_text("SURUM = 2\n", encoding="utf-8")
+    load_processed(csv_path=path)
+    assert len(calls) == 3
+
+
+def test_detect_encoding_of_non_utf8_file_with_ascii_prefix(tmp_path):
+    path = tmp_path / "veri.csv"
+    prefix = "Program,Kontenjan\n" + "PROGRAM,10\n" * 20
+    path.write_bytes((prefix + "İŞLETME,20\n").encode("cp1254"))
+    ascii_bytes = len(prefix)
+
+    # Örnek Türkçe baytları kapsıyorsa cp1254 bulunur
+    assert detect_encoding(path) == "cp1254"
+    # Örnek yalnızca ASCII ise UTF-8 sanılır; yükleyici tüm dosyayla yeniden tespit eder
+    assert detect_encoding(path, sample_size=ascii_bytes) == "utf-8"
+    long_prefix = "Program,Kontenjan\n" + "PROGRAM,10\n" * (config.ENCODING_SAMPLE_BYTES // 10)
+    path.write_bytes((long_prefix + "İŞLETME,20\n").encode("cp1254"))
+    df = load_yks_table(csv_path=path, schema=None)
+    assert df["Program"].iloc[-1] == "İŞLETME"
+    assert data_loader._read_load_meta(path)["encoding"] == "cp1254"
+
+
+def test_detect_encoding_keeps_utf8_split_inside_a_character(tmp_path):
+    path = tmp_path / "veri.csv"
+    path.write_bytes("Aİ,ŞÜ\n".encode("utf-8"))
+
+    # 2. bayt "İ" karakterinin ortasında biter: yarım karakter UTF-8 sayılmaya devam eder
+    assert detect_encoding(path, sample_size=2) == "utf-8"
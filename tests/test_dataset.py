@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from src import dataset as dataset_module
+from src.dataset import Dataset, get_dataset, get_frame
+
+
+def test_view_changes_do_not_reach_shared_frame(monkeypatch):
+    frame = pd.DataFrame({
+        "Kontenjan": pd.array([10, 20, 30], dtype="Int32"),
+        "Doluluk_Orani": [50.0, 75.0, 100.0],
+        "İl": pd.Categorical(["ANKARA", "İZMİR", "ANKARA"]),
+    })
+    expected = frame.copy(deep=True)
+    monkeypatch.setattr(dataset_module, "_dataset", Dataset(frame=frame, version="test"))
+
+    view = get_frame()
+    view.loc[0, "Kontenjan"] = 99
+    view.iloc[1, 1] = 0.0
+    view["Doluluk_Orani"] *= 2
+    view["Yeni"] = 1
+
+    pd.testing.assert_frame_equal(get_dataset().frame, expected)
+
+
+def test_view_copies_data_without_copy_on_write(monkeypatch):
+    frame = pd.DataFrame({"Kontenjan": [10, 20, 30], "Doluluk_Orani": [50.0, 75.0, 100.0]})
+    monkeypatch.setattr(dataset_module, "_copy_on_write", lambda: False)
+
+    view = Dataset(frame=frame, version="test").view()
+
+    assert not np.shares_memory(view["Doluluk_Orani"].to_numpy(), frame["Doluluk_Orani"].to_numpy())
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from src.aggregates import VERSION_ATTR
+from src.bitmap_index import BitmapIndex
+from src.filters import FilterSpec, row_indices
+
+
+def _frame():
+    frame = pd.DataFrame({
+        "Üniversite Türü": pd.Categorical(["DEVLET", "VAKIF", "DEVLET", "VAKIF", "DEVLET"]),
+        "Kontenjan": pd.array([10, 20, 30, 40, 50], dtype="Int32"),
+        "En Küçük Puan": np.array([300, 350, np.nan, 400, 450], dtype="float32"),
+    })
+    frame.attrs[VERSION_ATTR] = "test"
+    return frame
+
+
+def test_subset_does_not_reuse_full_frame_rows():
+    frame = _frame()
+    index = BitmapIndex(frame)
+    spec = FilterSpec.from_selections({"Üniversite Türü": ["DEVLET"]}, None, None)
+
+    assert row_indices(spec, frame, index).tolist() == [0, 2, 4]
+    subset = frame.iloc[2:]
+    assert subset.attrs[VERSION_ATTR] == "test"
+    assert row_indices(spec, subset, index).tolist() == [0, 2]
+    assert row_indices(spec, subset).tolist() == [0, 2]
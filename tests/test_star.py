@@ -0,0 +1,42 @@
+import pandas as pd
+
+from src.aggregates import BASE_METRICS, DEFAULT_METRICS, DERIVED_METRICS, VERSION_ATTR, _compute, rollup
+from src.star import StarSchema
+
+
+def _frame():
+    frame = pd.DataFrame({
+        "Program Kodu": [101, 102, 103, 104, 105, 106],
+        "Üniversite Adı": pd.Categorical(["A ÜNİ", "B ÜNİ", "A ÜNİ", "C ÜNİ", "B ÜNİ", "C ÜNİ"]),
+        "Üniversite Türü": pd.Categorical(["DEVLET", "VAKIF", "DEVLET", "DEVLET", "VAKIF", "DEVLET"]),
+        "İl": pd.Categorical(["ANKARA", "İZMİR", "ANKARA", "HAKKARİ", "İZMİR", "HAKKARİ"]),
+        "Bölge": pd.Categorical(["İç Anadolu", "Ege", "İç Anadolu", None, "Ege", None]),
+        "Fakülte/Yüksekokul Adı": pd.Categorical(["Tıp", "Hukuk", "Hukuk", "Tıp", "Hukuk", "Eğitim"]),
+        "Fakulte_Turu": pd.Categorical(["Tıp", "Hukuk", "Hukuk", "Tıp", "Hukuk", "Eğitim"]),
+        "Kontenjan": pd.array([10, 20, None, 40, 50, 0], dtype="Int32"),
+        "Yerleşen": pd.array([10, 15, 5, None, 50, 0], dtype="Int32"),
+    })
+    frame.attrs[VERSION_ATTR] = "test"
+    return frame
+
+
+def test_star_rollup_matches_groupby_on_subsets():
+    frame = _frame()
+    star = StarSchema(frame)
+    metrics = tuple(BASE_METRICS) + DERIVED_METRICS
+
+    for subset in (frame, frame[frame["Üniversite Türü"] == "DEVLET"], frame.iloc[[1, 3, 5]]):
+        rows = star.fact_rows(subset)
+        assert rows is not None
+        for by in (["Üniversite Adı"], ["İl"], ["Bölge"], ["Fakülte/Yüksekokul Adı", "Fakulte_Turu"]):
+            pd.testing.assert_frame_equal(star.rollup(by, metrics, rows=rows), _compute(subset, by, metrics))
+
+
+def test_rollup_falls_back_for_frames_outside_the_schema():
+    frame = _frame()
+    star = StarSchema(frame)
+    reordered = frame.iloc[::-1].reset_index(drop=True)
+
+    assert star.fact_rows(reordered) is None
+    assert not star.supports(["Puan Türü"], ("Toplam_Kontenjan",))
+    pd.testing.assert_frame_equal(rollup(reordered, "İl", star=star), _compute(reordered, ["İl"], DEFAULT_METRICS))
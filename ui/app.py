@@ -1,4 +1,5 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import sys
@@ -11,8 +12,10 @@ if str(PROJECT_ROOT) not in sys.path:
 
 # Import with error handling for Streamlit Cloud
 try:
-    from src.data_loader import load_processed  # noqa: E402
+    from src.dataset import get_dataset, get_frame  # noqa: E402
+    from src.filters import FilterSpec, compile_mask, row_indices  # noqa: E402
     from src import config  # noqa: E402
+    from ui.components import paginated_grid  # noqa: E402
 except ImportError as e:
     st.error(f"Import hatası: {e}")
     st.error("Lütfen veri dosyalarının doğru konumda olduğundan emin olun.")
@@ -63,94 +66,107 @@ st.markdown("""
 
 st.title("YKS Yerleştirme Analiz Platformu")
 
-@st.cache_data(show_spinner=True)
-def get_data() -> pd.DataFrame:
-    return load_processed()
-
 with st.spinner("Veri yükleniyor..."):
-    df = get_data()
+    df = get_frame()
+    indeks = get_dataset().bitmap_index
 
 st.success(f"Toplam satır (işlenmiş): {len(df):,}")
 
 # Sütun adlarını sadeleştirme (tekrar eden kolon grupları için index ekleme opsiyonel)
 # Burada orijinal sütunları koruyoruz.
 
+def kategorik_secim(secim: dict) -> dict:
+    """Bitmap indeksine verilecek seçim (boş seçim = filtre yok)."""
+    return {col: secilen for col, secilen in secim.items() if secilen and col in indeks.columns}
+
 # Filtre bölmesi
 with st.sidebar:
     st.header("Filtreler")
-    uni_turleri = sorted(df["Üniversite Türü"].dropna().unique().tolist()) if "Üniversite Türü" in df.columns else []
-    secilen_tur = st.multiselect("Üniversite Türü", uni_turleri, default=uni_turleri[:3] if len(uni_turleri)>3 else uni_turleri)
+    uni_turleri = indeks.present_values("Üniversite Türü") if "Üniversite Türü" in indeks.columns else []
+    puan_turleri = indeks.present_values("Puan Türü") if "Puan Türü" in indeks.columns else []
+    bolgeler = indeks.present_values("Bölge") if "Bölge" in indeks.columns else []
+    varsayilan_tur = uni_turleri[:3] if len(uni_turleri)>3 else uni_turleri
+
+    # Kontenjan aralığı sınırları (ilk 'Kontenjan' kolonu baz alınır)
+    kont_sinirlari = None
+    if "Kontenjan" in df.columns and df["Kontenjan"].notna().any():
+        kont_sinirlari = (int(df["Kontenjan"].min()), int(df["Kontenjan"].max()))
+
+    # Seçenek sayıları: güncel seçim widget'lar çizilmeden önce oturum durumundan okunur,
+    # her seçenek için diğer filtreler altında eşleşecek program sayısı tek geçişte hesaplanır
+    durum = st.session_state
+    on_secim = {
+        "Üniversite Türü": durum.get("filtre_tur", varsayilan_tur),
+        "Puan Türü": durum.get("filtre_puan", puan_turleri),
+        "Bölge": durum.get("filtre_bolge", bolgeler),
+    }
+    if durum.get("filtre_il", "Tümü") != "Tümü":
+        on_secim["İl"] = [durum["filtre_il"]]
+    sayilar = indeks.facet_counts(
+        kategorik_secim(on_secim),
+        base=compile_mask(FilterSpec.from_selections(
+            score_range=(durum.get("filtre_min_puan", 0.0), durum.get("filtre_max_puan", 1000.0))
+            if "En Küçük Puan" in df.columns else None,
+            quota_range=durum.get("filtre_kontenjan", kont_sinirlari),
+        ), df),
+    )
 
-    puan_turleri = sorted(df["Puan Türü"].dropna().unique().tolist()) if "Puan Türü" in df.columns else []
-    secilen_puan = st.multiselect("Puan Türü", puan_turleri, default=puan_turleri)
+    def sayili(sutun: str):
+        return lambda deger: deger if deger == "Tümü" else f"{deger} ({int(sayilar[sutun].get(deger, 0)):,})"
+
+    secilen_tur = st.multiselect("Üniversite Türü", uni_turleri, default=varsayilan_tur,
+                                 format_func=sayili("Üniversite Türü"), key="filtre_tur")
+    secilen_puan = st.multiselect("Puan Türü", puan_turleri, default=puan_turleri,
+                                  format_func=sayili("Puan Türü"), key="filtre_puan")
 
     st.markdown("---")
     st.subheader("🗺️ Coğrafi Filtreler")
     
     # Çoklu seçim - Bölge  
-    bolgeler = sorted(df["Bölge"].dropna().unique().tolist()) if "Bölge" in df.columns else []
-    secilen_bolgeler = st.multiselect("Bölge Seçin", bolgeler, default=bolgeler)
+    secilen_bolgeler = st.multiselect("Bölge Seçin", bolgeler, default=bolgeler,
+                                      format_func=sayili("Bölge"), key="filtre_bolge")
 
     # Tek seçim - İl (seçilen bölgelere göre)
     if secilen_bolgeler and "Bölge" in df.columns and "İl" in df.columns:
-        uygun_iller = df[df["Bölge"].isin(secilen_bolgeler)]["İl"].dropna().unique()
-        uygun_iller = ["Tümü"] + sorted(uygun_iller.tolist())
+        uygun_iller = ["Tümü"] + indeks.present_values("İl", {"Bölge": secilen_bolgeler})
     else:
-        uygun_iller = ["Tümü"] + sorted(df["İl"].dropna().unique().tolist()) if "İl" in df.columns else ["Tümü"]
+        uygun_iller = ["Tümü"] + indeks.present_values("İl") if "İl" in indeks.columns else ["Tümü"]
     
     secilen_il = st.selectbox(
         f"İl Seçin ({len(uygun_iller)-1} uygun il)", 
         uygun_iller, 
-        index=0
+        index=0,
+        format_func=sayili("İl"),
+        key="filtre_il",
     )
 
     st.markdown("---")
     st.subheader("📊 Puan & Kontenjan Filtreleri")
 
-    min_puan = st.number_input("En Küçük Puan >=", value=0.0, step=1.0)
-    max_puan = st.number_input("En Küçük Puan <=", value=1000.0, step=1.0)
+    min_puan = st.number_input("En Küçük Puan >=", value=0.0, step=1.0, key="filtre_min_puan")
+    max_puan = st.number_input("En Küçük Puan <=", value=1000.0, step=1.0, key="filtre_max_puan")
 
-    # Kontenjan aralığı filtresi (ilk 'Kontenjan' kolonu baz alınır)
     kont_range = None
-    if "Kontenjan" in df.columns:
-        _kont_numeric = pd.to_numeric(df["Kontenjan"], errors='coerce')
-        if _kont_numeric.notna().any():
-            kmin = int(_kont_numeric.min())
-            kmax = int(_kont_numeric.max())
-            kont_range = st.slider("Kontenjan aralığı", min_value=kmin, max_value=kmax, value=(kmin, kmax), step=1)
-
-filtreli = df.copy()
-if secilen_tur:
-    filtreli = filtreli[filtreli["Üniversite Türü"].isin(secilen_tur)]
-if secilen_puan:
-    filtreli = filtreli[filtreli["Puan Türü"].isin(secilen_puan)]
-# Çoklu bölge filtresi
-if secilen_bolgeler and "Bölge" in filtreli.columns:
-    filtreli = filtreli[filtreli["Bölge"].isin(secilen_bolgeler)]
-# Tek il filtresi  
-if secilen_il and secilen_il != "Tümü" and "İl" in filtreli.columns:
-    filtreli = filtreli[filtreli["İl"] == secilen_il]
-if "Kontenjan" in filtreli.columns and 'kont_range' in locals() and kont_range is not None:
-    _fk = pd.to_numeric(filtreli["Kontenjan"], errors='coerce')
-    filtreli = filtreli[(_fk >= kont_range[0]) & (_fk <= kont_range[1])]
-
-# Puana göre sayısal filtre (bazı hücrelerde '--' olabilir)
-if "En Küçük Puan" in filtreli.columns:
-    def to_float(x):
-        try:
-            return float(str(x).replace(',', '.'))
-        except ValueError:
-            return None
-    filtreli = filtreli.assign(_enkucuk=filtreli["En Küçük Puan"].map(to_float))
-    filtreli = filtreli[(filtreli["_enkucuk"].isna()) | ((filtreli["_enkucuk"]>=min_puan) & (filtreli["_enkucuk"]<=max_puan))]
+    if kont_sinirlari is not None:
+        kmin, kmax = kont_sinirlari
+        kont_range = st.slider("Kontenjan aralığı", min_value=kmin, max_value=kmax, value=(kmin, kmax), step=1,
+                               key="filtre_kontenjan")
+
+# Kenar çubuğu durumunun tamamı tek bir filtre tanımıdır; tek maske değerlendirilir ve
+# eşleşen satır konumları tanım başına önbelleğe alınır, satırlar tek seferde alınır
+secim = {"Üniversite Türü": secilen_tur, "Puan Türü": secilen_puan, "Bölge": secilen_bolgeler}
+if secilen_il and secilen_il != "Tümü":
+    secim["İl"] = [secilen_il]
+filtre = FilterSpec.from_selections(
+    kategorik_secim(secim),
+    score_range=(min_puan, max_puan) if "En Küçük Puan" in df.columns else None,
+    quota_range=kont_range,
+)
+satirlar = row_indices(filtre, df, indeks)
+filtreli = df.take(satirlar)
 
 st.subheader("Veri Tablosu (İşlenmiş)")
-# Index'i 1'den başlat
-display_df = filtreli.drop(columns=["_enkucuk"], errors='ignore').head(100).copy()
-display_df.index = range(1, len(display_df) + 1)
-st.dataframe(display_df, use_container_width=True)
-
-st.caption("İlk 100 satır gösterildi (performans için). Filtreleme tüm veriye uygulanıyor.")
+paginated_grid(df, satirlar, get_dataset().sort_orders, key="ana_tablo")
 
 # Basit özetler
 st.subheader("📈 Filtreleme Sonuçları")
@@ -173,8 +189,8 @@ with col4:
 # Doluluk oranı hesaplama (Kontenjan & Yerleşen tekrar eden kolonlar olduğundan ilk çifti kullanıyoruz)
 if {"Kontenjan", "Yerleşen"}.issubset(filtreli.columns):
     try:
-        kont = pd.to_numeric(filtreli["Kontenjan"], errors='coerce')
-        yerl = pd.to_numeric(filtreli["Yerleşen"], errors='coerce')
+        kont = filtreli["Kontenjan"]
+        yerl = filtreli["Yerleşen"]
         doluluk = (yerl.sum()/kont.sum()*100) if kont.sum() else None
         if doluluk is not None:
             st.metric("Toplam Doluluk (%)", f"{doluluk:0.2f}")
@@ -0,0 +1,71 @@
+"""Sayfalarda ortak kullanılan Streamlit bileşenleri."""
+from typing import Callable, Mapping
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.pagination import SortOrders, page_bounds, page_count
+
+VARSAYILAN_SIRA = "(Varsayılan sıra)"
+
+# Parça (fragment) içindeki widget'lar yalnızca o parçayı yeniden çalıştırır. st.fragment 1.37+,
+# öncesinde st.experimental_fragment; ikisi de yoksa sayfa bütün olarak yeniden çalışır.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+def paginated_grid(df: pd.DataFrame, rows: np.ndarray, orders: SortOrders, key: str,
+                   page_sizes=(25, 50, 100, 250)) -> None:
+    """Sunucu tarafında sıralanan, sayfalı tablo.
+
+    ``rows`` gösterilecek satırların ``df`` içindeki konumlarıdır; yalnızca görünen
+    sayfanın satırları tarayıcıya gönderilir.
+    """
+    col_sira, col_yon, col_boyut, col_sayfa = st.columns([3, 1, 1, 1])
+    with col_sira:
+        sira = st.selectbox("Sırala", [VARSAYILAN_SIRA] + list(df.columns), key=f"{key}_sirala")
+    with col_yon:
+        azalan = st.checkbox("Azalan", key=f"{key}_azalan")
+    with col_boyut:
+        boyut = st.selectbox("Sayfa boyutu", page_sizes, index=min(1, len(page_sizes) - 1), key=f"{key}_boyut")
+
+    toplam_sayfa = page_count(len(rows), boyut)
+    # Filtre daraldığında eski sayfa numarası geçerli aralığa çekilir
+    sayfa_anahtari = f"{key}_sayfa"
+    if st.session_state.get(sayfa_anahtari, 1) > toplam_sayfa:
+        st.session_state[sayfa_anahtari] = toplam_sayfa
+    with col_sayfa:
+        sayfa = st.number_input(f"Sayfa (/{toplam_sayfa})", min_value=1, max_value=toplam_sayfa, step=1,
+                                key=sayfa_anahtari)
+
+    sirali = orders.sorted_rows(rows, None if sira == VARSAYILAN_SIRA else sira, azalan)
+    bas, son = page_bounds(len(sirali), int(sayfa), boyut)
+    gorunen = df.take(sirali[bas:son])
+    # Index'i 1'den başlat (tüm sonuç içindeki sıra)
+    gorunen.index = range(bas + 1, son + 1)
+    st.dataframe(gorunen, use_container_width=True)
+    if len(sirali):
+        st.caption(f"{len(sirali):,} satırdan {bas + 1:,}–{son:,} arası gösteriliyor (sayfa {int(sayfa)}/{toplam_sayfa}).")
+    else:
+        st.caption("Filtrelere uyan satır yok.")
+
+def lazy_tabs(sections: Mapping[str, Callable[[], None]], key: str,
+              filters: Callable[[], None] | None = None) -> str:
+    """Sekme görünümlü bölüm seçici; yalnızca seçili bölümün fonksiyonu çalıştırılır.
+
+    ``st.tabs`` tüm sekmelerin içeriğini her çalıştırmada üretir; burada gizli
+    bölümlerin verisi ve grafikleri hiç hesaplanmaz. Bölüm bir parça olarak çalışır:
+    bölüm içindeki widget'lar sayfanın geri kalanını yeniden çalıştırmaz.
+    ``filters`` verilirse bölümden önce aynı parçada çalışır; sayfanın sayısal filtre
+    widget'ları burada (ana alanda; parçalar kenar çubuğuna yazamaz) gösterilir ve
+    değişiklikleri de yalnızca bu parçayı yeniden çalıştırır.
+    Seçilen bölümün adını döndürür.
+    """
+    secili = st.radio("Bölüm", list(sections), horizontal=True, key=key, label_visibility="collapsed")
+
+    def bolum() -> None:
+        if filters is not None:
+            filters()
+        sections[secili]()
+
+    fragment(bolum)()
+    return secili
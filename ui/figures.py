@@ -0,0 +1,523 @@
+"""Önbellekli Plotly grafik üreticileri."""
+import functools
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from src.dataset import get_dataset
+
+logger = logging.getLogger(__name__)
+
+_CACHE_SIZE = 128
+_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.Lock()
+
+BOLGE_RENKLERI = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8']
+
+# Sayfalarda ortak sütunların eksen/hover etiketleri; üreticilere verilen ``labels`` bunları ezer
+ETIKETLER = {
+    'Doluluk_Orani': '% Doluluk Oranı',
+    'Toplam_Kontenjan': 'Toplam Kontenjan',
+    'Toplam_Yerlesen': 'Toplam Yerleşen',
+    'Bos_Kontenjan': 'Boş Kontenjan',
+    'Bos_Yuzde': '% Boş Yüzde',
+    'Program_Sayisi': 'Program Sayısı',
+    'Uni_Sayisi': 'Üniversite Sayısı',
+    'Sehir_Sayisi': 'Şehir Sayısı',
+    'Uni_Adi': 'Üniversite Adı',
+    'Program_Adi': 'Bölüm Adı',
+    'Sehir': 'Şehir',
+    'Bolge': 'Bölge',
+    'İl': 'Şehir',
+    'Ana_Uni_Turu': 'Üniversite Türü',
+    'Fakulte_Turu': 'Fakülte Türü',
+    'Program_Kategorisi': 'Program Kategorisi',
+}
+
+# Gösterim hassasiyeti: hover biçimleri en fazla 2 ondalık gösterir
+DISPLAY_DECIMALS = 2
+_CUSTOMDATA_REF = re.compile(r"%\{customdata\[(\d+)\]")
+
+def payload_size(fig: go.Figure) -> int:
+    """Figürün tarayıcıya gönderilen JSON boyutu (bayt)."""
+    return len(pio.to_json(fig, validate=False))
+
+def _compact_array(values, decimals: int):
+    arr = np.asarray(values)
+    if arr.dtype.kind == "f":
+        # Yuvarlanmış ondalıklar kısa JSON sayıları olarak gider (f8 ikili diziden küçüktür);
+        # float32'ye çevirmek hover'da 85.12999725 gibi değerler gösterirdi
+        return np.round(arr, decimals).tolist()
+    return values
+
+def _set_array(obj, attr: str, values) -> None:
+    # Plotly eşit değerli atamayı yok sayar; yalnızca tipi değişen dizi için önce boşaltılır
+    setattr(obj, attr, None)
+    setattr(obj, attr, values)
+
+def _compact_customdata(trace, decimals: int) -> None:
+    """Hover'da kullanılmayan ya da x/y ile aynı olan customdata sütunlarını atar."""
+    customdata = np.asarray(trace.customdata, dtype=object)
+    template = trace.hovertemplate or ""
+    if customdata.ndim != 2:
+        return
+    refs = sorted({int(i) for i in _CUSTOMDATA_REF.findall(template)})
+    # x / y ile aynı sütunun başvurusu doğrudan eksen değerine yönlendirilir
+    for axis in ("x", "y"):
+        axis_values = getattr(trace, axis, None)
+        if axis_values is None or len(axis_values) != len(customdata):
+            continue
+        for i in refs:
+            if np.array_equal(customdata[:, i], np.asarray(axis_values, dtype=object)):
+                template = re.sub(rf"%\{{customdata\[{i}\]", f"%{{{axis}", template)
+    refs = sorted({int(i) for i in _CUSTOMDATA_REF.findall(template)})
+    yeni_sira = {eski: yeni for yeni, eski in enumerate(refs)}
+    trace.hovertemplate = _CUSTOMDATA_REF.sub(lambda m: f"%{{customdata[{yeni_sira[int(m.group(1))]}]", template)
+    if not refs:
+        trace.customdata = None
+        return
+    kalan = customdata[:, refs]
+    try:
+        # Tamamı sayısal kalan sütunlar sayısal diziye çevrilir; tam sayılar tam sayı kalır
+        sayisal = kalan.astype("float64")
+    except (TypeError, ValueError):
+        _set_array(trace, "customdata", kalan)
+        return
+    if np.isfinite(sayisal).all() and np.array_equal(sayisal, np.round(sayisal)):
+        sayisal = sayisal.astype("int64")
+    _set_array(trace, "customdata", _compact_array(sayisal, decimals))
+
+def compact_figure(fig: go.Figure, decimals: int = DISPLAY_DECIMALS) -> go.Figure:
+    """Figürün JSON yükünü küçültür (yerinde) ve boyutu günlüğe yazar.
+
+    Ondalıklı diziler gösterim hassasiyetine yuvarlanır; tam sayı dizileri numpy dizisi
+    kalır (Plotly bunları en küçük tam sayı tipinde ikili olarak kodlar). Hover'da
+    kullanılmayan veya eksen değerlerini tekrarlayan customdata sütunları atılır.
+    """
+    before = payload_size(fig) if logger.isEnabledFor(logging.INFO) else None
+    for trace in fig.data:
+        if getattr(trace, "hovertemplate", None) is not None and getattr(trace, "customdata", None) is not None:
+            _compact_customdata(trace, decimals)
+        for attr in ("x", "y", "z", "width"):
+            values = getattr(trace, attr, None)
+            if values is not None and not isinstance(values, str):
+                _set_array(trace, attr, _compact_array(values, decimals))
+        marker = getattr(trace, "marker", None)
+        if marker is not None:
+            for attr in ("color", "size"):
+                values = getattr(marker, attr, None)
+                if values is not None and not isinstance(values, str) and np.ndim(values) == 1:
+                    _set_array(marker, attr, _compact_array(values, decimals))
+    if before is not None:
+        logger.info("Figür yükü %s: %d -> %d bayt", fig.layout.title.text, before, payload_size(fig))
+    return fig
+
+def figure_builder(build: Callable[..., go.Figure]) -> Callable[..., go.Figure]:
+    """Saf bir grafik üreticisini önbellekli hale getirir.
+
+    ``build(data, **options)`` çıktısı yalnızca veriye ve seçeneklere bağlı olmalıdır.
+    Çağrıda ``key`` (verinin filtre durumu) verilirse figür (veri sürümü, üretici, key,
+    seçenekler) başına oturumlar arası paylaşılan sınırlı bir LRU önbellekte tutulur.
+    Dönen figür :func:`compact_figure` ile küçültülmüştür, paylaşılır; değiştirilmemelidir.
+    """
+    @functools.wraps(build)
+    def wrapper(data: pd.DataFrame, *, key: Hashable | None = None, **options) -> go.Figure:
+        if key is None:
+            return compact_figure(build(data, **options))
+        memo_key = (get_dataset().version, build.__qualname__, key, tuple(sorted(options.items())))
+        with _cache_lock:
+            fig = _cache.get(memo_key)
+            if fig is not None:
+                _cache.move_to_end(memo_key)
+                return fig
+        fig = compact_figure(build(data, **options))
+        with _cache_lock:
+            _cache[memo_key] = fig
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+        return fig
+    return wrapper
+
+def clear_figure_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+@figure_builder
+def bos_bolumler_bar(data: pd.DataFrame, x_col: str, x_title: str, color_col: str, color_title: str) -> go.Figure:
+    """Bölüm bazlı yatay çubuk grafik (Bölüm Doluluk sayfası, en boş bölümler)."""
+    display_df = data.copy()
+    # Program adlarını kısalt
+    display_df['Program_Kisa'] = display_df['Program_Adi'].apply(
+        lambda x: x[:50] + "..." if len(str(x)) > 50 else str(x)
+    )
+    fig = px.bar(
+        display_df,
+        y='Program_Kisa',
+        x=x_col,
+        color=color_col,
+        hover_data={
+            'Program_Adi': True,
+            'Toplam_Kontenjan': ':,',
+            'Toplam_Yerlesen': ':,',
+            'Program_Sayisi': True,
+            'Uni_Sayisi': True,
+            'Sehir_Sayisi': True,
+            'Doluluk_Orani': ':.1f',
+            'Bos_Kontenjan': ':,',
+            'Bos_Yuzde': ':.1f',
+            'Ana_Uni_Turu': True
+        },
+        title=f"Türkiye Geneli En Boş {len(display_df)} Bölüm",
+        orientation='h',
+        labels={x_col: x_title, 'Program_Kisa': 'Bölüm Adı'},
+        color_continuous_scale="Reds"
+    )
+    fig.update_layout(
+        height=max(500, len(display_df) * 30),
+        yaxis=dict(title="Bölüm Adı"),
+        xaxis=dict(title=x_title),
+        coloraxis_colorbar=dict(title=color_title)
+    )
+    # Renk ölçeği için yüzde formatı (doluluk oranı içeren grafiklerde)
+    if 'Doluluk' in color_title:
+        fig.update_layout(coloraxis_colorbar=dict(title=color_title, ticksuffix="%"))
+    return fig
+
+@figure_builder
+def bolge_doluluk_bar(data: pd.DataFrame, title: str) -> go.Figure:
+    """Bölgelere göre doluluk oranı; renk boş kontenjanı gösterir."""
+    fig = px.bar(
+        data.sort_values('Doluluk_Orani'),
+        x='Bölge',
+        y='Doluluk_Orani',
+        color='Bos_Kontenjan',
+        title=title,
+        labels={'Doluluk_Orani': '% Doluluk Oranı', 'Bos_Kontenjan': 'Boş Kontenjan'},
+        color_continuous_scale='Reds'
+    )
+    fig.update_xaxes(tickangle=45)
+    fig.update_yaxes(title="% Doluluk Oranı", ticksuffix="%")
+    return fig
+
+def _vurgulu_pasta(data: pd.DataFrame, names: str, values: str, title: str, legend_title: str,
+                   hover_label: str, colors, value_label: str = 'Program Sayısı',
+                   textinfo: str = 'label+percent', font_size: int = 11, title_color: str = 'darkblue') -> go.Figure:
+    fig = px.pie(
+        data,
+        values=values,
+        names=names,
+        title=title,
+        color_discrete_sequence=list(colors)
+    )
+    fig.update_traces(
+        textposition='inside',
+        textinfo=textinfo,
+        textfont_size=font_size,
+        textfont_color="white",
+        textfont_family="Arial Black",
+        marker=dict(
+            line=dict(color='white', width=3)
+        ),
+        pull=[0.1 if val == data[values].max() else 0 for val in data[values]],
+        hovertemplate=f'<b>{hover_label}:</b> %{{label}}<br><b>{value_label}:</b> %{{value}}<br><b>Toplam Yüzdesi:</b> %{{percent}}<br><extra></extra>'
+    )
+    fig.update_layout(
+        showlegend=True,
+        legend=dict(
+            orientation="v",
+            yanchor="middle",
+            y=0.5,
+            xanchor="left",
+            x=1.05,
+            font=dict(size=font_size - 1),
+            title=dict(
+                text=f"<b>{legend_title}</b>",
+                font=dict(size=font_size)
+            )
+        ),
+        font=dict(size=12),
+        title_font=dict(size=16, color=title_color),
+        margin=dict(l=20, r=120, t=50, b=20)
+    )
+    return fig
+
+@figure_builder
+def bolge_program_pasta(data: pd.DataFrame, title: str) -> go.Figure:
+    """Bölgelere göre program dağılımı; en büyük dilim öne çekilir."""
+    return _vurgulu_pasta(data, 'Bölge', 'Program_Sayisi', title, legend_title='Bölgeler',
+                          hover_label='Bölge', colors=BOLGE_RENKLERI, font_size=12)
+
+@figure_builder
+def bolge_kontenjan_scatter(data: pd.DataFrame, title: str) -> go.Figure:
+    """Bölge bazlı toplam kontenjan - doluluk ilişkisi; nokta büyüklüğü program sayısı."""
+    fig = px.scatter(
+        data,
+        x='Toplam_Kontenjan',
+        y='Doluluk_Orani',
+        size='Program_Sayisi',
+        color='Bölge',
+        title=title,
+        labels={
+            'Toplam_Kontenjan': 'Toplam Kontenjan',
+            'Doluluk_Orani': '% Doluluk Oranı',
+            'Program_Sayisi': 'Program Sayısı',
+            'Bölge': 'Bölge'
+        },
+        hover_data={
+            'Uni_Sayisi': True,
+            'Sehir_Sayisi': True
+        }
+    )
+    fig.update_yaxes(title="% Doluluk Oranı", ticksuffix="%")
+    return fig
+
+@figure_builder
+def bolge_bos_kontenjan_bar(data: pd.DataFrame, title: str) -> go.Figure:
+    """Bölgelere göre toplam boş kontenjan; renk doluluk oranını gösterir."""
+    fig = px.bar(
+        data.sort_values('Bos_Kontenjan', ascending=False),
+        x='Bölge',
+        y='Bos_Kontenjan',
+        title=title,
+        labels={
+            'Bölge': 'Bölge',
+            'Bos_Kontenjan': 'Boş Kontenjan',
+            'Doluluk_Orani': '% Doluluk Oranı'
+        },
+        color='Doluluk_Orani',
+        color_continuous_scale='RdYlGn'
+    )
+    fig.update_xaxes(tickangle=45)
+    return fig
+
+@figure_builder
+def sehir_doluluk_bar(data: pd.DataFrame, title: str) -> go.Figure:
+    """Şehir bazlı yatay doluluk çubukları; renk bölgeyi gösterir."""
+    fig = px.bar(
+        data,
+        y='Sehir',
+        x='Doluluk_Orani',
+        color='Bolge',
+        title=title,
+        orientation='h',
+        labels={
+            'Doluluk_Orani': '% Doluluk Oranı',
+            'Sehir': 'Şehir',
+            'Bolge': 'Bölge',
+            'Program_Sayisi': 'Program Sayısı',
+            'Uni_Sayisi': 'Üniversite Sayısı',
+            'Bos_Kontenjan': 'Boş Kontenjan'
+        },
+        hover_data=['Program_Sayisi', 'Uni_Sayisi', 'Bos_Kontenjan']
+    )
+    fig.update_xaxes(title="% Doluluk Oranı", ticksuffix="%")
+    return fig
+
+@figure_builder
+def sehir_bos_kontenjan_bar(data: pd.DataFrame, title: str) -> go.Figure:
+    """Şehir bazlı yatay boş kontenjan çubukları; renk doluluk oranını gösterir."""
+    return px.bar(
+        data,
+        y='Sehir',
+        x='Bos_Kontenjan',
+        color='Doluluk_Orani',
+        title=title,
+        orientation='h',
+        labels={
+            'Bos_Kontenjan': 'Boş Kontenjan',
+            'Sehir': 'Şehir',
+            'Doluluk_Orani': '% Doluluk Oranı'
+        },
+        color_continuous_scale='Reds'
+    )
+
+@figure_builder
+def histogram_bar(data: pd.DataFrame, title: str, x_title: str, y_title: str,
+                  colors: tuple = ('#FF6B6B',), mean: float | None = None, percent_axis: bool = False) -> go.Figure:
+    """Sunucuda hesaplanmış histogram kutuları (``src.chart_data.histogram_bins``) için çubuk grafik.
+
+    ``Seri`` sütunu varsa her seri ayrı, üst üste binen bir iz olarak çizilir;
+    ``mean`` verilirse ortalama çizgisi eklenir.
+    """
+    seriler = data.groupby('Seri', sort=False) if 'Seri' in data.columns else [(None, data)]
+    fig = go.Figure()
+    for i, (seri, kutular) in enumerate(seriler):
+        fig.add_trace(go.Bar(
+            x=kutular['Orta'],
+            y=kutular['Sayi'],
+            width=kutular['Ust_Sinir'] - kutular['Alt_Sinir'],
+            customdata=kutular[['Alt_Sinir', 'Ust_Sinir']],
+            name=seri,
+            marker_color=colors[i % len(colors)],
+            opacity=0.7 if seri is not None else 1.0,
+            hovertemplate=f'<b>{x_title}:</b> %{{customdata[0]:.1f}} - %{{customdata[1]:.1f}}<br>'
+                          f'<b>{y_title}:</b> %{{y}}<br><extra>{seri or ""}</extra>'
+        ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        barmode='overlay',
+        bargap=0,
+        showlegend='Seri' in data.columns
+    )
+    if percent_axis:
+        fig.update_xaxes(ticksuffix="%")
+    if mean is not None:
+        fig.add_vline(x=mean, line_dash="dash", line_color="red", annotation_text=f"Ortalama: {mean:.1f}%")
+    return fig
+
+def _etiketler(labels: tuple) -> dict:
+    return {**ETIKETLER, **dict(labels)}
+
+def _hover(hover: tuple) -> dict | None:
+    """``hover`` öğeleri sütun adı ya da (sütun, biçim) çiftidir."""
+    if not hover:
+        return None
+    return dict(h if isinstance(h, tuple) else (h, True) for h in hover)
+
+# Genel üreticiler: seçenekler önbellek anahtarına girdiği için demet (tuple) olarak verilir
+
+@figure_builder
+def cubuk_grafik(data: pd.DataFrame, x: str, y, title: str, color: str | None = None, orientation: str = 'v',
+                 labels: tuple = (), hover: tuple = (), color_scale: str | None = None, colors: tuple | None = None,
+                 percent_axis: bool = False, percent_color: bool = False, tickangle: int | None = None) -> go.Figure:
+    """Çubuk grafik; ``y`` demet ise her sütun ayrı seri olur.
+
+    ``percent_axis`` değer eksenine, ``percent_color`` renk ölçeğine % eki koyar.
+    """
+    fig = px.bar(
+        data,
+        x=x,
+        y=list(y) if isinstance(y, tuple) else y,
+        color=color,
+        title=title,
+        orientation=orientation,
+        labels=_etiketler(labels),
+        hover_data=_hover(hover),
+        color_continuous_scale=color_scale,
+        color_discrete_sequence=list(colors) if colors else None
+    )
+    if percent_axis:
+        deger_ekseni = fig.update_xaxes if orientation == 'h' else fig.update_yaxes
+        deger_ekseni(ticksuffix="%")
+    if percent_color:
+        fig.update_layout(coloraxis_colorbar=dict(ticksuffix="%"))
+    if tickangle is not None:
+        fig.update_xaxes(tickangle=tickangle)
+    return fig
+
+@figure_builder
+def nokta_grafik(data: pd.DataFrame, x: str, y: str, title: str, size: str | None = None, color: str | None = None,
+                 labels: tuple = (), hover: tuple = (), percent_axis: bool = False, render_mode: str = 'auto') -> go.Figure:
+    """Saçılım grafiği; ``percent_axis`` y eksenine % eki koyar."""
+    fig = px.scatter(
+        data,
+        x=x,
+        y=y,
+        size=size,
+        color=color,
+        title=title,
+        labels=_etiketler(labels),
+        hover_data=_hover(hover),
+        render_mode=render_mode
+    )
+    if percent_axis:
+        fig.update_yaxes(ticksuffix="%")
+    return fig
+
+@figure_builder
+def pasta_grafik(data: pd.DataFrame, names: str, values: str, title: str, colors: tuple | None = None) -> go.Figure:
+    """Sade pasta grafik."""
+    return px.pie(
+        data,
+        values=values,
+        names=names,
+        title=title,
+        color_discrete_sequence=list(colors) if colors else None
+    )
+
+@figure_builder
+def vurgulu_pasta(data: pd.DataFrame, names: str, values: str, title: str, legend_title: str, hover_label: str,
+                  colors: tuple = tuple(BOLGE_RENKLERI), value_label: str = 'Program Sayısı',
+                  textinfo: str = 'label+percent', title_color: str = 'darkblue') -> go.Figure:
+    """Dilim etiketli, lejantlı pasta grafik; en büyük dilim öne çekilir."""
+    return _vurgulu_pasta(data, names, values, title, legend_title, hover_label, colors,
+                          value_label=value_label, textinfo=textinfo, title_color=title_color)
+
+@figure_builder
+def bolum_kontenjan_scatter(data: pd.DataFrame, max_kontenjan: float, render_mode: str = 'auto') -> go.Figure:
+    """Bölümlerin kontenjan-doluluk ilişkisi; x ekseni 1000'de kesilir ("1000+")."""
+    fig = px.scatter(
+        data,
+        x='Toplam_Kontenjan',
+        y='Doluluk_Orani',
+        size='Uni_Sayisi',
+        color='Ana_Uni_Turu',
+        render_mode=render_mode,
+        hover_data={
+            'Program_Adi': True,
+            'Toplam_Kontenjan': ':,',
+            'Toplam_Yerlesen': ':,',
+            'Program_Sayisi': True,
+            'Uni_Sayisi': True,
+            'Sehir_Sayisi': True
+        },
+        title="Bölümlerin Kontenjan-Doluluk İlişkisi",
+        labels=ETIKETLER
+    )
+    fig.update_yaxes(ticksuffix="%")
+    # X ekseni ayarları - 100'lü aralıklar, 1000+ gösterim
+    fig.update_xaxes(
+        dtick=100,
+        range=[0, min(1000, max_kontenjan * 1.1)],
+        tickformat='d',
+        tickvals=list(range(0, 1001, 100)) + ([1000] if max_kontenjan > 1000 else []),
+        ticktext=[str(x) for x in range(0, 1000, 100)] + (['1000+'] if max_kontenjan > 1000 else [])
+    )
+    return fig
+
+@figure_builder
+def isi_haritasi(data: pd.DataFrame, title: str, x_title: str, y_title: str, color_title: str) -> go.Figure:
+    """Satır x sütun tablosundan ısı haritası."""
+    return px.imshow(
+        data.values,
+        labels=dict(x=x_title, y=y_title, color=color_title),
+        x=data.columns,
+        y=data.index,
+        title=title
+    )
+
+@figure_builder
+def cift_eksen_grafik(data: pd.DataFrame, x: str, bar: str, line: str, title: str,
+                      x_title: str, bar_title: str, line_title: str) -> go.Figure:
+    """``bar`` sol eksende çubuk, ``line`` sağ eksende çizgi olarak çizilir."""
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name=bar_title,
+        x=data[x],
+        y=data[bar],
+        yaxis='y'
+    ))
+    fig.add_trace(go.Scatter(
+        name=line_title,
+        x=data[x],
+        y=data[line],
+        yaxis='y2',
+        mode='lines+markers'
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_title,
+        yaxis=dict(title=bar_title),
+        yaxis2=dict(title=line_title, overlaying='y', side='right')
+    )
+    return fig
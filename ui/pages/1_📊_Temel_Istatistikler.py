@@ -7,15 +7,11 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.data_loader import load_processed  # noqa: E402
+from src.dataset import get_dataset, get_frame  # noqa: E402
 
 st.title("📊 Temel İstatistikler")
 
-@st.cache_data
-def get_data():
-    return load_processed()
-
-df = get_data()
+df = get_frame()
 
 st.markdown("### Genel Bilgiler")
 col1, col2, col3, col4 = st.columns(4)
@@ -33,22 +29,22 @@ with col4:
 
 st.markdown("### Doluluk Oranları (İlk Kolon Çifti)")
 if {"Kontenjan", "Yerleşen"}.issubset(df.columns):
-    kont = pd.to_numeric(df["Kontenjan"], errors='coerce')
-    yerl = pd.to_numeric(df["Yerleşen"], errors='coerce')
+    kont = df["Kontenjan"]
+    yerl = df["Yerleşen"]
     doluluk = (yerl.sum()/kont.sum()*100) if kont.sum() else None
     if doluluk is not None:
         st.progress(min(1.0, doluluk/100))
         st.write(f"Genel doluluk: **{doluluk:0.2f}%**")
 
+st.markdown("### Kontenjan Türlerine Göre Doluluk")
+kontenjan_uzun = get_dataset().quota_long
+tur_ozet = kontenjan_uzun.groupby("Kontenjan Türü", observed=True)[["Kontenjan", "Yerleşen"]].sum()
+tur_ozet["Doluluk (%)"] = (tur_ozet["Yerleşen"] / tur_ozet["Kontenjan"] * 100).round(2)
+st.dataframe(tur_ozet, use_container_width=True)
+
 st.markdown("### Puan Türüne Göre Ortalama En Küçük Puan")
 if {"Puan Türü", "En Küçük Puan"}.issubset(df.columns):
-    def to_float(x):
-        try:
-            return float(str(x).replace(',', '.'))
-        except ValueError:
-            return None
-    temp = df.assign(_enk= df["En Küçük Puan"].map(to_float))
-    grp = temp.groupby("Puan Türü", dropna=True)["_enk"].mean().dropna().sort_values(ascending=False)
+    grp = df.groupby("Puan Türü", dropna=True, observed=True)["En Küçük Puan"].mean().dropna().sort_values(ascending=False)
     st.bar_chart(grp)
 else:
     st.info("Gerekli kolonlar yok.")
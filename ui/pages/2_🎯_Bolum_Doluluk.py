@@ -1,8 +1,6 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
-import numpy as np
 import sys
 from pathlib import Path
 
@@ -10,7 +8,14 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.data_loader import load_processed  # noqa: E402
+from src.dataset import get_dataset, get_frame  # noqa: E402
+from src.aggregates import department_summary  # noqa: E402
+from src.chart_data import decimate, histogram_bins, scatter_render_mode  # noqa: E402
+from ui.components import lazy_tabs  # noqa: E402
+from ui.figures import (  # noqa: E402
+    bolum_kontenjan_scatter, bos_bolumler_bar, cubuk_grafik, histogram_bar, nokta_grafik, pasta_grafik,
+    vurgulu_pasta,
+)
 
 # CSS hover efektleri ekle
 st.markdown("""
@@ -29,58 +34,17 @@ div[data-testid="stNumberInput"] > div > div {
 
 st.title("🎯 Bölüm Doluluk Analizleri")
 
-@st.cache_data
-def get_data():
-    return load_processed()
-
-df = get_data()
+df = get_frame()
 
-# Doluluk oranını hesaplayan fonksiyon
-def calculate_occupancy(row):
-    try:
-        kontenjan = pd.to_numeric(row['Kontenjan'], errors='coerce')
-        yerlesen = pd.to_numeric(row['Yerleşen'], errors='coerce')
-        if pd.isna(kontenjan) or pd.isna(yerlesen) or kontenjan <= 0:
-            return np.nan
-        return (yerlesen / kontenjan) * 100
-    except:
-        return np.nan
-
-# Doluluk oranı hesapla
-df['Doluluk_Orani'] = df.apply(calculate_occupancy, axis=1)
-df['Bos_Kontenjan'] = pd.to_numeric(df['Kontenjan'], errors='coerce') - pd.to_numeric(df['Yerleşen'], errors='coerce')
 
 # Bölüm bazlı birleştirilmiş veri oluştur
 def create_department_analysis(data_df):
-    """Aynı bölüm adındaki tüm programları birleştirip analiz oluştur"""
-    bolum_analiz = data_df.groupby('Program Adı', as_index=False).agg({
-        'Kontenjan': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-        'Yerleşen': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-        'Üniversite Adı': ['count', 'nunique'],  # Program sayısı ve Üniversite sayısı
-        'İl': 'nunique',  # Farklı şehir sayısı
-        'Üniversite Türü': lambda x: list(x.unique()),  # Üniversite türleri
-        'Bölge': lambda x: list(x.dropna().unique()) if x.dropna().any() else ['Bilinmiyor']  # Bölgeler
-    })
-    
-    # Çoklu level sütunları düzelt
-    bolum_analiz.columns = ['Program_Adi', 'Toplam_Kontenjan', 'Toplam_Yerlesen', 
-                           'Program_Sayisi', 'Uni_Sayisi', 'Sehir_Sayisi', 
-                           'Uni_Turleri', 'Bolgeler']
-    
-    # İstatistikleri hesapla
-    bolum_analiz['Doluluk_Orani'] = (bolum_analiz['Toplam_Yerlesen'] / bolum_analiz['Toplam_Kontenjan'] * 100).round(2)
-    bolum_analiz['Bos_Kontenjan'] = bolum_analiz['Toplam_Kontenjan'] - bolum_analiz['Toplam_Yerlesen']
-    bolum_analiz['Bos_Yuzde'] = ((bolum_analiz['Bos_Kontenjan'] / bolum_analiz['Toplam_Kontenjan']) * 100).round(2)
-    
-    # Üniversite türü kategorisi (çoğunluk)
-    bolum_analiz['Ana_Uni_Turu'] = bolum_analiz['Uni_Turleri'].apply(
-        lambda x: max(set(x), key=x.count) if x else 'Bilinmiyor'
-    )
-    
-    return bolum_analiz
+    """Aynı program ailesindeki (dil, burs, öğretim türü vb. varyantlar dahil) tüm programları birleştirip analiz oluştur"""
+    bolum_analiz = department_summary(data_df).rename(columns={'Program_Ailesi': 'Program_Adi'})
+    return bolum_analiz.round({'Doluluk_Orani': 2, 'Bos_Yuzde': 2})
 
-# Bölüm bazlı analizi oluştur
-department_df = create_department_analysis(df)
+# Bölüm bazlı analizi oluştur (veri kümesi başına bir kez; filtreler sonuç üzerinde çalışır)
+department_df = get_dataset().derived("bolum_analizi", create_department_analysis).copy(deep=False)
 
 # Filtre seçenekleri - Bölüm bazlı filtreler
 st.sidebar.header("🔍 Bölüm Bazlı Filtreler")
@@ -91,21 +55,35 @@ secili_uni_turu = st.sidebar.selectbox("Ağırlıklı Üniversite Türü", uni_t
 if secili_uni_turu != 'Tümü':
     department_df = department_df[department_df['Ana_Uni_Turu'] == secili_uni_turu]
 
-# Kontenjan aralığı filtresi (toplam kontenjan)
-min_kontenjan = st.sidebar.number_input("Minimum Toplam Kontenjan", min_value=0, value=0, step=100)
-department_df = department_df[department_df['Toplam_Kontenjan'] >= min_kontenjan]
-
-# Üniversite sayısı filtresi
-min_uni_sayisi = st.sidebar.number_input("Minimum Üniversite Sayısı", min_value=1, value=1, step=1)
-st.sidebar.caption("💡 Bu filtre bölümün kaç üniversitede açıldığını belirler. Örnek: Min=5 → En az 5 üniversitede açılan yaygın bölümler")
-department_df = department_df[department_df['Uni_Sayisi'] >= min_uni_sayisi]
+# Sayısal filtreler seçili bölümün parçasında uygulanır: değiştirilmeleri sayfanın tamamını
+# değil yalnızca o bölümü yeniden çalıştırır. Kenar çubuğu seçimleri ortak tabanı belirler.
+bolum_tabani = department_df
 
 st.markdown("---")
 
+def sayisal_filtreler():
+    global department_df, filtre_anahtari
+    with st.expander("🔢 Sayısal Filtreler", expanded=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            # Kontenjan aralığı filtresi (toplam kontenjan)
+            min_kontenjan = st.number_input("Minimum Toplam Kontenjan", min_value=0, value=0, step=100,
+                                            key="bolum_min_kontenjan")
+        with col2:
+            # Üniversite sayısı filtresi
+            min_uni_sayisi = st.number_input("Minimum Üniversite Sayısı", min_value=1, value=1, step=1,
+                                             key="bolum_min_uni_sayisi")
+        st.caption("💡 Üniversite sayısı filtresi bölümün kaç üniversitede açıldığını belirler. Örnek: Min=5 → En az 5 üniversitede açılan yaygın bölümler")
+    department_df = bolum_tabani[
+        (bolum_tabani['Toplam_Kontenjan'] >= min_kontenjan) &
+        (bolum_tabani['Uni_Sayisi'] >= min_uni_sayisi)
+    ]
+    # Grafik önbelleğinin anahtarı: sayfa + filtre durumu
+    filtre_anahtari = ('bolum', secili_uni_turu, min_kontenjan, min_uni_sayisi)
+
 # Ana analizler
-tab1, tab2, tab3, tab4 = st.tabs(["🔴 En Boş Bölümler", "📊 Doluluk Dağılımı", "🏢 Kontenjan Büyüklüğü", "🎯 Tam Doluluk Analizi"])
 
-with tab1:
+def sekme_en_bos():
     st.header("En Boş Kalan Bölümler (Türkiye Geneli)")
     
     # Sıralama kriterleri
@@ -138,46 +116,11 @@ with tab1:
             # Ana grafik
             st.subheader(f"🎯 En Boş {len(sorted_df)} Bölüm - {siralama_kriteri}")
             
-            # Program adlarını kısalt
-            display_df = sorted_df.copy()
-            display_df['Program_Kisa'] = display_df['Program_Adi'].apply(
-                lambda x: x[:50] + "..." if len(str(x)) > 50 else str(x)
-            )
-            
             # Ana bar chart
-            fig = px.bar(
-                display_df,
-                y='Program_Kisa',
-                x=x_col,
-                color=color_col,
-                hover_data={
-                    'Program_Adi': True,
-                    'Toplam_Kontenjan': ':,',
-                    'Toplam_Yerlesen': ':,',
-                    'Program_Sayisi': True,
-                    'Uni_Sayisi': True,
-                    'Sehir_Sayisi': True,
-                    'Doluluk_Orani': ':.1f',
-                    'Bos_Kontenjan': ':,',
-                    'Bos_Yuzde': ':.1f',
-                    'Ana_Uni_Turu': True
-                },
-                title=f"Türkiye Geneli En Boş {len(sorted_df)} Bölüm",
-                orientation='h',
-                labels={x_col: x_title, 'Program_Kisa': 'Bölüm Adı'},
-                color_continuous_scale="Reds"
+            fig = bos_bolumler_bar(
+                sorted_df, x_col=x_col, x_title=x_title, color_col=color_col, color_title=color_title,
+                key=filtre_anahtari + (siralama_kriteri, gosterim_sayisi),
             )
-            
-            fig.update_layout(
-                height=max(500, len(sorted_df) * 30),
-                yaxis=dict(title="Bölüm Adı"),
-                xaxis=dict(title=x_title),
-                coloraxis_colorbar=dict(title=color_title)
-            )
-            # Y ekseni için yüzde formatı (doluluk oranı içeren grafiklerde)
-            if 'Doluluk' in color_title:
-                fig.update_layout(coloraxis_colorbar=dict(title=color_title, ticksuffix="%"))
-            
             st.plotly_chart(fig, use_container_width=True)
             
             # Özet istatistikler
@@ -229,7 +172,7 @@ with tab1:
     else:
         st.warning("Analiz edilecek bölüm verisi bulunamadı.")
 
-with tab2:
+def sekme_doluluk_dagilimi():
     st.header("Bölüm Bazlı Doluluk Dağılımı")
     
     if not department_df.empty:
@@ -238,30 +181,16 @@ with tab2:
         with col1:
             # Doluluk oranı histogramı
             st.subheader("Doluluk Oranı Dağılımı")
-            fig_hist = px.histogram(
-                department_df,
-                x='Doluluk_Orani',
-                nbins=25,
+            # Kutular sunucuda hesaplanır; tarayıcıya yalnızca kutu sınırları ve sayılar gider
+            fig_hist = histogram_bar(
+                histogram_bins(department_df['Doluluk_Orani'], bins=25),
                 title="Bölümlerin Doluluk Oranı Dağılımı",
-                labels={'Doluluk_Orani': '% Doluluk Oranı', 'count': 'Bölüm Sayısı'},
-                color_discrete_sequence=['#FF6B6B'],
-                hover_data={
-                    'Program_Adi': True,
-                    'Toplam_Kontenjan': True,
-                    'Toplam_Yerlesen': True,
-                    'Uni_Sayisi': True
-                }
+                x_title="% Doluluk Oranı",
+                y_title="Bölüm Sayısı",
+                mean=float(department_df['Doluluk_Orani'].mean()),
+                percent_axis=True,
+                key=filtre_anahtari,
             )
-            fig_hist.update_traces(
-                hovertemplate='<b>%Doluluk Aralığı:</b> %{x:.1f}<br>' +
-                             '<b>Bu Aralıktaki Bölüm Sayısı:</b> %{y}<br>' +
-                             '<extra></extra>'
-            )
-            fig_hist.add_vline(x=department_df['Doluluk_Orani'].mean(), 
-                             line_dash="dash", line_color="red", 
-                             annotation_text=f"Ortalama: {department_df['Doluluk_Orani'].mean():.1f}%")
-            # X ekseni için yüzde formatı
-            fig_hist.update_xaxes(title="% Doluluk Oranı", ticksuffix="%")
             st.plotly_chart(fig_hist, use_container_width=True)
             st.caption("📊 Bu grafik bölümlerin doluluk oranlarının dağılımını gösterir. X ekseni doluluk yüzdesi, Y ekseni o yüzdeye sahip bölüm sayısını gösterir. Kırmızı çizgi ortalama doluluk oranını işaret eder.")
             
@@ -305,41 +234,18 @@ with tab2:
             )
             kategori_dagilim = doluluk_kategorileri.value_counts()
             
-            fig_pie = px.pie(
-                values=kategori_dagilim.values,
-                names=kategori_dagilim.index,
+            fig_pie = vurgulu_pasta(
+                kategori_dagilim.rename_axis('Kategori').reset_index(name='Bolum_Sayisi'),
+                names='Kategori',
+                values='Bolum_Sayisi',
                 title="Bölümlerin Doluluk Kategorileri",
-                color_discrete_sequence=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
-            )
-            fig_pie.update_traces(
-                textposition='inside', 
+                legend_title="Doluluk Kategorileri",
+                hover_label="Kategori",
+                value_label="Bölüm Sayısı",
+                colors=('#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD'),
                 textinfo='label',  # Sadece kategori adı göster
-                textfont_size=11,
-                textfont_color="white",
-                textfont_family="Arial Black",
-                marker=dict(
-                    line=dict(color='white', width=3)
-                ),
-                pull=[0.1 if val == kategori_dagilim.max() else 0 for val in kategori_dagilim.values],  # En büyük dilimi çek
-                hovertemplate='<b>Kategori:</b> %{label}<br><b>Bölüm Sayısı:</b> %{value}<br><b>Toplam Yüzdesi:</b> %{percent}<br><extra></extra>'
-            )
-            fig_pie.update_layout(
-                showlegend=True,
-                legend=dict(
-                    orientation="v",
-                    yanchor="middle",
-                    y=0.5,
-                    xanchor="left",
-                    x=1.05,
-                    font=dict(size=10),
-                    title=dict(
-                        text="<b>Doluluk Kategorileri</b>",
-                        font=dict(size=11)
-                    )
-                ),
-                font=dict(size=12),
-                title_font=dict(size=16, color='white'),
-                margin=dict(l=20, r=120, t=50, b=20)
+                title_color='white',
+                key=filtre_anahtari,
             )
             st.plotly_chart(fig_pie, use_container_width=True)
             st.caption("🍰 Bu pasta grafiği bölümlerin doluluk oranlarına göre kategorik dağılımını gösterir. Her dilim bir doluluk aralığını temsil eder ve bu aralıktaki bölüm sayısını gösterir. En büyük kategori öne çıkarılmıştır.")
@@ -347,45 +253,13 @@ with tab2:
         with col2:
             # Kontenjan büyüklüğü vs Doluluk scatter
             st.subheader("Kontenjan vs Doluluk İlişkisi")
-            fig_scatter = px.scatter(
-                department_df,
-                x='Toplam_Kontenjan',
-                y='Doluluk_Orani',
-                size='Uni_Sayisi',
-                color='Ana_Uni_Turu',
-                hover_data={
-                    'Program_Adi': True,
-                    'Toplam_Kontenjan': ':,',
-                    'Toplam_Yerlesen': ':,',
-                    'Program_Sayisi': True,
-                    'Uni_Sayisi': True,
-                    'Sehir_Sayisi': True
-                },
-                title="Bölümlerin Kontenjan-Doluluk İlişkisi",
-                labels={
-                    'Toplam_Kontenjan': 'Toplam Kontenjan', 
-                    'Doluluk_Orani': '% Doluluk Oranı',
-                    'Program_Adi': 'Bölüm Adı',
-                    'Toplam_Yerlesen': 'Toplam Yerleşen',
-                    'Program_Sayisi': 'Program Sayısı',
-                    'Uni_Sayisi': 'Üniversite Sayısı',
-                    'Sehir_Sayisi': 'Şehir Sayısı',
-                    'Ana_Uni_Turu': 'Üniversite Türü'
-                }
-            )
-            # X ekseni ayarları - 100'lü aralıklar, 1000+ gösterim
-            max_kontenjan = department_df['Toplam_Kontenjan'].max()
-            fig_scatter.update_xaxes(
-                dtick=100,  # 100'lü aralıklar
-                range=[0, min(1000, max_kontenjan * 1.1)],  # 1000'e kadar göster
-                tickformat='d',  # Tam sayı formatı
-                tickvals=list(range(0, 1001, 100)) + ([1000] if max_kontenjan > 1000 else []),
-                ticktext=[str(x) for x in range(0, 1000, 100)] + (['1000+'] if max_kontenjan > 1000 else [])
-            )
-            # Y ekseni ayarları - yüzde formatı
-            fig_scatter.update_yaxes(
-                title="% Doluluk Oranı",
-                ticksuffix="%"
+            # Çok noktalı grafiklerde WebGL; nokta sayısı sınırlı tutulur
+            scatter_df = decimate(department_df)
+            fig_scatter = bolum_kontenjan_scatter(
+                scatter_df,
+                max_kontenjan=float(department_df['Toplam_Kontenjan'].max()),
+                render_mode=scatter_render_mode(len(scatter_df)),
+                key=filtre_anahtari,
             )
             st.plotly_chart(fig_scatter, use_container_width=True)
             st.caption("🎯 Bu grafik kontenjan büyüklüğü ile doluluk oranı arasındaki ilişkiyi gösterir. Her nokta bir bölümü temsil eder. Nokta büyüklüğü üniversite sayısını, renk ise üniversite türünü gösterir.")
@@ -394,15 +268,16 @@ with tab2:
             st.subheader("En Çok Boş Kontenjan")
             en_bos_kontenjanlı = department_df.nlargest(10, 'Bos_Kontenjan')
             
-            fig_bar = px.bar(
+            fig_bar = cubuk_grafik(
                 en_bos_kontenjanlı,
                 x='Bos_Kontenjan',
                 y='Program_Adi',
                 orientation='h',
                 title="En Çok Boş Kontenjanı Olan 10 Bölüm",
-                labels={'Bos_Kontenjan': 'Boş Kontenjan Sayısı', 'Program_Adi': 'Bölüm Adı'},
+                labels=(('Bos_Kontenjan', 'Boş Kontenjan Sayısı'),),
                 color='Bos_Kontenjan',
-                color_continuous_scale='Oranges'
+                color_scale='Oranges',
+                key=filtre_anahtari,
             )
             st.plotly_chart(fig_bar, use_container_width=True)
         
@@ -428,7 +303,7 @@ with tab2:
     else:
         st.warning("Analiz edilecek bölüm verisi bulunamadı.")
 
-with tab3:
+def sekme_kontenjan_buyuklugu():
     st.header("Bölüm Bazlı Kontenjan Büyüklüğü Analizi")
     
     if not department_df.empty:
@@ -454,34 +329,29 @@ with tab3:
                 
                 with col1:
                     # Scatter plot
-                    fig_scatter = px.scatter(
+                    fig_scatter = nokta_grafik(
                         bos_buyuk,
                         x='Toplam_Kontenjan',
                         y='Doluluk_Orani',
                         size='Bos_Kontenjan',
                         color='Ana_Uni_Turu',
-                        hover_data={
-                            'Program_Adi': True,
-                            'Toplam_Kontenjan': ':,',
-                            'Toplam_Yerlesen': ':,',
-                            'Uni_Sayisi': True
-                        },
+                        hover=(('Program_Adi', True), ('Toplam_Kontenjan', ':,'), ('Toplam_Yerlesen', ':,'), 'Uni_Sayisi'),
                         title=f"{kategori_secim} Olan En Boş 15 Bölüm",
-                        labels={'Toplam_Kontenjan': 'Toplam Kontenjan', 'Doluluk_Orani': '% Doluluk Oranı'}
+                        key=filtre_anahtari + (kategori_secim,),
                     )
                     st.plotly_chart(fig_scatter, use_container_width=True)
                 
                 with col2:
                     # Bar chart
-                    fig_bar = px.bar(
+                    fig_bar = cubuk_grafik(
                         bos_buyuk.head(10),
                         x='Bos_Kontenjan',
                         y='Program_Adi',
                         orientation='h',
-                        title=f"En Çok Boş Kontenjanı Olan 10 Bölüm",
-                        labels={'Bos_Kontenjan': 'Boş Kontenjan', 'Program_Adi': 'Bölüm Adı'},
+                        title="En Çok Boş Kontenjanı Olan 10 Bölüm",
                         color='Doluluk_Orani',
-                        color_continuous_scale='RdYlBu_r'
+                        color_scale='RdYlBu_r',
+                        key=filtre_anahtari + (kategori_secim,),
                     )
                     st.plotly_chart(fig_bar, use_container_width=True)
                 
@@ -499,7 +369,7 @@ with tab3:
     else:
         st.warning("Analiz edilecek bölüm verisi bulunamadı.")
 
-with tab4:
+def sekme_tam_doluluk():
     st.header("Bölüm Bazlı Tam Doluluk ve Aşım Analizleri")
     
     if not department_df.empty:
@@ -515,30 +385,31 @@ with tab4:
             if not tam_dolu_bolumler.empty:
                 # Üniversite türüne göre dağılım
                 tam_dolu_dagilim = tam_dolu_bolumler['Ana_Uni_Turu'].value_counts()
-                fig_pie = px.pie(
-                    values=tam_dolu_dagilim.values,
-                    names=tam_dolu_dagilim.index,
+                tam_dolu_dagilim = tam_dolu_dagilim[tam_dolu_dagilim > 0]
+                fig_pie = pasta_grafik(
+                    tam_dolu_dagilim.rename_axis('Ana_Uni_Turu').reset_index(name='Bolum_Sayisi'),
+                    names='Ana_Uni_Turu',
+                    values='Bolum_Sayisi',
                     title="Tam Dolu Bölümlerde Üniversite Türü Dağılımı",
-                    color_discrete_sequence=px.colors.qualitative.Set2
+                    colors=tuple(px.colors.qualitative.Set2),
+                    key=filtre_anahtari,
                 )
                 st.plotly_chart(fig_pie, use_container_width=True)
                 
                 # En yüksek doluluk oranına sahip bölümler
                 en_dolu = tam_dolu_bolumler.nlargest(10, 'Doluluk_Orani')
                 
-                fig_bar = px.bar(
+                fig_bar = cubuk_grafik(
                     en_dolu,
                     x='Program_Adi',
                     y='Doluluk_Orani',
                     title="En Yüksek Doluluk Oranına Sahip 10 Bölüm",
-                    labels={'Doluluk_Orani': '% Doluluk Oranı', 'Program_Adi': 'Bölüm Adı'},
                     color='Doluluk_Orani',
-                    color_continuous_scale='Reds'
-                )
-                fig_bar.update_layout(
-                    xaxis_tickangle=-45,
-                    yaxis=dict(title="% Doluluk Oranı", ticksuffix="%"),
-                    coloraxis_colorbar=dict(title="% Doluluk Oranı", ticksuffix="%")
+                    color_scale='Reds',
+                    percent_axis=True,
+                    percent_color=True,
+                    tickangle=-45,
+                    key=filtre_anahtari,
                 )
                 st.plotly_chart(fig_bar, use_container_width=True)
             
@@ -553,28 +424,29 @@ with tab4:
                 asim_var_bolumler_copy = asim_var_bolumler.copy()
                 asim_var_bolumler_copy['Asim_Miktari'] = asim_var_bolumler_copy['Doluluk_Orani'] - 100
                 
-                fig_hist = px.histogram(
-                    asim_var_bolumler_copy,
-                    x='Asim_Miktari',
-                    nbins=20,
+                fig_hist = histogram_bar(
+                    histogram_bins(asim_var_bolumler_copy['Asim_Miktari'], bins=20),
                     title="Aşım Miktarı Dağılımı",
-                    labels={'Asim_Miktari': 'Aşım Miktarı (%)', 'count': 'Bölüm Sayısı'},
-                    color_discrete_sequence=['#FF4444']
+                    x_title="Aşım Miktarı (%)",
+                    y_title="Bölüm Sayısı",
+                    colors=('#FF4444',),
+                    key=filtre_anahtari,
                 )
                 st.plotly_chart(fig_hist, use_container_width=True)
                 
                 # En çok aşım olan bölümler
                 en_asimli = asim_var_bolumler_copy.nlargest(10, 'Asim_Miktari')
                 
-                fig_bar_h = px.bar(
+                fig_bar_h = cubuk_grafik(
                     en_asimli,
                     x='Asim_Miktari',
                     y='Program_Adi',
                     orientation='h',
                     title="En Fazla Aşımı Olan 10 Bölüm",
-                    labels={'Asim_Miktari': 'Aşım Miktarı (%)', 'Program_Adi': 'Bölüm Adı'},
+                    labels=(('Asim_Miktari', 'Aşım Miktarı (%)'),),
                     color='Asim_Miktari',
-                    color_continuous_scale='OrRd'
+                    color_scale='OrRd',
+                    key=filtre_anahtari,
                 )
                 st.plotly_chart(fig_bar_h, use_container_width=True)
             
@@ -625,6 +497,14 @@ with tab4:
     
     else:
         st.warning("Analiz edilecek bölüm verisi bulunamadı.")
+
+# Yalnızca seçili sekmenin içeriği hesaplanır ve çizilir
+lazy_tabs({
+    "🔴 En Boş Bölümler": sekme_en_bos,
+    "📊 Doluluk Dağılımı": sekme_doluluk_dagilimi,
+    "🏢 Kontenjan Büyüklüğü": sekme_kontenjan_buyuklugu,
+    "🎯 Tam Doluluk Analizi": sekme_tam_doluluk,
+}, key="bolum_sekmesi", filters=sayisal_filtreler)
 st.markdown("---")
 st.caption("💡 Bu analizler bölüm bazlı toplu veriler üzerinden hesaplanmıştır. Filtreleri kullanarak daha spesifik analizler yapabilirsiniz.")
 
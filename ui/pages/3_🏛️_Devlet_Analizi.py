@@ -1,8 +1,5 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import numpy as np
 import sys
 from pathlib import Path
 
@@ -10,19 +7,25 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.data_loader import load_processed  # noqa: E402
+from src.dataset import get_dataset, get_frame  # noqa: E402
+from src.aggregates import rollup  # noqa: E402
+from src.filters import category_mask, matching_categories  # noqa: E402
+from src.chart_data import histogram_bins  # noqa: E402
+from ui.components import lazy_tabs  # noqa: E402
+from ui.figures import (  # noqa: E402
+    bolge_bos_kontenjan_bar, bolge_doluluk_bar, bolge_kontenjan_scatter, bolge_program_pasta,
+    cubuk_grafik, histogram_bar, nokta_grafik, pasta_grafik, sehir_bos_kontenjan_bar, sehir_doluluk_bar,
+    vurgulu_pasta,
+)
 
 st.title("🏛️ Devlet Üniversiteleri Analizi")
 
-@st.cache_data
-def get_data():
-    return load_processed()
-
-df = get_data()
+df = get_frame()
 
 # Sadece devlet üniversiteleri
 if 'Üniversite Türü' in df.columns:
-    devlet_df = df[df['Üniversite Türü'].str.contains('Devlet', case=False, na=False)]
+    devlet_turleri = matching_categories(df['Üniversite Türü'], 'Devlet')
+    devlet_df = df[category_mask(df['Üniversite Türü'], devlet_turleri)]
 else:
     st.error("Üniversite Türü sütunu bulunamadı!")
     st.stop()
@@ -31,21 +34,6 @@ if devlet_df.empty:
     st.error("Devlet üniversitesi verisi bulunamadı!")
     st.stop()
 
-# Doluluk oranı hesapla
-def calculate_occupancy(row):
-    try:
-        kontenjan = pd.to_numeric(row['Kontenjan'], errors='coerce')
-        yerlesen = pd.to_numeric(row['Yerleşen'], errors='coerce')
-        if pd.isna(kontenjan) or pd.isna(yerlesen) or kontenjan <= 0:
-            return np.nan
-        return (yerlesen / kontenjan) * 100
-    except:
-        return np.nan
-
-devlet_df = devlet_df.copy()
-devlet_df['Doluluk_Orani'] = devlet_df.apply(calculate_occupancy, axis=1)
-devlet_df['Bos_Kontenjan'] = pd.to_numeric(devlet_df['Kontenjan'], errors='coerce') - pd.to_numeric(devlet_df['Yerleşen'], errors='coerce')
-
 # Filtre seçenekleri
 st.sidebar.header("🔍 Devlet Üniversiteleri Filtreleri")
 
@@ -54,49 +42,75 @@ if 'Bölge' in devlet_df.columns:
     bolge_listesi = ['Tümü'] + sorted(devlet_df['Bölge'].dropna().unique().tolist())
     secili_bolge = st.sidebar.selectbox("Bölge Seç", bolge_listesi)
     if secili_bolge != 'Tümü':
-        devlet_df = devlet_df[devlet_df['Bölge'] == secili_bolge]
+        devlet_df = devlet_df[category_mask(devlet_df['Bölge'], [secili_bolge])]
 
 # Şehir filtresi
 if 'İl' in devlet_df.columns:
     sehir_listesi = ['Tümü'] + sorted(devlet_df['İl'].dropna().unique().tolist())
     secili_sehir = st.sidebar.selectbox("Şehir Seç", sehir_listesi)
     if secili_sehir != 'Tümü':
-        devlet_df = devlet_df[devlet_df['İl'] == secili_sehir]
-
-# Kontenjan aralığı filtresi
-min_kontenjan = st.sidebar.number_input("Minimum Kontenjan", min_value=0, value=0, step=50)
-devlet_df = devlet_df[pd.to_numeric(devlet_df['Kontenjan'], errors='coerce') >= min_kontenjan]
-
-# Doluluk oranı filtresi
-doluluk_araligi = st.sidebar.slider("Doluluk Oranı Aralığı (%)", 0, 100, (0, 100), step=5)
-devlet_df = devlet_df[
-    (devlet_df['Doluluk_Orani'] >= doluluk_araligi[0]) & 
-    (devlet_df['Doluluk_Orani'] <= doluluk_araligi[1])
-]
+        devlet_df = devlet_df[category_mask(devlet_df['İl'], [secili_sehir])]
 
 st.sidebar.caption("💡 Filtreler tüm sekmelerdeki analizleri etkiler. Bölge ve şehir filtrelerini kullanarak detaylı incelemeler yapabilirsiniz.")
 
+kup = get_dataset().cube
+# Küpün yanıtlayamadığı üniversite/şehir/bölge/fakülte özetleri yıldız şemanın tamsayı anahtarlarından hesaplanır
+yildiz = get_dataset().star
+# Sayısal filtreler seçili bölümün parçasında uygulanır: değiştirilmeleri sayfanın tamamını
+# değil yalnızca o bölümü yeniden çalıştırır. Kenar çubuğu seçimleri ortak tabanı belirler.
+devlet_tabani = devlet_df
+
 st.markdown("---")
 
-# Genel özet
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.metric("Toplam Devlet Programı", f"{len(devlet_df):,}")
-with col2:
-    total_kontenjan = pd.to_numeric(devlet_df['Kontenjan'], errors='coerce').sum()
-    st.metric("Toplam Kontenjan", f"{total_kontenjan:,.0f}")
-with col3:
-    total_yerlesen = pd.to_numeric(devlet_df['Yerleşen'], errors='coerce').sum()
-    st.metric("Toplam Yerleşen", f"{total_yerlesen:,.0f}")
-with col4:
-    genel_doluluk = (total_yerlesen / total_kontenjan * 100) if total_kontenjan > 0 else 0
-    st.metric("Genel Doluluk", f"{genel_doluluk:.1f}%")
+def sayisal_filtreler():
+    global devlet_df, filtre_anahtari, kup_filtresi
+    with st.expander("🔢 Sayısal Filtreler", expanded=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            # Kontenjan aralığı filtresi
+            min_kontenjan = st.number_input("Minimum Kontenjan", min_value=0, value=0, step=50,
+                                            key="devlet_min_kontenjan")
+        with col2:
+            # Doluluk oranı filtresi
+            doluluk_araligi = st.slider("Doluluk Oranı Aralığı (%)", 0, 100, (0, 100), step=5,
+                                        key="devlet_doluluk_araligi")
+    devlet_df = devlet_tabani[
+        (devlet_tabani['Kontenjan'] >= min_kontenjan) &
+        (devlet_tabani['Doluluk_Orani'] >= doluluk_araligi[0]) &
+        (devlet_tabani['Doluluk_Orani'] <= doluluk_araligi[1])
+    ]
 
-st.markdown("---")
+    # Özetlerin önbellek anahtarı: sayfa + filtre durumu
+    filtre_anahtari = ('devlet', secili_bolge, secili_sehir, min_kontenjan, doluluk_araligi)
 
-tab1, tab2, tab3, tab4 = st.tabs(["📍 Şehir/Bölge Analizi", "🏫 Üniversite Analizi", "📚 Fakülte Analizi", "🔍 Detaylı İncelemeler"])
+    # Sayısal filtreler varsayılanda iken (yalnızca doluluğu tanımlı programlar) filtre durumu
+    # küp boyut seçimleriyle ifade edilir; özetler önceden toplanmış küp hücrelerinden gelir
+    kup_filtresi = None
+    if min_kontenjan == 0 and doluluk_araligi == (0, 100):
+        kup_filtresi = {'Üniversite Türü': devlet_turleri}
+        if secili_bolge != 'Tümü':
+            kup_filtresi['Bölge'] = [secili_bolge]
+        if secili_sehir != 'Tümü':
+            kup_filtresi['İl'] = [secili_sehir]
 
-with tab1:
+    # Genel özet
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Toplam Devlet Programı", f"{len(devlet_df):,}")
+    with col2:
+        total_kontenjan = devlet_df['Kontenjan'].sum()
+        st.metric("Toplam Kontenjan", f"{total_kontenjan:,.0f}")
+    with col3:
+        total_yerlesen = devlet_df['Yerleşen'].sum()
+        st.metric("Toplam Yerleşen", f"{total_yerlesen:,.0f}")
+    with col4:
+        genel_doluluk = (total_yerlesen / total_kontenjan * 100) if total_kontenjan > 0 else 0
+        st.metric("Genel Doluluk", f"{genel_doluluk:.1f}%")
+
+    st.markdown("---")
+
+
+def sekme_sehir_bolge():
     st.header("Devlet Üniversitelerinde Şehir/Bölge Bazlı Durum")
     
     if devlet_df.empty:
@@ -106,18 +120,10 @@ with tab1:
         if 'Bölge' in devlet_df.columns and secili_bolge == 'Tümü':
             st.subheader("🌍 Bölgelere Göre Kapsamlı Analiz")
             
-            bolge_analiz = devlet_df.groupby('Bölge').agg({
-                'Kontenjan': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                'Yerleşen': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                'Program Adı': 'count',
-                'Üniversite Adı': 'nunique',
-                'İl': 'nunique'
-            }).reset_index()
-            
-            bolge_analiz.columns = ['Bölge', 'Toplam_Kontenjan', 'Toplam_Yerlesen', 'Program_Sayisi', 'Uni_Sayisi', 'Sehir_Sayisi']
-            bolge_analiz['Doluluk_Orani'] = (bolge_analiz['Toplam_Yerlesen'] / bolge_analiz['Toplam_Kontenjan'] * 100)
-            bolge_analiz['Bos_Kontenjan'] = bolge_analiz['Toplam_Kontenjan'] - bolge_analiz['Toplam_Yerlesen']
-            bolge_analiz['Bos_Yuzde'] = (bolge_analiz['Bos_Kontenjan'] / bolge_analiz['Toplam_Kontenjan'] * 100)
+            bolge_analiz = rollup(devlet_df, 'Bölge', [
+                'Toplam_Kontenjan', 'Toplam_Yerlesen', 'Program_Sayisi', 'Uni_Sayisi', 'Sehir_Sayisi',
+                'Doluluk_Orani', 'Bos_Kontenjan', 'Bos_Yuzde'
+            ], key=filtre_anahtari, cube=kup, where=kup_filtresi, star=yildiz)
             
             bolge_analiz = bolge_analiz.dropna(subset=['Bölge'])
             
@@ -125,100 +131,31 @@ with tab1:
             
             with col1:
                 # Bölge doluluk çubuk grafiği
-                fig_bolge = px.bar(
-                    bolge_analiz.sort_values('Doluluk_Orani'),
-                    x='Bölge',
-                    y='Doluluk_Orani',
-                    color='Bos_Kontenjan',
-                    title="Bölgelere Göre Devlet Üniversiteleri Doluluk Oranı",
-                    labels={'Doluluk_Orani': '% Doluluk Oranı', 'Bos_Kontenjan': 'Boş Kontenjan'},
-                    color_continuous_scale='Reds'
+                fig_bolge = bolge_doluluk_bar(
+                    bolge_analiz, title="Bölgelere Göre Devlet Üniversiteleri Doluluk Oranı", key=filtre_anahtari
                 )
-                fig_bolge.update_xaxes(tickangle=45)
-                fig_bolge.update_yaxes(title="% Doluluk Oranı", ticksuffix="%")
                 st.plotly_chart(fig_bolge, use_container_width=True)
                 st.caption("📊 Bu grafik bölgelerin devlet üniversitelerindeki doluluk oranlarını gösterir. X ekseni bölgeleri, Y ekseni doluluk yüzdesini gösterir. Renk yoğunluğu boş kontenjan miktarını temsil eder - koyu renkler daha fazla boş kontenjan anlamına gelir.")
                 
                 # Bölge pasta grafiği
-                fig_pie_bolge = px.pie(
-                    bolge_analiz,
-                    values='Program_Sayisi',
-                    names='Bölge',
-                    title="Bölgelere Göre Program Dağılımı",
-                    color_discrete_sequence=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8']
-                )
-                fig_pie_bolge.update_traces(
-                    textposition='inside', 
-                    textinfo='label+percent',  
-                    textfont_size=12,
-                    textfont_color="white",
-                    textfont_family="Arial Black",
-                    marker=dict(
-                        line=dict(color='white', width=3)
-                    ),
-                    pull=[0.1 if val == bolge_analiz['Program_Sayisi'].max() else 0 for val in bolge_analiz['Program_Sayisi']],
-                    hovertemplate='<b>Bölge:</b> %{label}<br><b>Program Sayısı:</b> %{value}<br><b>Toplam Yüzdesi:</b> %{percent}<br><extra></extra>'
-                )
-                fig_pie_bolge.update_layout(
-                    showlegend=True,
-                    legend=dict(
-                        orientation="v",
-                        yanchor="middle",
-                        y=0.5,
-                        xanchor="left",
-                        x=1.05,
-                        font=dict(size=11),
-                        title=dict(
-                            text="<b>Bölgeler</b>",
-                            font=dict(size=12)
-                        )
-                    ),
-                    font=dict(size=12),
-                    title_font=dict(size=16, color='darkblue'),
-                    margin=dict(l=20, r=120, t=50, b=20)
+                fig_pie_bolge = bolge_program_pasta(
+                    bolge_analiz, title="Bölgelere Göre Program Dağılımı", key=filtre_anahtari
                 )
                 st.plotly_chart(fig_pie_bolge, use_container_width=True)
                 st.caption("🥧 Bu pasta grafiği devlet üniversitesi programlarının bölgelere göre dağılımını gösterir. Her dilim bir bölgeyi temsil eder ve o bölgedeki toplam program sayısının oranını gösterir.")
             
             with col2:
                 # Scatter plot - Kontenjan vs Doluluk
-                fig_scatter_bolge = px.scatter(
-                    bolge_analiz,
-                    x='Toplam_Kontenjan',
-                    y='Doluluk_Orani',
-                    size='Program_Sayisi',
-                    color='Bölge',
-                    title="Bölge Bazlı Kontenjan-Doluluk İlişkisi",
-                    labels={
-                        'Toplam_Kontenjan': 'Toplam Kontenjan', 
-                        'Doluluk_Orani': '% Doluluk Oranı',
-                        'Program_Sayisi': 'Program Sayısı',
-                        'Bölge': 'Bölge'
-                    },
-                    hover_data={
-                        'Uni_Sayisi': True, 
-                        'Sehir_Sayisi': True
-                    }
+                fig_scatter_bolge = bolge_kontenjan_scatter(
+                    bolge_analiz, title="Bölge Bazlı Kontenjan-Doluluk İlişkisi", key=filtre_anahtari
                 )
-                fig_scatter_bolge.update_yaxes(title="% Doluluk Oranı", ticksuffix="%")
                 st.plotly_chart(fig_scatter_bolge, use_container_width=True)
                 st.caption("🎯 Bu scatter plot bölgelerin toplam kontenjanı ile doluluk oranı arasındaki ilişkiyi gösterir. Her nokta bir bölgeyi temsil eder. Nokta büyüklüğü program sayısını, renk ise bölgeyi gösterir. Sağ üstteki noktalar hem büyük hem de dolu bölgelerdir.")
                 
                 # Bar chart - Boş kontenjan
-                fig_bar_bos = px.bar(
-                    bolge_analiz.sort_values('Bos_Kontenjan', ascending=False),
-                    x='Bölge',
-                    y='Bos_Kontenjan',
-                    title="Bölgelere Göre Toplam Boş Kontenjan",
-                    labels={
-                        'Bölge': 'Bölge',
-                        'Bos_Kontenjan': 'Boş Kontenjan',
-                        'Doluluk_Orani': '% Doluluk Oranı'
-                    },
-                    color='Doluluk_Orani',
-                    color_continuous_scale='RdYlGn'
+                fig_bar_bos = bolge_bos_kontenjan_bar(
+                    bolge_analiz, title="Bölgelere Göre Toplam Boş Kontenjan", key=filtre_anahtari
                 )
-                fig_bar_bos.update_xaxes(tickangle=45)
                 st.plotly_chart(fig_bar_bos, use_container_width=True)
                 st.caption("📈 Bu grafik bölgelerdeki toplam boş kontenjan sayısını gösterir. Yüksek çubuklar o bölgede daha fazla boş kontenjan olduğunu, renk ise doluluk oranını gösterir (yeşil yüksek, kırmızı düşük doluluk).")
             
@@ -247,18 +184,10 @@ with tab1:
         if 'İl' in devlet_df.columns:
             st.subheader(f"🏙️ En Boş Kalan Devlet Üniversitesi Şehirleri {f'({secili_bolge} Bölgesi)' if secili_bolge != 'Tümü' else ''}")
             
-            sehir_analiz = devlet_df.groupby('İl').agg({
-                'Kontenjan': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                'Yerleşen': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                'Program Adı': 'count',
-                'Üniversite Adı': 'nunique',
-                'Bölge': 'first'
-            }).reset_index()
-            
-            sehir_analiz.columns = ['Sehir', 'Toplam_Kontenjan', 'Toplam_Yerlesen', 'Program_Sayisi', 'Uni_Sayisi', 'Bolge']
-            sehir_analiz['Doluluk_Orani'] = (sehir_analiz['Toplam_Yerlesen'] / sehir_analiz['Toplam_Kontenjan'] * 100)
-            sehir_analiz['Bos_Kontenjan'] = sehir_analiz['Toplam_Kontenjan'] - sehir_analiz['Toplam_Yerlesen']
-            sehir_analiz['Bos_Yuzde'] = (sehir_analiz['Bos_Kontenjan'] / sehir_analiz['Toplam_Kontenjan'] * 100)
+            sehir_analiz = rollup(devlet_df, 'İl', [
+                'Toplam_Kontenjan', 'Toplam_Yerlesen', 'Program_Sayisi', 'Uni_Sayisi', 'Bolge',
+                'Doluluk_Orani', 'Bos_Kontenjan', 'Bos_Yuzde'
+            ], key=filtre_anahtari, cube=kup, where=kup_filtresi, star=yildiz).rename(columns={'İl': 'Sehir'})
             
             if not sehir_analiz.empty:
                 col1, col2 = st.columns(2)
@@ -267,24 +196,11 @@ with tab1:
                     # En boş şehirler
                     en_bos_sehirler = sehir_analiz.dropna(subset=['Sehir']).nsmallest(15, 'Doluluk_Orani')
                     
-                    fig_sehir = px.bar(
+                    fig_sehir = sehir_doluluk_bar(
                         en_bos_sehirler,
-                        y='Sehir',
-                        x='Doluluk_Orani',
-                        color='Bolge',
                         title=f"En Boş 15 Şehir {f'({secili_bolge} Bölgesi)' if secili_bolge != 'Tümü' else ''}",
-                        orientation='h',
-                        labels={
-                            'Doluluk_Orani': '% Doluluk Oranı',
-                            'Sehir': 'Şehir',
-                            'Bolge': 'Bölge',
-                            'Program_Sayisi': 'Program Sayısı',
-                            'Uni_Sayisi': 'Üniversite Sayısı',
-                            'Bos_Kontenjan': 'Boş Kontenjan'
-                        },
-                        hover_data=['Program_Sayisi', 'Uni_Sayisi', 'Bos_Kontenjan']
+                        key=filtre_anahtari,
                     )
-                    fig_sehir.update_xaxes(title="% Doluluk Oranı", ticksuffix="%")
                     st.plotly_chart(fig_sehir, use_container_width=True)
                     st.caption("🏙️ Bu yatay çubuk grafik en boş devlet üniversitesi şehirlerini gösterir. Uzun çubuklar daha yüksek doluluk oranını, renkler ise şehrin bulunduğu bölgeyi temsil eder.")
                 
@@ -292,19 +208,8 @@ with tab1:
                     # En çok boş kontenjan
                     en_bos_kontenjan_sehir = sehir_analiz.nlargest(15, 'Bos_Kontenjan')
                     
-                    fig_bos_kont = px.bar(
-                        en_bos_kontenjan_sehir,
-                        y='Sehir',
-                        x='Bos_Kontenjan',
-                        color='Doluluk_Orani',
-                        title="En Çok Boş Kontenjanı Olan 15 Şehir",
-                        orientation='h',
-                        labels={
-                            'Bos_Kontenjan': 'Boş Kontenjan',
-                            'Sehir': 'Şehir',
-                            'Doluluk_Orani': '% Doluluk Oranı'
-                        },
-                        color_continuous_scale='Reds'
+                    fig_bos_kont = sehir_bos_kontenjan_bar(
+                        en_bos_kontenjan_sehir, title="En Çok Boş Kontenjanı Olan 15 Şehir", key=filtre_anahtari
                     )
                     st.plotly_chart(fig_bos_kont, use_container_width=True)
                     st.caption("📊 Bu grafik en çok boş kontenjanı olan şehirleri gösterir. Çubuk uzunluğu boş kontenjan miktarını, renk yoğunluğu ise doluluk oranını temsil eder (koyu kırmızı = düşük doluluk).")
@@ -316,20 +221,14 @@ with tab1:
                         sehir_analiz['Sehir'].sort_values().tolist()
                     )
                     
-                    secilen_sehir_detay = devlet_df[devlet_df['İl'] == secilen_sehir_analiz]
+                    secilen_sehir_detay = devlet_df[category_mask(devlet_df['İl'], [secilen_sehir_analiz])]
                     
                     if not secilen_sehir_detay.empty:
                         st.write(f"**{secilen_sehir_analiz} Şehri Devlet Üniversiteleri Detayı:**")
                         
                         # Üniversite bazlı analiz
-                        uni_detay = secilen_sehir_detay.groupby('Üniversite Adı').agg({
-                            'Kontenjan': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                            'Yerleşen': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                            'Program Adı': 'count'
-                        }).reset_index()
-                        
-                        uni_detay['Doluluk_Orani'] = (uni_detay['Yerleşen'] / uni_detay['Kontenjan'] * 100)
-                        uni_detay['Bos_Kontenjan'] = uni_detay['Kontenjan'] - uni_detay['Yerleşen']
+                        uni_detay = rollup(secilen_sehir_detay, 'Üniversite Adı',
+                                           key=filtre_anahtari + (secilen_sehir_analiz,), star=yildiz)
                         
                         # Metrics
                         col_met1, col_met2, col_met3, col_met4 = st.columns(4)
@@ -346,26 +245,22 @@ with tab1:
                         
                         # Şehir içi üniversite karşılaştırması
                         if len(uni_detay) > 1:
-                            fig_sehir_uni = px.bar(
+                            fig_sehir_uni = cubuk_grafik(
                                 uni_detay.sort_values('Doluluk_Orani'),
                                 x='Üniversite Adı',
                                 y='Doluluk_Orani',
                                 color='Bos_Kontenjan',
                                 title=f"{secilen_sehir_analiz} Şehri Devlet Üniversiteleri Karşılaştırması",
-                                labels={
-                                    'Üniversite Adı': 'Üniversite Adı',
-                                    'Doluluk_Orani': '% Doluluk Oranı',
-                                    'Bos_Kontenjan': 'Boş Kontenjan'
-                                }
+                                percent_axis=True,
+                                tickangle=45,
+                                key=filtre_anahtari + (secilen_sehir_analiz,),
                             )
-                            fig_sehir_uni.update_xaxes(tickangle=45)
-                            fig_sehir_uni.update_yaxes(title="% Doluluk Oranı", ticksuffix="%")
                             st.plotly_chart(fig_sehir_uni, use_container_width=True)
                             st.caption(f"🏫 Bu grafik {secilen_sehir_analiz} şehrindeki devlet üniversitelerinin doluluk oranlarını karşılaştırır. Her çubuk bir üniversiteyi, renk yoğunluğu ise boş kontenjan miktarını gösterir.")
                         
                         st.dataframe(uni_detay.sort_values('Doluluk_Orani'), use_container_width=True)
 
-with tab2:
+def sekme_universite():
     st.header(f"Üniversite Bazında Analiz {f'({secili_bolge} Bölgesi)' if secili_bolge != 'Tümü' else ''}")
     
     if devlet_df.empty:
@@ -373,18 +268,10 @@ with tab2:
     else:
         # Üniversite performansı
         if 'Üniversite Adı' in devlet_df.columns:
-            uni_analiz = devlet_df.groupby('Üniversite Adı').agg({
-                'Kontenjan': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                'Yerleşen': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                'Program Adı': 'count',
-                'İl': 'first',
-                'Bölge': 'first'
-            }).reset_index()
-            
-            uni_analiz.columns = ['Uni_Adi', 'Toplam_Kontenjan', 'Toplam_Yerlesen', 'Program_Sayisi', 'Sehir', 'Bolge']
-            uni_analiz['Doluluk_Orani'] = (uni_analiz['Toplam_Yerlesen'] / uni_analiz['Toplam_Kontenjan'] * 100)
-            uni_analiz['Bos_Kontenjan'] = uni_analiz['Toplam_Kontenjan'] - uni_analiz['Toplam_Yerlesen']
-            uni_analiz['Bos_Yuzde'] = (uni_analiz['Bos_Kontenjan'] / uni_analiz['Toplam_Kontenjan'] * 100)
+            uni_analiz = rollup(devlet_df, 'Üniversite Adı', [
+                'Toplam_Kontenjan', 'Toplam_Yerlesen', 'Program_Sayisi', 'Sehir', 'Bolge',
+                'Doluluk_Orani', 'Bos_Kontenjan', 'Bos_Yuzde'
+            ], key=filtre_anahtari, cube=kup, where=kup_filtresi, star=yildiz).rename(columns={'Üniversite Adı': 'Uni_Adi'})
             
             col1, col2 = st.columns(2)
             
@@ -393,25 +280,17 @@ with tab2:
                 st.subheader("En Boş Kalan Devlet Üniversiteleri")
                 en_bos_uniler = uni_analiz.nsmallest(20, 'Doluluk_Orani')
                 
-                fig_scatter_uni = px.scatter(
+                fig_scatter_uni = nokta_grafik(
                     en_bos_uniler,
                     x='Toplam_Kontenjan',
                     y='Doluluk_Orani',
                     size='Bos_Kontenjan',
                     color='Bolge',
-                    hover_data=['Uni_Adi', 'Sehir', 'Program_Sayisi'],
+                    hover=('Uni_Adi', 'Sehir', 'Program_Sayisi'),
                     title="En Boş 20 Devlet Üniversitesi (Kontenjan vs Doluluk)",
-                    labels={
-                        'Doluluk_Orani': '% Doluluk Oranı', 
-                        'Toplam_Kontenjan': 'Toplam Kontenjan',
-                        'Bos_Kontenjan': 'Boş Kontenjan',
-                        'Bolge': 'Bölge',
-                        'Uni_Adi': 'Üniversite Adı',
-                        'Sehir': 'Şehir',
-                        'Program_Sayisi': 'Program Sayısı'
-                    }
+                    percent_axis=True,
+                    key=filtre_anahtari,
                 )
-                fig_scatter_uni.update_yaxes(title="% Doluluk Oranı", ticksuffix="%")
                 st.plotly_chart(fig_scatter_uni, use_container_width=True)
                 st.caption("🎯 Bu scatter plot en boş 20 devlet üniversitesinin kontenjan-doluluk ilişkisini gösterir. X ekseni toplam kontenjan, Y ekseni doluluk oranı, nokta büyüklüğü boş kontenjan, renk ise bölgeyi temsil eder.")
                 
@@ -419,19 +298,15 @@ with tab2:
                 st.subheader("En Çok Boş Kontenjanı Olan Üniversiteler")
                 en_bos_kontenjan_uni = uni_analiz.nlargest(15, 'Bos_Kontenjan')
                 
-                fig_bar_bos_uni = px.bar(
+                fig_bar_bos_uni = cubuk_grafik(
                     en_bos_kontenjan_uni.head(10),
                     y='Uni_Adi',
                     x='Bos_Kontenjan',
                     color='Doluluk_Orani',
                     title="En Çok Boş Kontenjanı Olan 10 Devlet Üniversitesi",
                     orientation='h',
-                    labels={
-                        'Uni_Adi': 'Üniversite Adı',
-                        'Bos_Kontenjan': 'Boş Kontenjan',
-                        'Doluluk_Orani': '% Doluluk Oranı'
-                    },
-                    color_continuous_scale='RdYlBu'
+                    color_scale='RdYlBu',
+                    key=filtre_anahtari,
                 )
                 st.plotly_chart(fig_bar_bos_uni, use_container_width=True)
                 st.caption("📊 Bu yatay çubuk grafik en fazla boş kontenjanı olan devlet üniversitelerini gösterir. Çubuk uzunluğu boş kontenjan sayısını, renk ise doluluk oranını temsil eder.")
@@ -441,43 +316,32 @@ with tab2:
                 st.subheader("En Dolu Devlet Üniversiteleri")
                 en_dolu_uniler = uni_analiz.nlargest(15, 'Doluluk_Orani')
                 
-                fig_bar_dolu = px.bar(
+                fig_bar_dolu = cubuk_grafik(
                     en_dolu_uniler,
                     y='Uni_Adi',
                     x='Doluluk_Orani',
                     color='Bolge',
                     title="En Dolu 15 Devlet Üniversitesi",
                     orientation='h',
-                    labels={
-                        'Doluluk_Orani': '% Doluluk Oranı',
-                        'Uni_Adi': 'Üniversite Adı',
-                        'Bolge': 'Bölge'
-                    }
+                    percent_axis=True,
+                    key=filtre_anahtari,
                 )
-                fig_bar_dolu.update_xaxes(title="% Doluluk Oranı", ticksuffix="%")
                 st.plotly_chart(fig_bar_dolu, use_container_width=True)
                 st.caption("🏆 Bu grafik en dolu 15 devlet üniversitesini gösterir. Çubuk uzunluğu doluluk oranını, renkler ise üniversitenin bulunduğu bölgeyi temsil eder.")
                 
                 # Üniversite büyüklüğü analizi
                 st.subheader("Üniversite Büyüklüğü vs Doluluk")
-                fig_size_perf = px.scatter(
+                fig_size_perf = nokta_grafik(
                     uni_analiz,
                     x='Program_Sayisi',
                     y='Doluluk_Orani',
                     size='Toplam_Kontenjan',
                     color='Bolge',
-                    hover_data=['Uni_Adi', 'Sehir'],
+                    hover=('Uni_Adi', 'Sehir'),
                     title="Program Sayısı vs Doluluk Oranı İlişkisi",
-                    labels={
-                        'Program_Sayisi': 'Program Sayısı', 
-                        'Doluluk_Orani': '% Doluluk Oranı',
-                        'Toplam_Kontenjan': 'Toplam Kontenjan',
-                        'Bolge': 'Bölge',
-                        'Uni_Adi': 'Üniversite Adı',
-                        'Sehir': 'Şehir'
-                    }
+                    percent_axis=True,
+                    key=filtre_anahtari,
                 )
-                fig_size_perf.update_yaxes(title="% Doluluk Oranı", ticksuffix="%")
                 st.plotly_chart(fig_size_perf, use_container_width=True)
                 st.caption("🔍 Bu scatter plot üniversitelerin program sayısı ile doluluk oranı arasındaki ilişkiyi analiz eder. Nokta büyüklüğü toplam kontenjanı, renk bölgeyi gösterir. Sağ üstteki noktalar hem çok programlı hem de dolu üniversitelerdir.")
             
@@ -521,32 +385,25 @@ with tab2:
                     use_container_width=True
                 )
 
-with tab3:
+def sekme_fakulte():
     st.header("Fakülte/Yüksekokul Bazında Analiz")
     
     if 'Fakülte/Yüksekokul Adı' in devlet_df.columns:
         # Fakülte analizi
-        fakulte_analiz = devlet_df.groupby('Fakülte/Yüksekokul Adı').agg({
-            'Kontenjan': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-            'Yerleşen': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-            'Program Adı': 'count'
-        }).reset_index()
-        
-        fakulte_analiz['Doluluk_Orani'] = (fakulte_analiz['Yerleşen'] / fakulte_analiz['Kontenjan'] * 100)
-        fakulte_analiz['Bos_Kontenjan'] = fakulte_analiz['Kontenjan'] - fakulte_analiz['Yerleşen']
+        fakulte_analiz = rollup(devlet_df, 'Fakülte/Yüksekokul Adı', key=filtre_anahtari, cube=kup, where=kup_filtresi, star=yildiz)
         
         # En boş fakülteler
         st.subheader("En Boş Kalan Fakülte/Yüksekokullar (Devlet)")
         en_bos_fakulteler = fakulte_analiz.dropna(subset=['Fakülte/Yüksekokul Adı']).nsmallest(20, 'Doluluk_Orani')
         
-        fig = px.bar(
+        fig = cubuk_grafik(
             en_bos_fakulteler.head(10),
             y='Fakülte/Yüksekokul Adı',
             x='Doluluk_Orani',
-            color='Program Adı',
+            color='Program_Sayisi',
             title="En Boş 10 Fakülte/Yüksekokul (Devlet Üniversiteleri)",
             orientation='h',
-            labels={'Program Adı': 'Program Sayısı'}
+            key=filtre_anahtari,
         )
         st.plotly_chart(fig, use_container_width=True)
         
@@ -554,12 +411,13 @@ with tab3:
         st.subheader("En Dolu Fakülte/Yüksekokullar (Devlet)")
         en_dolu_fakulteler = fakulte_analiz.dropna(subset=['Fakülte/Yüksekokul Adı']).nlargest(15, 'Doluluk_Orani')
         
-        fig = px.bar(
+        fig = cubuk_grafik(
             en_dolu_fakulteler,
             y='Fakülte/Yüksekokul Adı',
             x='Doluluk_Orani',
             title="En Dolu 15 Fakülte/Yüksekokul (Devlet Üniversiteleri)",
-            orientation='h'
+            orientation='h',
+            key=filtre_anahtari,
         )
         st.plotly_chart(fig, use_container_width=True)
         
@@ -572,10 +430,12 @@ with tab3:
             fakulte_sayilari = fakulte_turleri.fillna('Diğer').value_counts()
             
             if not fakulte_sayilari.empty:
-                fig_pie = px.pie(
-                    values=fakulte_sayilari.values,
-                    names=fakulte_sayilari.index,
-                    title="Devlet Üniversitelerinde Birim Türü Dağılımı"
+                fig_pie = pasta_grafik(
+                    fakulte_sayilari.rename_axis('Birim_Turu').reset_index(name='Birim_Sayisi'),
+                    names='Birim_Turu',
+                    values='Birim_Sayisi',
+                    title="Devlet Üniversitelerinde Birim Türü Dağılımı",
+                    key=filtre_anahtari,
                 )
                 st.plotly_chart(fig_pie, use_container_width=True)
             else:
@@ -583,7 +443,7 @@ with tab3:
         except Exception as e:
             st.info("Birim türü analizi şu anda kullanılamıyor.")
 
-with tab4:
+def sekme_detayli():
     st.header(f"Detaylı İncelemeler {f'({secili_bolge} Bölgesi)' if secili_bolge != 'Tümü' else ''}")
     
     if devlet_df.empty:
@@ -596,68 +456,30 @@ with tab4:
             if 'Puan Türü' in devlet_df.columns:
                 st.subheader("Puan Türüne Göre Devlet Üniversiteleri Durumu")
                 
-                puan_analiz = devlet_df.groupby('Puan Türü').agg({
-                    'Kontenjan': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                    'Yerleşen': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                    'Program Adı': 'count'
-                }).reset_index()
-                
-                puan_analiz['Doluluk_Orani'] = (puan_analiz['Yerleşen'] / puan_analiz['Kontenjan'] * 100)
-                puan_analiz['Bos_Kontenjan'] = puan_analiz['Kontenjan'] - puan_analiz['Yerleşen']
+                puan_analiz = rollup(devlet_df, 'Puan Türü', key=filtre_anahtari, cube=kup, where=kup_filtresi)
                 
-                fig_puan = px.bar(
+                fig_puan = cubuk_grafik(
                     puan_analiz.sort_values('Doluluk_Orani'),
                     x='Puan Türü',
                     y='Doluluk_Orani',
-                    color='Program Adı',
+                    color='Program_Sayisi',
                     title="Puan Türüne Göre Devlet Üniversiteleri Doluluk Oranı",
-                    labels={
-                        'Program Adı': 'Program Sayısı', 
-                        'Doluluk_Orani': '% Doluluk Oranı',
-                        'Puan Türü': 'Puan Türü'
-                    }
+                    percent_axis=True,
+                    key=filtre_anahtari,
                 )
-                fig_puan.update_yaxes(title="% Doluluk Oranı", ticksuffix="%")
                 st.plotly_chart(fig_puan, use_container_width=True)
                 st.caption("📚 Bu grafik puan türlerine göre devlet üniversitelerinin doluluk oranlarını gösterir. Y ekseni doluluk oranı, renk yoğunluğu ise o puan türündeki program sayısını temsil eder.")
                 
                 # Puan türü pasta grafiği
-                fig_pie_puan = px.pie(
+                fig_pie_puan = vurgulu_pasta(
                     puan_analiz,
-                    values='Program Adı',
                     names='Puan Türü',
+                    values='Program_Sayisi',
                     title="Puan Türlerine Göre Program Dağılımı",
-                    color_discrete_sequence=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
-                )
-                fig_pie_puan.update_traces(
-                    textposition='inside',
-                    textinfo='label+percent',
-                    textfont_size=11,
-                    textfont_color="white",
-                    textfont_family="Arial Black",
-                    marker=dict(
-                        line=dict(color='white', width=3)
-                    ),
-                    pull=[0.1 if val == puan_analiz['Program Adı'].max() else 0 for val in puan_analiz['Program Adı']],
-                    hovertemplate='<b>Puan Türü:</b> %{label}<br><b>Program Sayısı:</b> %{value}<br><b>Toplam Yüzdesi:</b> %{percent}<br><extra></extra>'
-                )
-                fig_pie_puan.update_layout(
-                    showlegend=True,
-                    legend=dict(
-                        orientation="v",
-                        yanchor="middle",
-                        y=0.5,
-                        xanchor="left",
-                        x=1.05,
-                        font=dict(size=10),
-                        title=dict(
-                            text="<b>Puan Türleri</b>",
-                            font=dict(size=11)
-                        )
-                    ),
-                    font=dict(size=12),
-                    title_font=dict(size=16, color='darkblue'),
-                    margin=dict(l=20, r=120, t=50, b=20)
+                    legend_title="Puan Türleri",
+                    hover_label="Puan Türü",
+                    colors=('#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD'),
+                    key=filtre_anahtari,
                 )
                 st.plotly_chart(fig_pie_puan, use_container_width=True)
                 st.caption("🥧 Bu pasta grafiği devlet üniversitesi programlarının puan türlerine göre dağılımını gösterir. Her dilim bir puan türünü ve o türdeki program sayısının oranını temsil eder.")
@@ -677,63 +499,28 @@ with tab4:
             kategori_dagilim = doluluk_kategorileri.value_counts()
             
             if not kategori_dagilim.empty:
-                fig_pie_kategori = px.pie(
-                    values=kategori_dagilim.values,
-                    names=kategori_dagilim.index,
+                fig_pie_kategori = vurgulu_pasta(
+                    kategori_dagilim.rename_axis('Kategori').reset_index(name='Program_Sayisi'),
+                    names='Kategori',
+                    values='Program_Sayisi',
                     title="Devlet Üniversitesi Programlarının Doluluk Kategorileri",
-                    color_discrete_sequence=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
-                )
-                fig_pie_kategori.update_traces(
-                    textposition='inside',
-                    textinfo='label+percent',
-                    textfont_size=11,
-                    textfont_color="white",
-                    textfont_family="Arial Black",
-                    marker=dict(
-                        line=dict(color='white', width=3)
-                    ),
-                    pull=[0.1 if val == kategori_dagilim.max() else 0 for val in kategori_dagilim.values],
-                    hovertemplate='<b>Kategori:</b> %{label}<br><b>Program Sayısı:</b> %{value}<br><b>Toplam Yüzdesi:</b> %{percent}<br><extra></extra>'
-                )
-                fig_pie_kategori.update_layout(
-                    showlegend=True,
-                    legend=dict(
-                        orientation="v",
-                        yanchor="middle",
-                        y=0.5,
-                        xanchor="left",
-                        x=1.05,
-                        font=dict(size=10),
-                        title=dict(
-                            text="<b>Doluluk Kategorileri</b>",
-                            font=dict(size=11)
-                        )
-                    ),
-                    font=dict(size=12),
-                    title_font=dict(size=16, color='darkblue'),
-                    margin=dict(l=20, r=120, t=50, b=20)
+                    legend_title="Doluluk Kategorileri",
+                    hover_label="Kategori",
+                    colors=('#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7'),
+                    key=filtre_anahtari,
                 )
                 st.plotly_chart(fig_pie_kategori, use_container_width=True)
                 st.caption("🎯 Bu pasta grafiği devlet üniversitesi programlarının doluluk kategorilerine göre dağılımını gösterir. Her dilim bir doluluk aralığını temsil eder (%0-50 Düşük, %51-70 Orta, vb.).")
             
             # Histogram - doluluk dağılımı
-            fig_hist_doluluk = px.histogram(
-                devlet_df_temp,
-                x='Doluluk_Orani',
-                nbins=25,
+            fig_hist_doluluk = histogram_bar(
+                histogram_bins(devlet_df_temp['Doluluk_Orani'], bins=25),
                 title="Devlet Üniversitesi Programları Doluluk Dağılımı",
-                labels={
-                    'Doluluk_Orani': '% Doluluk Oranı', 
-                    'count': 'Program Sayısı'
-                },
-                color_discrete_sequence=['#FF6B6B']
-            )
-            fig_hist_doluluk.update_xaxes(title="% Doluluk Oranı", ticksuffix="%")
-            fig_hist_doluluk.add_vline(
-                x=devlet_df_temp['Doluluk_Orani'].mean(), 
-                line_dash="dash", 
-                line_color="red", 
-                annotation_text=f"Ortalama: {devlet_df_temp['Doluluk_Orani'].mean():.1f}%"
+                x_title="% Doluluk Oranı",
+                y_title="Program Sayısı",
+                mean=float(devlet_df_temp['Doluluk_Orani'].mean()),
+                percent_axis=True,
+                key=filtre_anahtari,
             )
             st.plotly_chart(fig_hist_doluluk, use_container_width=True)
             st.caption("📊 Bu histogram devlet üniversitesi programlarının doluluk oranı dağılımını gösterir. X ekseni doluluk yüzdesi, Y ekseni o yüzdeye sahip program sayısını gösterir. Kırmızı çizgi ortalama doluluk oranını işaret eder.")
@@ -743,14 +530,7 @@ with tab4:
         
         # En Küçük Puan sütunu varsa analiz yap
         if 'En Küçük Puan' in devlet_df.columns:
-            def safe_float_convert(x):
-                try:
-                    return float(str(x).replace(',', '.'))
-                except:
-                    return np.nan
-            
-            devlet_puan_analiz = devlet_df.copy()
-            devlet_puan_analiz['En_Kucuk_Puan_Float'] = devlet_puan_analiz['En Küçük Puan'].apply(safe_float_convert)
+            devlet_puan_analiz = devlet_df.assign(En_Kucuk_Puan_Float=devlet_df['En Küçük Puan'].astype('float64'))
             
             # Doluluk oranı düşük ve puan bilgisi olan bölümler
             dusuk_dolu_puanli = devlet_puan_analiz[
@@ -762,25 +542,18 @@ with tab4:
                 col_puan1, col_puan2 = st.columns(2)
                 
                 with col_puan1:
-                    fig_scatter_puan = px.scatter(
+                    fig_scatter_puan = nokta_grafik(
                         dusuk_dolu_puanli,
                         x='En_Kucuk_Puan_Float',
                         y='Doluluk_Orani',
                         size='Bos_Kontenjan',
                         color='Bölge' if 'Bölge' in dusuk_dolu_puanli.columns else None,
-                        hover_data=['Program Adı', 'Üniversite Adı', 'İl'],
+                        hover=('Program Adı', 'Üniversite Adı', 'İl'),
                         title="Düşük Puanlı ve Boş Kalan Devlet Bölümleri",
-                        labels={
-                            'En_Kucuk_Puan_Float': 'En Küçük Puan', 
-                            'Doluluk_Orani': '% Doluluk Oranı',
-                            'Bos_Kontenjan': 'Boş Kontenjan',
-                            'Bölge': 'Bölge',
-                            'Program Adı': 'Program Adı',
-                            'Üniversite Adı': 'Üniversite Adı',
-                            'İl': 'Şehir'
-                        }
+                        labels=(('En_Kucuk_Puan_Float', 'En Küçük Puan'),),
+                        percent_axis=True,
+                        key=filtre_anahtari,
                     )
-                    fig_scatter_puan.update_yaxes(title="% Doluluk Oranı", ticksuffix="%")
                     st.plotly_chart(fig_scatter_puan, use_container_width=True)
                     st.caption("🎯 Bu scatter plot düşük puanlı ve boş kalan devlet bölümlerini analiz eder. X ekseni en küçük puan, Y ekseni doluluk oranı, nokta büyüklüğü boş kontenjan miktarını gösterir. Sol alttaki noktalar hem düşük puanlı hem de boş kalan bölümlerdir.")
                 
@@ -822,6 +595,14 @@ with tab4:
             total_empty = devlet_df['Bos_Kontenjan'].sum()
             st.metric("Toplam Boş Kontenjan", f"{total_empty:,.0f}")
 
+# Yalnızca seçili sekmenin içeriği hesaplanır ve çizilir
+lazy_tabs({
+    "📍 Şehir/Bölge Analizi": sekme_sehir_bolge,
+    "🏫 Üniversite Analizi": sekme_universite,
+    "📚 Fakülte Analizi": sekme_fakulte,
+    "🔍 Detaylı İncelemeler": sekme_detayli,
+}, key="devlet_sekmesi", filters=sayisal_filtreler)
+
 st.markdown("---")
 st.caption("📊 Bu analizler sadece devlet üniversiteleri için hazırlanmıştır.")
 
@@ -1,8 +1,5 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import numpy as np
 import sys
 from pathlib import Path
 
@@ -10,38 +7,32 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.data_loader import load_processed  # noqa: E402
+from src.dataset import get_dataset, get_frame  # noqa: E402
+from src.aggregates import rollup  # noqa: E402
+from src.filters import category_contains_mask, category_mask, matching_categories  # noqa: E402
+from src.chart_data import histogram_bins  # noqa: E402
+from src.program_names import SCHOLARSHIP_TIERS  # noqa: E402
+from ui.components import lazy_tabs  # noqa: E402
+from ui.figures import cubuk_grafik, histogram_bar, nokta_grafik, pasta_grafik  # noqa: E402
 
 st.title("🏢 Vakıf Üniversiteleri ve Burslu Program Analizleri")
 
-@st.cache_data
-def get_data():
-    return load_processed()
+# Burs oranı ön işlemede program adından çıkarılır (Burs_Orani); ilk kademe ücretli programlardır
+UCRETLI = [SCHOLARSHIP_TIERS[0]]
+BURSLU = list(SCHOLARSHIP_TIERS[1:])
 
-df = get_data()
+df = get_frame()
 
 # Vakıf üniversiteleri filtrele
 if 'Üniversite Türü' in df.columns:
-    vakif_df = df[df['Üniversite Türü'].str.contains('Vakıf', case=False, na=False)]
+    vakif_turleri = matching_categories(df['Üniversite Türü'], 'Vakıf')
+    vakif_df = df[category_mask(df['Üniversite Türü'], vakif_turleri)]
 else:
     st.error("Üniversite Türü sütunu bulunamadı!")
     st.stop()
 
-# Doluluk oranı hesapla
-def calculate_occupancy(row):
-    try:
-        kontenjan = pd.to_numeric(row['Kontenjan'], errors='coerce')
-        yerlesen = pd.to_numeric(row['Yerleşen'], errors='coerce')
-        if pd.isna(kontenjan) or pd.isna(yerlesen) or kontenjan <= 0:
-            return np.nan
-        return (yerlesen / kontenjan) * 100
-    except:
-        return np.nan
-
 if not vakif_df.empty:
     vakif_df = vakif_df.copy()
-    vakif_df['Doluluk_Orani'] = vakif_df.apply(calculate_occupancy, axis=1)
-    vakif_df['Bos_Kontenjan'] = pd.to_numeric(vakif_df['Kontenjan'], errors='coerce') - pd.to_numeric(vakif_df['Yerleşen'], errors='coerce')
 
     # Filtre seçenekleri
     st.sidebar.header("🔍 Vakıf Üniversiteleri Filtreleri")
@@ -51,70 +42,94 @@ if not vakif_df.empty:
         bolge_listesi = ['Tümü'] + sorted(vakif_df['Bölge'].dropna().unique().tolist())
         secili_bolge = st.sidebar.selectbox("Bölge Seç", bolge_listesi)
         if secili_bolge != 'Tümü':
-            vakif_df = vakif_df[vakif_df['Bölge'] == secili_bolge]
+            vakif_df = vakif_df[category_mask(vakif_df['Bölge'], [secili_bolge])]
 
     # Şehir filtresi
     if 'İl' in vakif_df.columns:
         sehir_listesi = ['Tümü'] + sorted(vakif_df['İl'].dropna().unique().tolist())
         secili_sehir = st.sidebar.selectbox("Şehir Seç", sehir_listesi)
         if secili_sehir != 'Tümü':
-            vakif_df = vakif_df[vakif_df['İl'] == secili_sehir]
+            vakif_df = vakif_df[category_mask(vakif_df['İl'], [secili_sehir])]
 
     # Burslu program filtresi
     burs_durumu = st.sidebar.selectbox("Program Türü", ["Tümü", "Sadece Burslu", "Sadece Ücretli"])
 
     # Program türüne göre filtrele
-    if burs_durumu != "Tümü":
-        vakif_df['Burslu_Program'] = vakif_df['Program Adı'].str.contains('Burslu|BURSLU|%50|%25|%75|%100', case=False, na=False)
-        if burs_durumu == "Sadece Burslu":
-            vakif_df = vakif_df[vakif_df['Burslu_Program'] == True]
-        else:  # Sadece Ücretli
-            vakif_df = vakif_df[vakif_df['Burslu_Program'] == False]
-
-    # Kontenjan aralığı filtresi
-    min_kontenjan = st.sidebar.number_input("Minimum Kontenjan", min_value=0, value=0, step=25)
-    vakif_df = vakif_df[pd.to_numeric(vakif_df['Kontenjan'], errors='coerce') >= min_kontenjan]
+    burs_kademeleri = {"Sadece Burslu": BURSLU, "Sadece Ücretli": UCRETLI}.get(burs_durumu)
+    if burs_kademeleri is not None:
+        vakif_df = vakif_df[category_mask(vakif_df['Burs_Orani'], burs_kademeleri)]
 
-    # Doluluk oranı filtresi
-    doluluk_araligi = st.sidebar.slider("Doluluk Oranı Aralığı (%)", 0, 100, (0, 100), step=5)
-    vakif_df = vakif_df[
-        (vakif_df['Doluluk_Orani'] >= doluluk_araligi[0]) & 
-        (vakif_df['Doluluk_Orani'] <= doluluk_araligi[1])
-    ]
+    kup = get_dataset().cube
+    # Küpün yanıtlayamadığı üniversite/şehir/bölge özetleri yıldız şemanın tamsayı anahtarlarından hesaplanır
+    yildiz = get_dataset().star
 
     st.sidebar.caption("💡 Filtreler tüm sekmelerdeki analizleri etkiler. Burslu/Ücretli filtresi ile istediğiniz program türünü seçebilirsiniz.")
 
+# Sayısal filtreler seçili bölümün parçasında uygulanır: değiştirilmeleri sayfanın tamamını
+# değil yalnızca o bölümü yeniden çalıştırır. Kenar çubuğu seçimleri ortak tabanı belirler.
+vakif_tabani = vakif_df
+
 st.markdown("---")
 
-# Genel özet
-if not vakif_df.empty:
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Toplam Vakıf Programı", f"{len(vakif_df):,}")
-    with col2:
-        total_kontenjan = pd.to_numeric(vakif_df['Kontenjan'], errors='coerce').sum()
-        st.metric("Toplam Kontenjan", f"{total_kontenjan:,.0f}")
-    with col3:
-        total_yerlesen = pd.to_numeric(vakif_df['Yerleşen'], errors='coerce').sum()
-        st.metric("Toplam Yerleşen", f"{total_yerlesen:,.0f}")
-    with col4:
-        genel_doluluk = (total_yerlesen / total_kontenjan * 100) if total_kontenjan > 0 else 0
-        st.metric("Genel Doluluk", f"{genel_doluluk:.1f}%")
+def sayisal_filtreler():
+    global vakif_df, filtre_anahtari, kup_filtresi
+    if vakif_tabani.empty:
+        return
+    with st.expander("🔢 Sayısal Filtreler", expanded=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            # Kontenjan aralığı filtresi
+            min_kontenjan = st.number_input("Minimum Kontenjan", min_value=0, value=0, step=25,
+                                            key="vakif_min_kontenjan")
+        with col2:
+            # Doluluk oranı filtresi
+            doluluk_araligi = st.slider("Doluluk Oranı Aralığı (%)", 0, 100, (0, 100), step=5,
+                                        key="vakif_doluluk_araligi")
+    vakif_df = vakif_tabani[
+        (vakif_tabani['Kontenjan'] >= min_kontenjan) &
+        (vakif_tabani['Doluluk_Orani'] >= doluluk_araligi[0]) &
+        (vakif_tabani['Doluluk_Orani'] <= doluluk_araligi[1])
+    ]
 
-st.markdown("---")
+    # Özetlerin önbellek anahtarı: sayfa + filtre durumu
+    filtre_anahtari = ('vakif', secili_bolge, secili_sehir, burs_durumu, min_kontenjan, doluluk_araligi)
 
-tab1, tab2, tab3, tab4 = st.tabs(["💰 Burslu/Ücretli Analizi", "🏢 Vakıf Üniversiteleri", "📍 Şehir/Bölge Durumu", "📊 Karşılaştırmalı Analiz"])
+    # Sayısal filtreler varsayılanda iken filtre durumu küp boyut seçimleriyle ifade edilir;
+    # özetler önceden toplanmış küp hücrelerinden gelir
+    kup_filtresi = None
+    if min_kontenjan == 0 and doluluk_araligi == (0, 100):
+        kup_filtresi = {'Üniversite Türü': vakif_turleri}
+        if secili_bolge != 'Tümü':
+            kup_filtresi['Bölge'] = [secili_bolge]
+        if secili_sehir != 'Tümü':
+            kup_filtresi['İl'] = [secili_sehir]
+        if burs_kademeleri is not None:
+            kup_filtresi['Burs_Orani'] = burs_kademeleri
 
-with tab1:
+    # Genel özet
+    if not vakif_df.empty:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Toplam Vakıf Programı", f"{len(vakif_df):,}")
+        with col2:
+            total_kontenjan = vakif_df['Kontenjan'].sum()
+            st.metric("Toplam Kontenjan", f"{total_kontenjan:,.0f}")
+        with col3:
+            total_yerlesen = vakif_df['Yerleşen'].sum()
+            st.metric("Toplam Yerleşen", f"{total_yerlesen:,.0f}")
+        with col4:
+            genel_doluluk = (total_yerlesen / total_kontenjan * 100) if total_kontenjan > 0 else 0
+            st.metric("Genel Doluluk", f"{genel_doluluk:.1f}%")
+
+    st.markdown("---")
+
+
+def sekme_burslu_ucretli():
     st.header("Burslu ve Ücretli Program Analizleri")
     
     if not vakif_df.empty:
-        # Program adında "burslu" geçenleri tespit et
-        vakif_df_copy = vakif_df.copy()
-        vakif_df_copy['Burslu_Program'] = vakif_df_copy['Program Adı'].str.contains('Burslu|BURSLU|%50|%25|%75|%100', case=False, na=False)
-        
-        burslu_programs = vakif_df_copy[vakif_df_copy['Burslu_Program'] == True].copy()
-        ucretli_programs = vakif_df_copy[vakif_df_copy['Burslu_Program'] == False].copy()
+        burslu_programs = vakif_df[category_mask(vakif_df['Burs_Orani'], BURSLU)]
+        ucretli_programs = vakif_df[category_mask(vakif_df['Burs_Orani'], UCRETLI)]
         
         # Özet
         col1, col2 = st.columns(2)
@@ -125,19 +140,18 @@ with tab1:
                 burslu_doluluk = burslu_programs['Doluluk_Orani'].mean()
                 st.metric("Ortalama Doluluk", f"{burslu_doluluk:.1f}%")
                 
-                # Burs oranına göre kategorizasyon
-                burslu_programs['Burs_Kategorisi'] = 'Diğer Burslu'
-                burslu_programs.loc[burslu_programs['Program Adı'].str.contains('%100|100%', case=False, na=False), 'Burs_Kategorisi'] = '%100 Burslu'
-                burslu_programs.loc[burslu_programs['Program Adı'].str.contains('%75|75%', case=False, na=False), 'Burs_Kategorisi'] = '%75 Burslu'
-                burslu_programs.loc[burslu_programs['Program Adı'].str.contains('%50|50%', case=False, na=False), 'Burs_Kategorisi'] = '%50 Burslu'
-                burslu_programs.loc[burslu_programs['Program Adı'].str.contains('%25|25%', case=False, na=False), 'Burs_Kategorisi'] = '%25 Burslu'
-                
-                # Burs kategorisi dağılımı
-                burs_dagilim = burslu_programs['Burs_Kategorisi'].value_counts()
-                fig_pie = px.pie(
-                    values=burs_dagilim.values,
-                    names=burs_dagilim.index,
-                    title="Burs Oranı Dağılımı"
+                # Burs oranı dağılımı (bulunmayan kademeler gösterilmez)
+                burs_dagilim = burslu_programs['Burs_Orani'].value_counts(sort=False)
+                burs_dagilim = burs_dagilim[burs_dagilim > 0]
+                fig_pie = pasta_grafik(
+                    pd.DataFrame({
+                        'Burs_Orani': [f"{kademe} Burslu" for kademe in burs_dagilim.index],
+                        'Program_Sayisi': burs_dagilim.to_numpy(),
+                    }),
+                    names='Burs_Orani',
+                    values='Program_Sayisi',
+                    title="Burs Oranı Dağılımı",
+                    key=filtre_anahtari,
                 )
                 st.plotly_chart(fig_pie, use_container_width=True)
             else:
@@ -163,40 +177,36 @@ with tab1:
                 'Program Sayısı': [len(burslu_programs), len(ucretli_programs)]
             })
             
-            fig = px.bar(
+            fig = cubuk_grafik(
                 comparison_data,
                 x='Program Türü',
                 y='Ortalama Doluluk',
                 color='Program Sayısı',
-                title="Burslu vs Ücretli Programlarda Ortalama Doluluk"
+                title="Burslu vs Ücretli Programlarda Ortalama Doluluk",
+                key=filtre_anahtari,
             )
             st.plotly_chart(fig, use_container_width=True)
 
-with tab2:
+def sekme_vakif_universiteleri():
     st.header("Vakıf Üniversiteleri Detaylı Analizi")
     
     if not vakif_df.empty and 'Üniversite Adı' in vakif_df.columns:
         # Üniversite bazında analiz
-        uni_analiz = vakif_df.groupby('Üniversite Adı').agg({
-            'Kontenjan': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-            'Yerleşen': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-            'Program Adı': 'count'
-        }).reset_index()
-        
-        uni_analiz['Doluluk_Orani'] = (uni_analiz['Yerleşen'] / uni_analiz['Kontenjan'] * 100)
-        uni_analiz['Bos_Kontenjan'] = uni_analiz['Kontenjan'] - uni_analiz['Yerleşen']
+        uni_analiz = rollup(vakif_df, 'Üniversite Adı', key=filtre_anahtari, cube=kup, where=kup_filtresi, star=yildiz)
         
         # En boş vakıf üniversiteleri
         st.subheader("En Boş Kalan Vakıf Üniversiteleri")
         en_bos_vakif = uni_analiz.nsmallest(15, 'Doluluk_Orani')
         
-        fig = px.scatter(
+        fig = nokta_grafik(
             en_bos_vakif,
-            x='Kontenjan',
+            x='Toplam_Kontenjan',
             y='Doluluk_Orani',
             size='Bos_Kontenjan',
-            hover_data=['Üniversite Adı'],
-            title="En Boş 15 Vakıf Üniversitesi"
+            hover=('Üniversite Adı',),
+            title="En Boş 15 Vakıf Üniversitesi",
+            labels=(('Toplam_Kontenjan', 'Kontenjan'),),
+            key=filtre_anahtari,
         )
         st.plotly_chart(fig, use_container_width=True)
         
@@ -204,12 +214,13 @@ with tab2:
         st.subheader("En Dolu Vakıf Üniversiteleri")
         en_dolu_vakif = uni_analiz.nlargest(15, 'Doluluk_Orani')
         
-        fig = px.bar(
+        fig = cubuk_grafik(
             en_dolu_vakif,
             y='Üniversite Adı',
             x='Doluluk_Orani',
             title="En Dolu 15 Vakıf Üniversitesi",
-            orientation='h'
+            orientation='h',
+            key=filtre_anahtari,
         )
         st.plotly_chart(fig, use_container_width=True)
         
@@ -217,7 +228,7 @@ with tab2:
         st.subheader("Kontenjan Büyüklüğüne Göre Vakıf Üniversiteleri")
         
         uni_analiz['Kategori'] = pd.cut(
-            uni_analiz['Kontenjan'],
+            uni_analiz['Toplam_Kontenjan'],
             bins=[0, 500, 1500, 3000, float('inf')],
             labels=['Küçük (0-500)', 'Orta (501-1500)', 'Büyük (1501-3000)', 'Çok Büyük (3000+)']
         )
@@ -227,17 +238,18 @@ with tab2:
             'Üniversite Adı': 'count'
         }).reset_index()
         
-        fig = px.bar(
+        fig = cubuk_grafik(
             kategori_analiz,
             x='Kategori',
             y='Doluluk_Orani',
             color='Üniversite Adı',
             title="Kontenjan Büyüklüğüne Göre Ortalama Doluluk",
-            labels={'Üniversite Adı': 'Üniversite Sayısı'}
+            labels=(('Üniversite Adı', 'Üniversite Sayısı'),),
+            key=filtre_anahtari,
         )
         st.plotly_chart(fig, use_container_width=True)
 
-with tab3:
+def sekme_sehir_bolge():
     st.header("Vakıf Üniversitelerinde Şehir/Bölge Durumu")
     
     if not vakif_df.empty:
@@ -245,24 +257,19 @@ with tab3:
         if 'İl' in vakif_df.columns:
             st.subheader("Şehirlere Göre Vakıf Üniversitesi Durumu")
             
-            sehir_analiz = vakif_df.groupby('İl').agg({
-                'Kontenjan': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                'Yerleşen': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                'Üniversite Adı': 'nunique'
-            }).reset_index()
-            
-            sehir_analiz['Doluluk_Orani'] = (sehir_analiz['Yerleşen'] / sehir_analiz['Kontenjan'] * 100)
+            sehir_analiz = rollup(vakif_df, 'İl', ['Uni_Sayisi', 'Doluluk_Orani'], key=filtre_anahtari, cube=kup, where=kup_filtresi, star=yildiz)
             
             # En fazla vakıf üniversitesi olan şehirler
-            en_fazla_vakif = sehir_analiz.nlargest(10, 'Üniversite Adı')
+            en_fazla_vakif = sehir_analiz.nlargest(10, 'Uni_Sayisi')
             
-            fig = px.bar(
+            fig = cubuk_grafik(
                 en_fazla_vakif,
                 x='İl',
-                y='Üniversite Adı',
+                y='Uni_Sayisi',
                 color='Doluluk_Orani',
                 title="En Fazla Vakıf Üniversitesi Olan Şehirler",
-                labels={'Üniversite Adı': 'Vakıf Üniversite Sayısı'}
+                labels=(('Uni_Sayisi', 'Vakıf Üniversite Sayısı'),),
+                key=filtre_anahtari,
             )
             st.plotly_chart(fig, use_container_width=True)
         
@@ -270,35 +277,26 @@ with tab3:
         if 'Bölge' in vakif_df.columns:
             st.subheader("Bölgelere Göre Vakıf Üniversiteleri")
             
-            bolge_analiz = vakif_df.groupby('Bölge').agg({
-                'Kontenjan': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                'Yerleşen': lambda x: pd.to_numeric(x, errors='coerce').sum(),
-                'Program Adı': 'count'
-            }).reset_index()
-            
-            bolge_analiz['Doluluk_Orani'] = (bolge_analiz['Yerleşen'] / bolge_analiz['Kontenjan'] * 100)
+            bolge_analiz = rollup(vakif_df, 'Bölge', ['Program_Sayisi', 'Doluluk_Orani'], key=filtre_anahtari, cube=kup, where=kup_filtresi, star=yildiz)
             
-            fig = px.bar(
+            fig = cubuk_grafik(
                 bolge_analiz.sort_values('Doluluk_Orani'),
                 x='Bölge',
                 y='Doluluk_Orani',
-                color='Program Adı',
+                color='Program_Sayisi',
                 title="Bölgelere Göre Vakıf Üniversiteleri Doluluk Oranı",
-                labels={'Program Adı': 'Program Sayısı'}
+                tickangle=45,
+                key=filtre_anahtari,
             )
-            fig.update_xaxes(tickangle=45)
             st.plotly_chart(fig, use_container_width=True)
 
-with tab4:
+def sekme_karsilastirma():
     st.header("Vakıf vs Devlet Karşılaştırması")
     
     # Devlet üniversiteleri de dahil edelim
-    devlet_df = df[df['Üniversite Türü'].str.contains('Devlet', case=False, na=False)] if 'Üniversite Türü' in df.columns else pd.DataFrame()
+    devlet_df = df[category_contains_mask(df['Üniversite Türü'], 'Devlet')] if 'Üniversite Türü' in df.columns else pd.DataFrame()
     
     if not vakif_df.empty and not devlet_df.empty:
-        devlet_df = devlet_df.copy()
-        devlet_df['Doluluk_Orani'] = devlet_df.apply(calculate_occupancy, axis=1)
-        
         # Genel karşılaştırma
         vakif_ortalama = vakif_df['Doluluk_Orani'].mean()
         devlet_ortalama = devlet_df['Doluluk_Orani'].mean()
@@ -309,39 +307,30 @@ with tab4:
             'Program Sayısı': [len(vakif_df), len(devlet_df)]
         })
         
-        fig = px.bar(
+        fig = cubuk_grafik(
             comparison_df,
             x='Üniversite Türü',
             y='Ortalama Doluluk',
             color='Program Sayısı',
-            title="Vakıf vs Devlet Üniversiteleri Ortalama Doluluk Karşılaştırması"
+            title="Vakıf vs Devlet Üniversiteleri Ortalama Doluluk Karşılaştırması",
+            key=filtre_anahtari,
         )
         st.plotly_chart(fig, use_container_width=True)
         
         # Doluluk dağılımı karşılaştırması
         st.subheader("Doluluk Oranı Dağılımı Karşılaştırması")
         
-        fig = go.Figure()
-        
-        fig.add_trace(go.Histogram(
-            x=vakif_df['Doluluk_Orani'].dropna(),
-            name='Vakıf',
-            opacity=0.7,
-            nbinsx=20
-        ))
-        
-        fig.add_trace(go.Histogram(
-            x=devlet_df['Doluluk_Orani'].dropna(),
-            name='Devlet',
-            opacity=0.7,
-            nbinsx=20
-        ))
-        
-        fig.update_layout(
+        # İki seri aynı kutu sınırlarıyla sunucuda sayılır
+        fig = histogram_bar(
+            pd.concat([
+                histogram_bins(vakif_df['Doluluk_Orani'], bins=20, range=(0, 100), name='Vakıf'),
+                histogram_bins(devlet_df['Doluluk_Orani'], bins=20, range=(0, 100), name='Devlet'),
+            ], ignore_index=True),
             title="Vakıf vs Devlet Üniversiteleri Doluluk Oranı Dağılımı",
-            xaxis_title="Doluluk Oranı (%)",
-            yaxis_title="Program Sayısı",
-            barmode='overlay'
+            x_title="Doluluk Oranı (%)",
+            y_title="Program Sayısı",
+            colors=('#636EFA', '#EF553B'),
+            key=filtre_anahtari,
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -365,6 +354,14 @@ with tab4:
     else:
         st.warning("Karşılaştırma için yeterli veri bulunamadı.")
 
+# Yalnızca seçili sekmenin içeriği hesaplanır ve çizilir
+lazy_tabs({
+    "💰 Burslu/Ücretli Analizi": sekme_burslu_ucretli,
+    "🏢 Vakıf Üniversiteleri": sekme_vakif_universiteleri,
+    "📍 Şehir/Bölge Durumu": sekme_sehir_bolge,
+    "📊 Karşılaştırmalı Analiz": sekme_karsilastirma,
+}, key="vakif_sekmesi", filters=sayisal_filtreler)
+
 st.markdown("---")
 st.caption("🏢 Bu analizler vakıf üniversiteleri ve burslu programlar odaklıdır.")
 